@@ -0,0 +1,90 @@
+"""
+Administrative commands
+"""
+
+import re
+
+from .command import MuxCommand
+from evennia.objects.models import ObjectDB
+from evennia.utils.evtable import EvTable
+from world.trait_index import TRAIT_INDEX, TraitIndexException
+
+_CONDITION = re.compile(r'^(\w+)(>=|<=|!=|>|<|=)(-?\d+(?:\.\d+)?)$')
+_OPERATORS = {'>=': 'gte', '<=': 'lte', '!=': 'ne',
+              '>': 'gt', '<': 'lt', '=': 'exact'}
+
+
+class CmdTraitIndex(MuxCommand):
+    """
+    query the character trait index
+
+    Usage:
+      @traitindex[/switch] [<condition> ...] [sort=[-]<trait>]
+
+    Switch:
+      rebuild - re-index all characters from the database
+
+    Conditions have the form <trait><op><value>, where op is one of
+    >=, <=, >, <, = or !=. A '-' in front of the sort trait sorts in
+    descending order.
+
+    Example:
+      @traitindex STR>=12 AGL<10 sort=-STR
+
+    Lists the characters whose traits match all conditions, or shows
+    the size of the index if none are given.
+    """
+    key = "@traitindex"
+    aliases = ["@tindex"]
+    locks = "cmd:perm(Wizards)"
+    help_category = "Admin"
+
+    def func(self):
+        caller = self.caller
+        if 'rebuild' in self.switches:
+            count = TRAIT_INDEX.rebuild()
+            caller.msg("Trait index rebuilt: {} objects.".format(count))
+            return
+
+        lookups, order_by, reverse = {}, None, False
+        for arg in self.args.split():
+            if arg.startswith('sort='):
+                order_by = arg[5:]
+                if order_by.startswith('-'):
+                    order_by, reverse = order_by[1:], True
+                continue
+            match = _CONDITION.match(arg)
+            if not match:
+                caller.msg("Invalid condition: {}".format(arg))
+                return
+            key, op, value = match.groups()
+            lookups['{}__{}'.format(key, _OPERATORS[op])] = float(value)
+
+        if not lookups and order_by is None:
+            caller.msg("Trait index: {} objects, {} traits.".format(
+                len(TRAIT_INDEX), len(TRAIT_INDEX.columns)))
+            return
+
+        try:
+            ids = TRAIT_INDEX.select(order_by=order_by, reverse=reverse,
+                                     limit=50, **lookups)
+        except TraitIndexException as e:
+            caller.msg(e.msg)
+            return
+
+        keys = []
+        for key in [k.split('__')[0] for k in lookups] + [order_by]:
+            if key and key not in keys:
+                keys.append(key)
+        table = EvTable('dbref', 'name', *keys, border='cells')
+        shown = 0
+        for dbid in ids:
+            obj = ObjectDB.objects.get_id(dbid)
+            if obj is None:
+                continue
+            traits = [obj.traits.get(k) for k in keys]
+            table.add_row(obj.dbref, obj.key,
+                          *['-' if t is None else t.actual for t in traits])
+            shown += 1
+        caller.msg(unicode(table))
+        caller.msg("{} matches shown.".format(shown))
@@ -5,6 +5,7 @@ Character trait-related commands
 from .command import MuxCommand
 from evennia import CmdSet
 from evennia.utils.evform import EvForm, EvTable
+from utils.utils import d6str
 
 
 class CharTraitCmdSet(CmdSet):
@@ -187,13 +188,18 @@ class CmdSkills(MuxCommand):
     view character skills
 
     Usage:
-      skills <skillgroup>
+      skills [<skillgroup> | <skill>]
 
     Args:
-        skillgroup - one of str[ength], per[ception], int[elligence],
-                     dex[terity], or cha[risma]
+        skillgroup - one of agl/agility, str/strength, knw/knowledge,
+                     mch/mechanical, per/perception, or tch/technical
+        skill - a skill name, or the first letters of one
 
-    Displays a summary of your character's skills by group.
+    Displays a summary of your character's skills by group, or of the
+    skills starting with the given letters.
+
+    Example:
+      skills ener
     """
     key = "skills"
     aliases = ["skill", "sk"]
@@ -201,54 +207,54 @@ class CmdSkills(MuxCommand):
     arg_regex = r"\s.+|"
 
     def func(self):
-        from world import skills
+        from world.archetypes import PRIMARY_TRAITS, TRAIT_DEFINITIONS
+        from world.skills import SKILLS
+        from world.rulebook import skill_totals
         # make sure the char has skills
         if len(self.caller.skills.all) == 0:
             self.caller.msg("You don't have any skills.")
             return
 
         sk = self.caller.skills
-        sk_list = []
-
-        if len(self.args.strip()) > 0:
-            if self.args.lower().startswith('str'):
-                title = 'Strength Based Skills'
-                sk_list = skills.STR_SKILLS
-            elif self.args.lower().startswith('per'):
-                title = 'Perception Based Skills'
-                sk_list = skills.PER_SKILLS
-            elif self.args.lower().startswith('int'):
-                title = 'Intelligence Based Skills'
-                sk_list = skills.INT_SKILLS
-            elif self.args.lower().startswith('dex'):
-                title = 'Dexterity Based Skills'
-                sk_list = skills.DEX_SKILLS
-            elif self.args.lower().startswith('cha'):
-                title = 'Charisma Based Skills'
-                sk_list = skills.CHA_SKILLS
+        totals = skill_totals(self.caller)
+        args = self.args.strip().lower()
+
+        if args:
+            for trait in PRIMARY_TRAITS:
+                name = TRAIT_DEFINITIONS[trait]['name']
+                if args == trait.lower() or (
+                        len(args) >= 3 and name.lower().startswith(args)):
+                    title = '{} Based Skills'.format(name)
+                    sk_list = SKILLS.trait_skills(trait)
+                    break
             else:
-                self.msg('Usage: skills [<skillgroup>]')
+                title = 'Skills'
+                sk_list = SKILLS.prefix(args)
+            sk_list = [s for s in sk_list if s in totals]
+            if not sk_list:
+                self.msg('Usage: skills [<skillgroup> | <skill>]')
                 return
 
             table = EvTable(header=False,
-                            table=[[self._format_skill_3col(sk[s])]
-                                  for s in sk_list])
+                            table=[[self._format_skill_3col(sk[s], totals[s])]
+                                   for s in sk_list])
         else:
             title = 'Skills'
+            sk_list = [s for s in SKILLS.keys if s in totals]
             data = []
             for i in xrange(3):
-                data.append([self._format_skill_3col(sk[s])
-                             for s in skills.ALL_SKILLS[i::3]])
+                data.append([self._format_skill_3col(sk[s], totals[s])
+                             for s in sk_list[i::3]])
 
             table = EvTable(header=False, table=data)
 
         self.caller.msg("  |Y{}|n".format(title))
         self.caller.msg(unicode(table))
 
-    def _format_skill_3col(self, skill):
-        """Return a trait : value pair formatted for 3col layout"""
+    def _format_skill_3col(self, skill, total):
+        """Return a skill : total D6 value pair formatted for 3col layout"""
         return "|M{:<16.16}|n : |w{:>4}|n".format(
-                    skill.name, skill.actual)
+                    skill.name, d6str(total))
 
 
 class CmdWealth(MuxCommand):
@@ -15,7 +15,7 @@ own cmdsets by inheriting from them or directly from `evennia.CmdSet`.
 """
 
 from evennia import default_cmds
-from commands import equip, chartraits, room_exit, chargen
+from commands import equip, chartraits, room_exit, chargen, admin, rolls
 
 
 class CharacterCmdSet(default_cmds.CharacterCmdSet):
@@ -37,6 +37,8 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         self.add(equip.EquipCmdSet())
         self.add(chartraits.CharTraitCmdSet())
         self.add(room_exit.AinneveRoomExitsCmdSet())
+        self.add(admin.CmdTraitIndex())
+        self.add(rolls.RollCmdSet())
 
 class PlayerCmdSet(default_cmds.PlayerCmdSet):
     """
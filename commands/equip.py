@@ -52,7 +52,7 @@ class CmdInventory(MuxCommand):
                 data[1].append(fill(item.db.desc or "", 50))
                 stat = " "
                 if item.attributes.has('damage'):
-                    stat += "(|rDamage: {:>2d}|n) ".format(item.db.damage)
+                    stat += "(|rDamage: {:>2}|n) ".format(item.db.damage)
                 if item.attributes.has('range'):
                     stat += "(|GRange: {:>2d}|n) ".format(item.db.range)
                 if item.attributes.has('toughness'):
@@ -167,7 +167,7 @@ class CmdEquip(MuxCommand):
                     continue
                 stat = " "
                 if item.attributes.has('damage'):
-                    stat += "(|rDamage: {:>2d}|n) ".format(item.db.damage)
+                    stat += "(|rDamage: {:>2}|n) ".format(item.db.damage)
                 if item.attributes.has('range'):
                     stat += "(|GRange: {:>2d}|n) ".format(item.db.range)
                 if item.attributes.has('toughness'):
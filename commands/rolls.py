@@ -0,0 +1,82 @@
+"""
+Dice rolling commands
+"""
+
+from .command import MuxCommand
+from evennia import CmdSet
+from world.rulebook import compile_dice, DiceRollError
+
+
+class RollCmdSet(CmdSet):
+
+    key = "roll_cmdset"
+    priority = 1
+
+    def at_cmdset_creation(self):
+        """Populate CmdSet"""
+        self.add(CmdRoll())
+
+
+class CmdRoll(MuxCommand):
+    """
+    roll dice
+
+    Usage:
+      roll[/odds] <dice> [vs <target>]
+
+    Switch:
+      odds - show the chance of meeting the target instead of rolling
+
+    Rolls a dice expression such as 4D+2, 2D+1 x2 or wild 3D, and
+    shows the result to you and everyone in the room. If a target is
+    given, also shows whether the roll met it. Wild rolls also show
+    whether the wild die caused a complication.
+
+    Example:
+      roll 3D+1 vs 12
+      roll/odds 3D+1 vs 12
+    """
+    key = "roll"
+    locks = "cmd:all()"
+
+    def func(self):
+        caller = self.caller
+        if not self.args:
+            caller.msg("Usage: roll[/odds] <dice> [vs <target>]")
+            return
+
+        expr, _, target = self.args.partition(' vs ')
+        try:
+            dice = compile_dice(expr.strip())
+            target = int(target) if target.strip() else None
+        except DiceRollError as e:
+            caller.msg(e.msg)
+            return
+        except ValueError:
+            caller.msg("The target must be a number.")
+            return
+
+        if 'odds' in self.switches:
+            if target is None:
+                caller.msg("Usage: roll/odds <dice> vs <target>")
+                return
+            caller.msg("{} vs {}: {:.1%} chance of success.".format(
+                dice, target, dice.odds(target)))
+            return
+
+        if dice.wild:
+            result, complication = dice.roll_wild()
+        else:
+            result, complication = dice(), False
+        outcome = ""
+        if target is not None:
+            outcome = " vs {}: {}".format(
+                target, "|gsuccess|n" if result >= target else "|rfailure|n")
+        if complication:
+            outcome += " |r(complication)|n"
+        caller.msg("You roll {}: |w{}|n{}".format(dice, result, outcome))
+        if caller.location:
+            caller.location.msg_contents(
+                "{} rolls {}: |w{}|n{}".format(
+                    caller.key, dice, result, outcome),
+                exclude=caller)
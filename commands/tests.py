@@ -1,14 +1,18 @@
 """
 Command test module
 """
+from evennia import spawn
 from evennia.utils.test_resources import EvenniaTest
 from evennia.commands.default.tests import CommandTest
 from commands.equip import *
-from commands.chartraits import CmdSheet, CmdTraits
+from commands.chartraits import CmdSheet, CmdTraits, CmdSkills
+from commands.rolls import CmdRoll
 from typeclasses.characters import Character
 from typeclasses.weapons import Weapon
 from world.races import apply_race
 from world.archetypes import apply_archetype, calculate_secondary_traits
+from world.skills import apply_skills
+from world.content.prototypes_weapons import SURIVAL_KNIFE
 from utils.utils import sample_char
 
 
@@ -160,6 +164,17 @@ class EquipTestCase(CommandTest):
         self.char1.execute_cmd('drop Obj')
         self.call(CmdEquip(), "", "YYour equipment:n\n    Armor: Obj2")
 
+    def test_equip_list_dice_damage(self):
+        """test listing a prototype weapon with dice expression damage"""
+        knife = spawn(SURIVAL_KNIFE)[0]
+        knife.move_to(self.char1, quiet=True)
+        self.call(CmdInventory(), "", "YYou are carrying:n\n a survival knife")
+        self.char1.execute_cmd('wield knife')
+        output = (
+"YYour equipment:n\n"
+"   Wield1: a survival knife      (Damage: 1D)")
+        self.call(CmdEquip(), "", output)
+
     def test_equip_item(self):
         """test equipping items with equip"""
         self.char1.execute_cmd('get Obj')
@@ -251,3 +266,33 @@ class CharTraitsTestCase(CommandTest):
 " Melee Attack     :    9  Ranged Attack    :    2  Unarmed Attack   :    5 \n"
 " Defense          :    5  Power Points     :    2")
         self.call(CmdTraits(), "com", output)
+
+
+class SkillsTestCase(CommandTest):
+    """Test case for the skills command."""
+    character_typeclass = Character
+
+    def test_skills(self):
+        """test skill group and abbreviation lookups"""
+        self.call(CmdSkills(), "", "You don't have any skills.")
+        apply_archetype(self.char1, 'soldier')
+        apply_skills(self.char1, {'energy_pistol': 1, 'energy_rifle': 2,
+                                  'dodge': 0})
+        self.call(CmdSkills(), "ener", "Skills")
+        self.call(CmdSkills(), "agility", "Agility Based Skills")
+        self.call(CmdSkills(), "tch", "Usage: skills [<skillgroup> | <skill>]")
+        self.call(CmdSkills(), "xyz", "Usage: skills [<skillgroup> | <skill>]")
+
+
+class RollTestCase(CommandTest):
+    """Test case for the roll command."""
+    character_typeclass = Character
+
+    def test_roll(self):
+        """test rolling dice expressions"""
+        self.call(CmdRoll(), "", "Usage: roll[/odds] <dice> [vs <target>]")
+        self.call(CmdRoll(), "3D+3", "Pips must be 0 to 2")
+        self.call(CmdRoll(), "1D vs ten", "The target must be a number.")
+        self.call(CmdRoll(), "2D+1 x2", "You roll 2D+1 x2: ")
+        self.call(CmdRoll(), "/odds 3D+1 vs 12",
+                  "3D+1 vs 12: 50.0% chance of success.")
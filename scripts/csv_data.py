@@ -1,4 +1,7 @@
-import csv, argparse, string
+import csv, argparse, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from world.weapon_names import modify_weapon
 
 def parse_skills():
     """
@@ -36,12 +39,13 @@ def parse_weapons():
     :return: None
 
     """
-    output = ""
     with open('Weapons.csv', 'rb') as csvfile:
         reader = csv.DictReader(csvfile)
         for row in reader:
             modify_weapon(row)
-            output += """
+            # print each weapon as it is read instead of building up
+            # the whole file's output
+            print("""
     {} = {{
         'name': '{}',
         'aliases': {},
@@ -70,29 +74,7 @@ def parse_weapons():
                 row['bonus'],
                 row['use_skill'],
                 row['fix_skill']
-            )
-        print(output)
-
-def modify_weapon(row):
-    """
-    Does some modification of weapon names and aliases to spice them up.
-
-    :param row: dict of weapon data
-    """
-    # turn aliases into a list.
-    aliases = [] if not row['aliases'] else row['aliases'].split(',')
-
-    # Put some jazz on the names.
-    if row['model']:
-        model  = "%s%s" % (row["model"].upper(), row["damage"])
-        if int(row['bonus']) > 0:
-            model = "%s%s" % (model, string.ascii_lowercase[int(row["bonus"])])
-        row['name'] = "%s %s" % (model, row['name'].title())
-        aliases.append(model.lower())
-
-    row['aliases'] = aliases
-    row['key'] = row['name'].replace(" ", "_").lower().upper()
-
+            ))
 
 if __name__ == "__main__":
     parse_functions = {
@@ -0,0 +1,87 @@
+"""
+Benchmarks the streaming weapon prototype importer of `world.gamedata`.
+
+Writes a synthetic weapons CSV of the given number of rows, based on
+`Weapons.csv`, and streams it through `iter_prototypes` into a catalog
+with `upsert`, once into an empty catalog and once more into the filled
+one. Reports the throughput of each pass in rows per second and the
+process's peak memory use.
+
+Run it from the game directory:
+
+    python scripts/import_bench.py [--rows N]
+"""
+
+import argparse
+import csv
+import os
+import resource
+import sys
+import tempfile
+from timeit import default_timer
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    """Makes the game's modules importable outside of the server."""
+    sys.path.insert(0, GAME_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.conf.settings')
+    import django
+    django.setup()
+
+
+def write_catalog(path, rows):
+    """Writes `rows` weapons, cycling through the rows of `Weapons.csv`."""
+    with open(os.path.join(GAME_DIR, 'scripts', 'Weapons.csv'), 'rb') as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames
+        templates = list(reader)
+    with open(path, 'wb') as f:
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+        for i in xrange(rows):
+            row = dict(templates[i % len(templates)])
+            row['name'] = '{} mk{}'.format(row['name'], i)
+            writer.writerow(row)
+
+
+def peak_memory():
+    """Returns the peak resident memory of the process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 ** 2 if sys.platform == 'darwin' else 1024.0)
+
+
+def main(argv=None):
+    """Runs the benchmark; returns the process exit status."""
+    from world.gamedata import iter_prototypes, upsert
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--rows', type=int, default=100000,
+                        help="number of weapons to import")
+    args = parser.parse_args(argv)
+
+    handle, path = tempfile.mkstemp(suffix='.csv')
+    os.close(handle)
+    try:
+        write_catalog(path, args.rows)
+        catalog, errors = {}, []
+        for label in ('insert', 'upsert'):
+            start = default_timer()
+            counts = upsert(catalog, iter_prototypes(path, errors))
+            elapsed = default_timer() - start
+            print("{:<8} {:>10} rows {:>8.2f}s {:>12,.0f} rows/s  {}".format(
+                label, args.rows, elapsed, args.rows / elapsed,
+                ", ".join("{} {}".format(counts[k], k)
+                          for k in ('added', 'updated', 'unchanged'))))
+    finally:
+        os.remove(path)
+    print("peak memory {:.1f} MB, {} invalid rows".format(
+        peak_memory(), len(errors)))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    setup_django()
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Benchmarks and validates the dice path of `world.rulebook`.
+
+Rolls a large number of checks through `d6roll`, `skill_result` and
+`skill_check`, tests the results against the exact distributions of
+`world.rulebook.d6distribution` with chi-square tests and reports the
+throughput of each in checks per second.
+
+Run it from the game directory before deploying:
+
+    python scripts/rulebook_bench.py [--checks N] [--seed S] [--min-rate R]
+
+The exit status is non-zero if any distribution test fails or, with
+`--min-rate`, if any function rolls fewer than R checks per second.
+Chi-square tests are run at p = 0.001, so an unseeded run fails about
+once in a thousand tests by chance; pass `--seed` for repeatable runs.
+"""
+
+import argparse
+import os
+import sys
+from timeit import default_timer
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# D6 values rolled by the benchmark: 1D up to 6D+2
+VALUES = range(3, 21)
+
+SKILLS = {
+    'dodge': 1,
+    'rifle': 4,
+    'gunnery': 7,
+    'search': 2,
+}
+
+
+def setup_django():
+    """Makes the game's modules importable outside of the server."""
+    sys.path.insert(0, GAME_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.conf.settings')
+    import django
+    django.setup()
+
+
+class BenchAttributes(object):
+    """In-memory stand-in for an `AttributeHandler`."""
+    def __init__(self):
+        self.store = {}
+
+    def has(self, key):
+        return key in self.store
+
+    def add(self, key, value):
+        self.store[key] = value
+
+    def get(self, key, default=None):
+        return self.store.get(key, default)
+
+
+class BenchStore(object):
+    """In-memory stand-in for the `db` and `ndb` handlers."""
+    def __getattr__(self, key):
+        return None
+
+
+class BenchCharacter(object):
+    """Character with in-memory traits and skills.
+
+    Keeps the benchmark independent of the game database while rolling
+    through the same `TraitHandler` code as a real character.
+    """
+    id = None
+
+    def __init__(self):
+        from world import archetypes, skills
+        from world.traits import TraitHandler
+        self.attributes = BenchAttributes()
+        self.db = BenchStore()
+        self.ndb = BenchStore()
+        self.traits = TraitHandler(self, schema=archetypes.TRAIT_SCHEMA)
+        self.skills = TraitHandler(self, db_attribute='skills',
+                                   schema=skills.SKILL_SCHEMA)
+        archetypes.apply_archetype(self, 'soldier')
+        for trait in archetypes.PRIMARY_TRAITS:
+            self.traits[trait].base = 8
+        skills.apply_skills(self, SKILLS)
+
+
+def chi_square(results, pmf):
+    """Tests whether `results` fit the distribution `pmf`.
+
+    Bins expected fewer than 5 times are pooled with their neighbours.
+
+    Args:
+        results (sequence of int): observed roll results
+        pmf (ndarray): probability of each result, indexed by result
+
+    Returns:
+        (tuple) of the chi-square statistic and its critical value at
+        p = 0.001.
+    """
+    import numpy as np
+    counts = np.bincount(results, minlength=len(pmf))[:len(pmf)]
+    expected = pmf * len(results)
+    stat, bins, obs, exp = 0.0, 0, 0, 0.0
+    for o, e in zip(counts, expected):
+        obs, exp = obs + o, exp + e
+        if exp >= 5:
+            stat += (obs - exp) ** 2 / exp
+            bins += 1
+            obs, exp = 0, 0.0
+    dof = max(bins - 1, 1)
+    # Wilson-Hilferty approximation of the chi-square quantile
+    h = 2.0 / (9 * dof)
+    crit = dof * (1 - h + 3.09 * h ** 0.5) ** 3
+    return stat, crit
+
+
+def bench_d6roll(checks, stream):
+    """Rolls `d6roll` for every benchmark value."""
+    from world.rulebook import d6roll, d6distribution
+    per_value = checks // len(VALUES)
+    rows, elapsed = [], 0.0
+    for value in VALUES:
+        start = default_timer()
+        results = [d6roll(value, stream) for _ in xrange(per_value)]
+        elapsed += default_timer() - start
+        rows.append((value, results, d6distribution(value).pmf))
+    return per_value * len(VALUES), elapsed, rows
+
+
+def bench_skill_result(checks, stream):
+    """Rolls `skill_result` for each of a character's skills."""
+    from world.rulebook import skill_result, skill_value, d6distribution
+    char = BenchCharacter()
+    per_skill = checks // len(SKILLS)
+    rows, elapsed = [], 0.0
+    for key in sorted(SKILLS):
+        skill = char.skills[key]
+        value = skill_value(char, skill)
+        start = default_timer()
+        results = [skill_result(char, skill, stream)
+                   for _ in xrange(per_skill)]
+        elapsed += default_timer() - start
+        rows.append((key, results, d6distribution(value).pmf))
+    return per_skill * len(SKILLS), elapsed, rows
+
+
+def bench_skill_check(checks, stream):
+    """Rolls `skill_check` for each skill against its median result."""
+    import numpy as np
+    from world.rulebook import skill_check, skill_value, d6distribution
+    char = BenchCharacter()
+    per_skill = checks // len(SKILLS)
+    rows, elapsed = [], 0.0
+    for key in sorted(SKILLS):
+        skill = char.skills[key]
+        dist = d6distribution(skill_value(char, skill))
+        target = int(dist.ppf(0.5))
+        start = default_timer()
+        passed = sum(skill_check(char, skill, target, stream)
+                     for _ in xrange(per_skill))
+        elapsed += default_timer() - start
+        p = dist.odds(target)
+        results = [1] * passed + [0] * (per_skill - passed)
+        rows.append(("{} vs {}".format(key, target), results,
+                     np.array([1 - p, p])))
+    return per_skill * len(SKILLS), elapsed, rows
+
+
+BENCHMARKS = (
+    ('d6roll', bench_d6roll),
+    ('skill_result', bench_skill_result),
+    ('skill_check', bench_skill_check),
+)
+
+
+def main(argv=None):
+    """Runs all benchmarks; returns the process exit status."""
+    from world.rulebook import RollStream
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--checks', type=int, default=1000000,
+                        help="checks to roll per function")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="roll from a seeded RollStream")
+    parser.add_argument('--min-rate', type=float, default=0,
+                        help="fail below this many checks per second")
+    args = parser.parse_args(argv)
+    stream = None if args.seed is None else RollStream(args.seed)
+
+    failed = False
+    for name, bench in BENCHMARKS:
+        count, elapsed, rows = bench(args.checks, stream)
+        rate = count / elapsed if elapsed else float('inf')
+        print("{:<14} {:>10} checks {:>8.2f}s {:>12,.0f} checks/s".format(
+            name, count, elapsed, rate))
+        if rate < args.min_rate:
+            print("  FAIL: below {:,.0f} checks/s".format(args.min_rate))
+            failed = True
+        for label, results, pmf in rows:
+            stat, crit = chi_square(results, pmf)
+            if stat >= crit:
+                print("  FAIL: {} chi-square {:.1f} >= {:.1f}".format(
+                    label, stat, crit))
+                failed = True
+    print("FAILED" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    setup_django()
+    sys.exit(main())
@@ -15,6 +15,9 @@ at_server_cold_start()
 at_server_cold_stop()
 
 """
+from world.buffs import BUFF_SCHEDULER
+from world.gamedata import GAME_DATA
+from world.turns import get_turn_engine, remove_turn_tickers
 
 
 def at_server_start():
@@ -22,7 +25,11 @@ def at_server_start():
     This is called every time the server starts up, regardless of
     how it was shut down.
     """
-    pass
+    GAME_DATA.load()
+    BUFF_SCHEDULER.load()
+    BUFF_SCHEDULER.start()
+    get_turn_engine()
+    remove_turn_tickers()
 
 
 def at_server_stop():
@@ -30,7 +37,8 @@ def at_server_stop():
     This is called just before the server is shut down, regardless
     of it is for a reload, reset or shutdown.
     """
-    pass
+    BUFF_SCHEDULER.stop()
+    BUFF_SCHEDULER.save()
 
 
 def at_server_reload_start():
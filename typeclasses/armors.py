@@ -19,10 +19,8 @@ class Armor(Equippable):
         self.db.toughness = self.toughness
 
     def at_equip(self, character):
-        character.traits.DEF.mod += self.db.toughness
-
-    def at_remove(self, character):
-        character.traits.DEF.mod -= self.db.toughness
+        super(Armor, self).at_equip(character)
+        character.traits.DEF.mods.add(self.dbref, self.db.toughness)
 
 
 class Shield(Armor):
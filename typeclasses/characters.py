@@ -9,8 +9,17 @@ creation commands.
 """
 from evennia.contrib.rpsystem import ContribRPCharacter
 from evennia.utils import lazy_property
+from world.archetypes import TRAIT_SCHEMA
 from world.equip import EquipHandler
+from world.skills import SKILL_SCHEMA
+from world.trait_index import TRAIT_INDEX
 from world.traits import TraitHandler
+from world.turns import start_turns, stop_turns
+
+
+def _encumbrance_penalty(traits):
+    """Movement penalty of a character carrying `ENC` weight."""
+    return int(-(traits.ENC.actual // (2 * traits.STR.actual)))
 
 
 class Character(ContribRPCharacter):
@@ -34,12 +43,14 @@ class Character(ContribRPCharacter):
     @lazy_property
     def traits(self):
         """TraitHandler that manages character traits."""
-        return TraitHandler(self)
+        traits = TraitHandler(self, schema=TRAIT_SCHEMA)
+        traits.derive('MV', ('ENC', 'STR'), _encumbrance_penalty)
+        return traits
 
     @lazy_property
     def skills(self):
         """TraitHandler that manages character traits."""
-        return TraitHandler(self, db_attribute='skills')
+        return TraitHandler(self, db_attribute='skills', schema=SKILL_SCHEMA)
 
     @lazy_property
     def equip(self):
@@ -47,10 +58,36 @@ class Character(ContribRPCharacter):
         return EquipHandler(self)
 
     def at_turn_start(self):
-        """Hook called at the start of each combat turn or by a 6s ticker."""
-        # refill traits that are allocated every turn
-        self.traits.MV.fill_gauge()
-        self.traits.BM.fill_gauge()
-        self.traits.WM.fill_gauge()
+        """Hook called at the start of each turn by the turn engine.
+
+        Returns:
+            (bool): True if the character has turn work left for the
+                next turn; otherwise it is dropped from the turn engine.
+
+        Note:
+            Gauge traits that refill over time do so through their
+            regeneration `rate` when read, and need no per-turn work.
+        """
+        pending = False
         # Power Points are lost each turn
-        self.traits.PP.reset_counter()
+        if self.traits.PP is not None:
+            self.traits.PP.reset_counter()
+            pending = True
+        return pending
+
+    def at_post_puppet(self):
+        """Start taking turns when a player enters the game."""
+        super(Character, self).at_post_puppet()
+        start_turns(self)
+
+    def at_post_unpuppet(self, player, session=None):
+        """Stop taking turns when the player leaves the game."""
+        super(Character, self).at_post_unpuppet(player, session=session)
+        stop_turns(self)
+
+    def at_object_delete(self):
+        """Remove the character from the trait index before deletion."""
+        if not super(Character, self).at_object_delete():
+            return False
+        TRAIT_INDEX.remove(self)
+        return True
@@ -26,14 +26,11 @@ class Item(Object):
         self.db.weight = float(self.weight)
 
     def at_get(self, getter):
+        # the MV penalty is derived from ENC; see `Character.traits`
         getter.traits.ENC.current += self.db.weight
-        getter.traits.MV.mod = \
-            int(-(getter.traits.ENC.actual // (2 * getter.traits.STR.actual)))
 
     def at_drop(self, dropper):
         dropper.traits.ENC.current -= self.db.weight
-        dropper.traits.MV.mod = \
-            int(-(dropper.traits.ENC.actual // (2 * dropper.traits.STR.actual)))
 
 
 class Equippable(Item):
@@ -59,19 +56,33 @@ class Equippable(Item):
         """
         Hook called when an object is equipped by character.
 
+        Trait modifiers granted by the item should be added to the
+        traits' modifier stacks with the item's dbref as their source.
+
         Args:
             character: the character equipping this object
         """
-        pass
+        self.db.used_by = character
 
     def at_remove(self, character):
         """
         Hook called when an object is removed from character equip.
 
+        Removes all trait modifiers this item added to the character.
+
         Args:
             character: the character removing this object
         """
-        pass
+        character.traits.remove_mods(self.dbref)
+        self.db.used_by = None
+
+    def at_object_delete(self):
+        """Un-equip the item from its user before it is deleted."""
+        user = self.db.used_by
+        if user:
+            user.equip.remove(self)
+            self.at_remove(user)
+        return super(Equippable, self).at_object_delete()
 
     def at_drop(self, dropper):
         super(Equippable, self).at_drop(dropper)
@@ -12,7 +12,11 @@ just overloads its hooks to have it perform its function.
 
 """
 
+from time import time
+
 from evennia import DefaultScript
+from evennia.objects.models import ObjectDB
+from evennia.utils import logger
 
 
 class Script(DefaultScript):
@@ -90,3 +94,74 @@ class Script(DefaultScript):
     """
     pass
 
+
+class TurnEngine(Script):
+    """
+    Global script that runs the game turn for all characters.
+
+    Instead of a ticker per character, this one script calls the
+    `at_turn_start` hook of every character with pending turn work once
+    per turn. Characters are added with `add()`; each turn the hook runs
+    inside a `TraitHandler.batch()`, so a character's traits are saved at
+    most once per turn, and characters whose hook returns a falsy value
+    are dropped until they are added again. Idle characters are never
+    visited.
+
+    The duration of each turn is kept in `ndb.last_duration` and
+    `ndb.max_duration`, and a warning is logged whenever processing a
+    turn takes longer than the turn itself.
+    """
+    def at_script_creation(self):
+        self.key = "turn_engine"
+        self.desc = "Runs the game turn for characters with turn work."
+        self.interval = 6
+        self.persistent = True
+        self.db.pending = []
+
+    def at_start(self):
+        """Restore the set of characters with pending turn work."""
+        self.ndb.dirty = set(self.db.pending or [])
+        self.ndb.last_duration = 0.0
+        self.ndb.max_duration = 0.0
+
+    def at_server_reload(self):
+        self.db.pending = list(self.ndb.dirty or ())
+
+    def at_server_shutdown(self):
+        self.db.pending = list(self.ndb.dirty or ())
+
+    def add(self, character):
+        """Process `character` at the start of the following turns."""
+        self.ndb.dirty.add(character.id)
+
+    def discard(self, character):
+        """Stop processing `character` each turn."""
+        self.ndb.dirty.discard(character.id)
+
+    def at_repeat(self):
+        """Run one turn for all characters with pending turn work."""
+        start = time()
+        dirty = self.ndb.dirty
+        count = len(dirty)
+        for dbid in list(dirty):
+            character = ObjectDB.objects.get_id(dbid)
+            if character is None:
+                dirty.discard(dbid)
+                continue
+            try:
+                with character.traits.batch():
+                    pending = character.at_turn_start()
+            except Exception:
+                logger.log_trace(
+                    "Error in turn for {}.".format(character.key))
+                pending = False
+            if not pending:
+                dirty.discard(dbid)
+
+        duration = time() - start
+        self.ndb.last_duration = duration
+        self.ndb.max_duration = max(self.ndb.max_duration, duration)
+        if duration > self.interval:
+            logger.log_warn(
+                "Turn overran: {:.3f}s for {} characters.".format(
+                    duration, count))
@@ -3,6 +3,7 @@ Weapon typeclasses
 """
 
 from typeclasses.items import Equippable
+from world.rulebook import compile_dice
 
 
 class Weapon(Equippable):
@@ -10,7 +11,8 @@ class Weapon(Equippable):
     Typeclass for weapon objects.
 
     Attributes:
-        damage (int): primary attack stat
+        damage (int, str): primary attack stat; a D6 value or a dice
+            expression such as '1D+2' (see `rulebook.compile_dice`)
         handedness (int): indicates single- or double-handed weapon
     """
     slots = ['wield1', 'wield2']
@@ -25,10 +27,9 @@ class Weapon(Equippable):
         self.db.handedness = self.handedness
 
     def at_equip(self, character):
-        character.traits.ATKM.mod += self.db.damage
-
-    def at_remove(self, character):
-        character.traits.ATKM.mod -= self.db.damage
+        super(Weapon, self).at_equip(character)
+        character.traits.ATKM.mods.add(
+            self.dbref, compile_dice(self.db.damage).value)
 
 class RangedWeapon(Weapon):
     """
@@ -47,10 +48,9 @@ class RangedWeapon(Weapon):
         self.db.ammunition = self.ammunition
 
     def at_equip(self, character):
-        character.traits.ATKR.mod += self.db.damage
-
-    def at_remove(self, character):
-        character.traits.ATKR.mod -= self.db.damage
+        super(Weapon, self).at_equip(character)
+        character.traits.ATKR.mods.add(
+            self.dbref, compile_dice(self.db.damage).value)
 
 
 class TwoHanded(object):
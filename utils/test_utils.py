@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from .utils import d6str
+from .utils import d6str, RenderCache
 
 class UtilityTestCase(TestCase):
     """
@@ -16,3 +16,23 @@ class UtilityTestCase(TestCase):
         for value, exp in data:
             self.assertEqual(d6str(value), exp)
 
+    def test_render_cache(self):
+        cache = RenderCache()
+        calls = []
+
+        def render(width):
+            calls.append(width)
+            return 'x' * width
+
+        self.assertEqual(cache.render('a', 10, 1, render), 'x' * 10)
+        self.assertEqual(cache.render('a', 10, 1, render), 'x' * 10)
+        self.assertEqual(calls, [10])
+        # widths are cached separately
+        cache.render('a', 20, 1, render)
+        self.assertEqual(calls, [10, 20])
+        # changed source data renders again
+        cache.render('a', 10, 2, render)
+        self.assertEqual(calls, [10, 20, 10])
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
@@ -44,8 +44,53 @@ def d6str(value):
     """
     if value < 3:
         return ""
-    d = value / 3
+    d = value // 3
     p = value % 3
     rslt = "{}D".format(d) if p < 1 else "{}D+{}".format(d, p)
     return rslt
 
+
+# default screen width rendered text is wrapped to
+SCREEN_WIDTH = 78
+
+
+class RenderCache(object):
+    """Memoizes text rendered from objects' display data.
+
+    Each entry is keyed by an object key and a screen width, and stores a
+    token of the source data it was rendered from, such as a tuple of the
+    object's display attributes. A cached text is returned as long as
+    the token is unchanged; once the source data changes, the text is
+    rendered again.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def __len__(self):
+        """Returns the number of cached texts."""
+        return len(self.entries)
+
+    def render(self, key, width, source, func):
+        """Returns the cached text for `key` and `width`, rendering it
+        with `func(width)` if missing or stale.
+
+        Args:
+            key (hashable): identifies the object being rendered
+            width (int): screen width to render for
+            source (hashable): token of the data the text is rendered
+                from; a different token invalidates the cached text
+            func (callable): renders the text for a width
+        """
+        entry = self.entries.get((key, width))
+        if entry is not None and entry[0] == source:
+            return entry[1]
+        text = func(width)
+        self.entries[key, width] = (source, text)
+        return text
+
+    def clear(self):
+        """Removes all cached texts."""
+        self.entries = {}
+
+
+RENDER_CACHE = RenderCache()
@@ -43,12 +43,15 @@ Module Functions:
 
     - `load_archetype(name)`
 
-        Returns an instance of the named Archetype class.
+        Returns the shared, read-only instance of the named Archetype
+        from `ARCHETYPES`.
 """
 
 from collections import OrderedDict
 from evennia.utils import fill
 from evennia.utils.evtable import EvTable
+from world.traits import build_schema
+from utils.utils import RENDER_CACHE, SCREEN_WIDTH
 
 
 class ArchetypeException(Exception):
@@ -85,6 +88,31 @@ OTHER_TRAITS = ('CP', 'ENC')
 
 ALL_TRAITS = (PRIMARY_TRAITS + SECONDARY_TRAITS + OTHER_TRAITS) # ADD psionics later
 
+# static trait metadata, shared by all archetypes
+TRAIT_DEFINITIONS = {
+    # primary
+    'AGL': {'type': 'static', 'name': 'Agility', 'extra': {'is_d6': True}},
+    'STR': {'type': 'static', 'name': 'Strength', 'extra': {'is_d6': True}},
+    'KNW': {'type': 'static', 'name': 'Knowledge', 'extra': {'is_d6': True}},
+    'TCH': {'type': 'static', 'name': 'Technical', 'extra': {'is_d6': True}},
+    'PER': {'type': 'static', 'name': 'Perception', 'extra': {'is_d6': True}},
+    'MCH': {'type': 'static', 'name': 'Mechanical', 'extra': {'is_d6': True}},
+    # secondary
+    'WOUNDS': {'type': 'static', 'min': 0, 'max': 6, 'name': 'Wounds'},
+    'FATE': {'type': 'static', 'name': 'Fate'},
+    # misc
+    'ENC': {'type': 'counter', 'min': 0, 'name': 'Carry Weight'},
+    'CP': {'type': 'static', 'name': 'Character Points'},
+    # gauges, regenerating `rate` points per second; they used to be
+    # refilled every 6 seconds by a ticker
+    'MV': {'type': 'gauge', 'base': 6, 'rate': 1, 'name': 'Movement Points'},
+    'BM': {'type': 'gauge', 'rate': 0.5, 'name': 'Black Mana'},
+    'WM': {'type': 'gauge', 'rate': 0.5, 'name': 'White Mana'},
+}
+
+# metadata schema for character `traits` handlers
+TRAIT_SCHEMA = build_schema(TRAIT_DEFINITIONS)
+
 TOTAL_PRIMARY_POINTS = 54
 
 def apply_archetype(char, name, reset=False):
@@ -111,9 +139,9 @@ def apply_archetype(char, name, reset=False):
     archetype = load_archetype(name)
     char.db.archetype = archetype.name
     if reset:
-        char.traits.clear()
-    for key, kwargs in archetype.traits.iteritems():
-        char.traits.add(key, **kwargs)
+        char.traits.replace_all(archetype.traits)
+    else:
+        char.traits.add_many(archetype.traits)
 
 
 def get_remaining_allocation(traits):
@@ -168,59 +196,95 @@ def finalize_traits(traits):
     applies any `mod` values to the traits' `base`, then resets
     the `mod` property.
     """
-    for t in PRIMARY_TRAITS + SECONDARY_TRAITS:
-        traits[t].base = traits[t].actual if traits[t].actual >= 1 else 1 # min 1D on anything.
-        traits[t].reset_mod()
+    with traits.batch():
+        for t in PRIMARY_TRAITS + SECONDARY_TRAITS:
+            traits[t].base = traits[t].actual if traits[t].actual >= 1 else 1 # min 1D on anything.
+            traits[t].reset_mod()
 
 
 def load_archetype(name):
-    """Loads an instance of the named Archetype class.
+    """Loads the named Archetype.
 
     Args:
         name (str): Name of either single or dual-archetype
 
     Return:
-        (Archetype): An instance of the requested archetype class.
+        (Archetype): The shared, read-only instance of the requested
+            archetype.
     """
-    name = name.lower()
     try:
-        data = ARCHETYPE_DATA[name].copy()
-        archetype = Archetype(data)
+        return ARCHETYPES[name.lower()]
     except KeyError:
         raise ArchetypeException("No data found for {}".format(name))
 
-    return archetype
+
+def _freeze(trait):
+    """Returns trait data as a sorted tuple of items, including `extra`."""
+    if 'extra' in trait:
+        trait = dict(trait, extra=tuple(sorted(trait['extra'].iteritems())))
+    return tuple(sorted(trait.iteritems()))
+
 
 # Archetype Classes
 
 
 class Archetype(object):
-    """Base archetype class containing default values for all traits."""
+    """Base archetype class containing default values for all traits.
+
+    Archetypes are read-only templates; each is compiled once into
+    `ARCHETYPES` and shared by all callers of `load_archetype`.
+    """
+    __slots__ = ('name', '_desc', '_traits')
+
     def __init__(self, d):
         try:
-            self.name = d['name']
-            self._desc = d['desc']
-            self.traits = {
-                # primary
-                'AGL': {'type': 'static', 'base': d['AGL'], 'mod': 0, 'name': 'Agility', 'extra': {'is_d6': True}},
-                'STR': {'type': 'static', 'base': d['STR'], 'mod': 0, 'name': 'Strength', 'extra': {'is_d6': True}},
-                'KNW': {'type': 'static', 'base': d['KNW'], 'mod': 0, 'name': 'Knowledge', 'extra': {'is_d6': True}},
-                'TCH': {'type': 'static', 'base': d['TCH'], 'mod': 0, 'name': 'Technical', 'extra': {'is_d6': True}},
-                'PER': {'type': 'static', 'base': d['PER'], 'mod': 0, 'name': 'Perception', 'extra': {'is_d6': True}},
-                'MCH': {'type': 'static', 'base': d['MCH'], 'mod': 0, 'name': 'Mechanical', 'extra': {'is_d6': True}},
-                # secondary
-                'WOUNDS': {'type': 'static', 'base': 0, 'mod': 0, 'min': 0, 'max': 6, 'name': 'Wounds'},
-                'FATE': {'type': 'static', 'base': 0, 'mod': 0, 'name': 'Fate'},
-                # misc
-                'ENC': {'type': 'counter', 'base': 0, 'mod': 0, 'min': 0, 'name': 'Carry Weight'},
-                'CP': {'type': 'static', 'base': 0, 'mod': 0, 'name': 'Character Points'},
-            }
+            name = d['name']
+            desc = d['desc']
+            # nested tuples, so the template itself can't be modified
+            traits = tuple(
+                (key, _freeze(dict(
+                    meta, mod=0,
+                    base=d[key] if key in PRIMARY_TRAITS
+                    else meta.get('base', 0))))
+                for key, meta in sorted(TRAIT_DEFINITIONS.iteritems())
+            )
         except KeyError:
             raise ArchetypeException("Archetype data invalid.")
+        setattr_ = super(Archetype, self).__setattr__
+        setattr_('name', name)
+        setattr_('_desc', desc)
+        setattr_('_traits', traits)
+
+    def __setattr__(self, key, value):
+        raise ArchetypeException("Archetypes are read-only.")
+
+    @property
+    def traits(self):
+        """A new dict of initial trait data, for `TraitHandler.add_many`."""
+        traits = {}
+        for key, items in self._traits:
+            trait = traits[key] = dict(items)
+            if 'extra' in trait:
+                trait['extra'] = dict(trait['extra'])
+        return traits
 
     @property
     def ldesc(self):
         """Returns a formatted description of the Archetype."""
+        return self.get_ldesc()
+
+    def get_ldesc(self, width=SCREEN_WIDTH):
+        """Returns the formatted description for a screen width.
+
+        The description is rendered once per width and cached in
+        `RENDER_CACHE` until the archetype's data changes.
+        """
+        return RENDER_CACHE.render(('archetype', self.name), width,
+                                   (self._desc, self._traits),
+                                   self._render_ldesc)
+
+    def _render_ldesc(self, width):
+        """Renders the formatted description of the Archetype."""
         desc = "Archetype: |c{archetype}|n\n"
         desc += '~' * (11 + len(self.name)) + '\n'
         desc += self.desc
@@ -228,11 +292,12 @@ class Archetype(object):
         desc += "|c{archetype}s|n start with the following base primary traits:"
         desc += "\n{traits}\n"
 
+        trait_data = self.traits
         data = []
         for i in xrange(3):
-            data.append([self._format_trait_3col(self.traits[t])
+            data.append([self._format_trait_3col(trait_data[t])
                          for t in PRIMARY_TRAITS[i::3]])
-        traits = EvTable(header=False, table=data)
+        traits = EvTable(header=False, table=data, maxwidth=width)
 
         return desc.format(archetype=self.name,
                            traits=traits)
@@ -242,11 +307,12 @@ class Archetype(object):
         """The narrative description of the Archetype."""
         return self._desc
 
-    @desc.setter
-    def desc(self, desc):
-        self._desc = desc
-
     def _format_trait_3col(self, trait):
         """Return a trait : value pair formatted for 3col layout"""
         return "|C{:<16.16}|n : |w{:>3}|n".format(
                     trait['name'], trait['base']) # TODO trait['base'] needs to be wrapped in a d6 formatter
+
+
+# read-only archetype templates, compiled once
+ARCHETYPES = {name: Archetype(data)
+              for name, data in ARCHETYPE_DATA.iteritems()}
@@ -0,0 +1,209 @@
+"""
+Timed buffs module.
+
+Timed buffs are modifiers added to a `Trait`'s modifier stack (see
+`world.traits.ModifierStack`) that are removed again after a number of
+seconds, such as a stim pack giving +1D to AGL for a minute.
+
+Rather than running a Script or deferred call per buff, every buff's
+expiry time is pushed onto one server-wide min-heap owned by
+`BUFF_SCHEDULER`. A single looping call checks the top of the heap once
+per `interval` and removes all buffs that have come due in one batch,
+saving each affected character's traits only once. The heap is saved
+when the server stops and loaded again when it starts, so buffs survive
+`@reload`, and buffs that expired while the server was down are removed
+on the first tick after startup.
+
+Module Functions:
+
+    - `add_buff(obj, trait, source, value, duration, kind='add',
+                handler='traits')`
+
+        Adds a modifier from `source` to `obj`'s trait and schedules its
+        removal after `duration` seconds. Adding a buff again from the
+        same source refreshes its value and duration.
+
+    - `remove_buff(obj, trait, source, kind='add', handler='traits')`
+
+        Removes a buff before it expires.
+
+Example:
+
+    ```python
+    >>> from world import buffs
+    >>> buffs.add_buff(char, 'AGL', 'stim pack', 3, 60)
+    >>> char.traits.AGL.actual
+    11
+    ```
+"""
+
+import heapq
+from time import time
+
+from twisted.internet import task
+from evennia.objects.models import ObjectDB
+from evennia.server.models import ServerConfig
+from evennia.utils import logger
+
+
+class BuffException(Exception):
+    """Base exception class for the buffs module.
+
+    Args:
+        msg (str): informative error message
+    """
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class BuffScheduler(object):
+    """Expires timed buffs from a single min-heap.
+
+    Heap entries are `(expires, key)` tuples, where `key` is a tuple of
+    `(object id, handler name, trait key, source, kind)`. Refreshing or
+    removing a buff does not search the heap; the `live` dict maps each
+    key to its current expiry time and outdated heap entries are skipped
+    when they are popped.
+
+    Args:
+        interval (int): seconds between checks for expired buffs
+    """
+    config_key = 'buff_scheduler_heap'
+
+    def __init__(self, interval=1):
+        self.interval = interval
+        self.heap = []
+        self.live = {}
+        self._loop = None
+
+    def __len__(self):
+        """Returns the number of active buffs."""
+        return len(self.live)
+
+    def add(self, obj, trait, source, value, duration,
+            kind='add', handler='traits'):
+        """Adds a timed modifier to a trait. See `add_buff`."""
+        target = getattr(obj, handler).get(trait)
+        if target is None:
+            raise BuffException("Trait not found: {}".format(trait))
+        target.mods.add(source, value, kind=kind)
+
+        expires = time() + duration
+        key = (obj.id, handler, trait, source, kind)
+        self.live[key] = expires
+        heapq.heappush(self.heap, (expires, key))
+
+    def remove(self, obj, trait, source, kind='add', handler='traits'):
+        """Removes a timed modifier early. See `remove_buff`."""
+        key = (obj.id, handler, trait, source, kind)
+        if self.live.pop(key, None) is None:
+            return False
+        target = getattr(obj, handler).get(trait)
+        if target is not None:
+            target.mods.remove(source, kind=kind)
+        return True
+
+    def tick(self, now=None):
+        """Removes all buffs that expired at or before `now`.
+
+        Args:
+            now Optional(float): timestamp to expire buffs up to;
+                defaults to the current time
+
+        Returns:
+            (int): number of buffs removed
+        """
+        now = time() if now is None else now
+        heap, live = self.heap, self.live
+        due = {}
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            if live.get(key) != expires:
+                # refreshed or removed since this entry was pushed
+                continue
+            del live[key]
+            due.setdefault(key[:2], []).append(key[2:])
+
+        count = 0
+        for (dbid, handler), buffs in due.iteritems():
+            obj = ObjectDB.objects.get_id(dbid)
+            if obj is None:
+                continue
+            traits = getattr(obj, handler)
+            with traits.batch():
+                for trait, source, kind in buffs:
+                    target = traits.get(trait)
+                    if target is not None:
+                        target.mods.remove(source, kind=kind)
+                        count += 1
+        return count
+
+    def start(self):
+        """Starts checking for expired buffs every `interval` seconds."""
+        if self._loop is None:
+            self._loop = task.LoopingCall(self._tick)
+            self._loop.start(self.interval, now=True)
+
+    def stop(self):
+        """Stops checking for expired buffs."""
+        if self._loop is not None:
+            if self._loop.running:
+                self._loop.stop()
+            self._loop = None
+
+    def save(self):
+        """Saves all active buffs to the database."""
+        ServerConfig.objects.conf(
+            self.config_key,
+            value=[(expires, key) for key, expires in self.live.iteritems()])
+
+    def load(self):
+        """Loads active buffs saved by `save()`."""
+        entries = ServerConfig.objects.conf(self.config_key) or []
+        self.heap = [(expires, tuple(key)) for expires, key in entries]
+        heapq.heapify(self.heap)
+        self.live = {key: expires for expires, key in self.heap}
+
+    def _tick(self):
+        """Looping call target; keeps the loop alive on errors."""
+        try:
+            self.tick()
+        except Exception:
+            logger.log_trace("Error expiring timed buffs.")
+
+
+BUFF_SCHEDULER = BuffScheduler()
+
+
+def add_buff(obj, trait, source, value, duration,
+             kind='add', handler='traits'):
+    """Adds a modifier to a trait that is removed after `duration`.
+
+    Args:
+        obj (Object): object with the trait handler
+        trait (str): key of the trait to modify
+        source (str): identifier of what applies the buff
+        value (int, float): modifier amount or multiplier
+        duration (int, float): seconds until the buff expires
+        kind (str): 'add' or 'mult' modifier
+        handler (str): name of the `TraitHandler` property on `obj`
+    """
+    BUFF_SCHEDULER.add(obj, trait, source, value, duration,
+                       kind=kind, handler=handler)
+
+
+def remove_buff(obj, trait, source, kind='add', handler='traits'):
+    """Removes a buff from a trait before it expires.
+
+    Args:
+        obj (Object): object with the trait handler
+        trait (str): key of the modified trait
+        source (str): identifier the buff was added with
+        kind (str): 'add' or 'mult' modifier
+        handler (str): name of the `TraitHandler` property on `obj`
+
+    Returns:
+        (bool): True if an active buff was removed
+    """
+    return BUFF_SCHEDULER.remove(obj, trait, source,
+                                 kind=kind, handler=handler)
@@ -5,12 +5,12 @@ The menu node functions defined in this module make up
 the Ainneve character creation process, which is based
 on a subset of Open Adventure rules.
 """
-from evennia import spawn, TICKER_HANDLER as tickerhandler
+from evennia import spawn
 from evennia.utils import fill, dedent
 from evennia.utils.evtable import EvTable
-from evennia.contrib import dice
 
 from world import archetypes, races, skills
+from world.rulebook import RollStream
 from world.economy import format_credits as as_price
 from world.economy import transfer_funds, InsufficientFunds
 
@@ -195,7 +195,7 @@ def menunode_race_and_focuses(caller, raw_string):
     help = fill("After selecting a focus, you will be prompted "
                 "to save your race/focus combination.")
 
-    options = [{"desc": f.name,
+    options = [{"desc": f.title(),
                 "goto": "menunode_select_race_focus"}
                for f in race.foci]
     options.append({"key": ("Back", "_default"),
@@ -250,7 +250,6 @@ def menunode_allocate_mana(caller, raw_string):
 
         archetypes.calculate_secondary_traits(char.traits)
         archetypes.finalize_traits(char.traits)
-        tickerhandler.add(char, 6, hook_key='at_turn_start')
         skills.apply_skills(char)
         return menunode_allocate_skills(caller, output)
 
@@ -326,7 +325,10 @@ def menunode_allocate_skills(caller, raw_string):
         output = "Final Skills:\n"
         output += "{skills}\n"
 
-        char.db.wallet['SC'] = dice.roll(2, 3, ('+', 3))
+        # keep the seed so the starting funds roll can be reproduced
+        stream = RollStream()
+        char.db.chargen_seed = stream.seed
+        char.db.wallet['SC'] = stream.dice(2, 3, 3)
         output += "You begin with |w{sc} SC|n (Silver Coins)."
 
         return menunode_equipment_cats(
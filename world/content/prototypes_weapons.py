@@ -1,8 +1,13 @@
 """
 Prototype module containing weapons and shields.
+
+The weapons of `scripts/Weapons.csv`, and of any extra weapon catalogs
+listed in `settings.WEAPON_CATALOGS`, are added to this module by
+`world.gamedata.load_prototypes`, keyed by their prototype keys.
 """
 
 from evennia.utils import fill
+from world.gamedata import load_prototypes
 
 ## Weapons from D6
 SURIVAL_KNIFE = {
@@ -13,7 +18,7 @@ SURIVAL_KNIFE = {
             "it has a nano razor blade and a strudy handle.",
     "weight": 1,
     "value": 3,  # VE
-    "damage": 3, # ID
+    "damage": "1D",
 }
 
 COLLASIBLE_STAFF = {
@@ -25,7 +30,7 @@ COLLASIBLE_STAFF = {
             "retract and expand at will by the wielder.",
     "weight": 4,
     "value": 8, # E
-    "damage": 5, # 1D+2
+    "damage": "1D+2",
 }
 
 ## Weapons from OA
@@ -38,7 +43,7 @@ HAND_AXE = {
             "tarnished, but its handle is straight and sturdy.",
     "weight": 1,
     "value": 60,
-    "damage": 2,
+    "damage": "0D+2",
 }
 
 BATTLE_AXE = {
@@ -49,7 +54,7 @@ BATTLE_AXE = {
             "large blade, and a hard swing of it can send enemies flying. ",
     "weight": 3,
     "value": 3,
-    "damage": 4,
+    "damage": "1D+1",
 }
 
 DAGGER = {
@@ -60,7 +65,7 @@ DAGGER = {
             "a simple leather-wrapped metal hilt.",
     "weight": 0.5,
     "value": 30,
-    "damage": 1,
+    "damage": "0D+1",
 }
 
 MAUL_HAMMER = {
@@ -71,7 +76,7 @@ MAUL_HAMMER = {
             "ready to deliver crushing blows to your enemies.",
     "weight": 5,
     "value": 2,
-    "damage": 4,
+    "damage": "1D+1",
 }
 
 LANCE_POLEARM = {
@@ -82,7 +87,7 @@ LANCE_POLEARM = {
             "lance polearm threatens even enemies at a distance.",
     "weight": 4,
     "value": 2,
-    "damage": 4,
+    "damage": "1D+1",
 }
 
 PIKE_POLEARM = {
@@ -93,7 +98,7 @@ PIKE_POLEARM = {
             "designed to unseat a rider on horseback.",
     "weight": 9,
     "value": 50,
-    "damage": 3,
+    "damage": "1D",
 }
 
 MAPLE_STAFF = {
@@ -105,7 +110,7 @@ MAPLE_STAFF = {
             "could be enchanted...",
     "weight": 2,
     "value": 2,
-    "damage": 0,
+    "damage": "0D",
 }
 
 MACE_ROD = {
@@ -117,7 +122,7 @@ MACE_ROD = {
             "some damage.",
     "weight": 2,
     "value": 50,
-    "damage": 2,
+    "damage": "0D+2",
 }
 
 MORNINGSTAR_ROD = {
@@ -129,7 +134,7 @@ MORNINGSTAR_ROD = {
             "intimidate.",
     "weight": 2,
     "value": 1,
-    "damage": 3,
+    "damage": "1D",
 }
 
 SCYTHE = {
@@ -141,7 +146,7 @@ SCYTHE = {
             "apart.",
     "weight": 1,
     "vaule": 1,
-    "damage": 1,
+    "damage": "0D+1",
 }
 
 SHORT_SWORD = {
@@ -152,7 +157,7 @@ SHORT_SWORD = {
             "short sword. Surely it has seen its share of battle.",
     "weight": 1,
     "value": 1,
-    "damage": 2,
+    "damage": "0D+2",
 }
 
 RAPIER = {
@@ -163,7 +168,7 @@ RAPIER = {
             "better days, but the hilt looks almost new.",
     "weight": 1,
     "value": 3,
-    "damage": 3,
+    "damage": "1D",
 }
 
 WHIP = {
@@ -174,7 +179,7 @@ WHIP = {
             "layers. It extends the user's reach and can be used to disarm.",
     "weight": 1,
     "value": 30,
-    "damage": 1,
+    "damage": "0D+1",
 }
 
 
@@ -190,7 +195,7 @@ LONG_BOW = {
             "of your enemies.",
     "weight": 1,
     "value": 40,
-    "damage": 1,
+    "damage": "0D+1",
     "range": 16,
     "ammunition": "arrows",
 }
@@ -203,7 +208,7 @@ HAND_CROSSBOW = {
             "adventurers may even choose to dual-wield them.  ",
     "weight": 2,
     "value": 4,
-    "damage": 0,
+    "damage": "0D",
     "range": 8,
     "ammunition": "quarrels",
 }
@@ -216,7 +221,7 @@ LIGHT_CROSSBOW = {
             "quarrels with incredible force and accuracy. ",
     "weight": 3,
     "value": 3,
-    "damage": 1,
+    "damage": "0D+1",
     "range": 11,
     "ammunition": "quarrels",
 }
@@ -273,7 +278,7 @@ THROWING_AXE = {
             "and true when thrown.",
     "weight": 2,
     "value": 80,
-    "damage": 0,
+    "damage": "0D",
     "range": 3,
 }
 
@@ -285,7 +290,7 @@ THROWING_DAGGER = {
             "silently when thrown by a skilled assassin.",
     "weight": 1,
     "value": 30,
-    "damage": 0,
+    "damage": "0D",
     "range": 2,
 }
 
@@ -297,7 +302,7 @@ JAVELIN = {
             "weapons.",
     "weight": 1,
     "value": 15,
-    "damage": 1,
+    "damage": "0D+1",
     "range": 6,
 }
 
@@ -309,6 +314,10 @@ TRIDENT = {
             "inflicts the most damage of the thrown weapons.",
     "weight": 2,
     "value": 1,
-    "damage": 2,
+    "damage": "0D+2",
     "range": 2,
 }
+
+## Weapons from scripts/Weapons.csv and settings.WEAPON_CATALOGS
+
+load_prototypes(globals())
@@ -64,6 +64,7 @@ Example usage:
     True
 """
 from typeclasses.items import Equippable
+from world.races import RACES
 
 
 class EquipException(Exception):
@@ -97,7 +98,12 @@ class EquipHandler(object):
         if not self.obj.db.slots:
             raise EquipException('`EquipHandler` requires `db.slots` attribute on `obj`.')
 
-        if obj.db.limbs and len(obj.db.limbs) > 0:
+        race = RACES.get((obj.db.race or '').lower())
+        if race is not None and obj.db.limbs == race.limbs:
+            # use the race's precomputed slot order
+            self.limbs = dict(race.limbs)
+            self.slot_order = race.slot_order
+        elif obj.db.limbs and len(obj.db.limbs) > 0:
             self.limbs = {limb: slots for limb, slots in obj.db.limbs}
             self.slot_order = reduce(lambda x, y: x+y, (s for l, s in obj.db.limbs))
             # check that all slots are accounted for
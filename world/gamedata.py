@@ -0,0 +1,439 @@
+"""
+Game data module.
+
+Compiles the game data kept in CSV files under `scripts/` into validated
+binary artifacts, replacing the Python literals `scripts/csv_data.py`
+prints for pasting into source modules. The skill registry of
+`world.skills` and the weapon prototypes of
+`world.content.prototypes_weapons` are built from `GAME_DATA`. Sources
+are compiled on first use; `GAME_DATA.load()` is called at server start
+to compile them all and log their invalid rows.
+
+Each data source is a CSV file and a row compiler function. Compiling a
+source validates every row, collecting the errors of invalid rows by
+line number instead of failing on the first, and pickles the valid rows
+together with a format version, a token of the registries the rows were
+validated against (see `registry_token(name)`) and the source file's size,
+mtime and SHA-1 hash into `server/cache/<source>.pickle`.
+
+An artifact is only rebuilt when its source or the registries change:
+if the source's size and mtime match the artifact it is used as-is, and
+if only the mtime changed the source is hashed and the artifact is
+reused when the hash still matches.
+
+Module Functions:
+
+    - `iter_rows(path, compiler, errors=None)`
+
+        Generator of the compiled rows of a CSV file, read lazily one
+        row at a time.
+
+    - `iter_prototypes(path=None, errors=None)`
+
+        Generator of the weapon prototypes in a CSV file.
+
+    - `upsert(catalog, rows)`
+
+        Adds new and replaces changed rows in a catalog dict.
+
+    - `load_prototypes(catalog, paths=None)`
+
+        Adds the weapons of `Weapons.csv` and streams those of the extra
+        catalogs listed in `settings.WEAPON_CATALOGS` into a prototype
+        catalog; used by `world.content.prototypes_weapons`.
+
+    - `compile_skill(row)` and `compile_weapon(row)`
+
+        Row compilers; validate a CSV row and return its key and data,
+        or raise `GameDataException`.
+
+    - `registry_token(name)`
+
+        Token of the registries the rows of a source are validated
+        against.
+
+Example:
+
+    ```python
+    >>> from world.gamedata import GAME_DATA, iter_prototypes, upsert
+    >>> GAME_DATA.load()
+    {'skills': 43, 'weapons': 14}
+    >>> GAME_DATA['weapons']['SG16_SHOTGUN']['damage']
+    '5D+1'
+    >>> GAME_DATA.errors('weapons')
+    []
+    >>> upsert(catalog, iter_prototypes('more_weapons.csv'))
+    {'added': 120, 'updated': 3, 'unchanged': 0}
+    >>> for key, prototype in iter_prototypes():
+    ...     spawn(prototype)
+    ```
+"""
+
+import csv
+import hashlib
+import os
+import pickle
+import string
+
+from django.conf import settings
+from evennia.utils import logger
+from world.weapon_names import modify_weapon
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(GAME_DIR, 'server', 'cache')
+
+# bump whenever the artifact layout or a row compiler's output changes
+FORMAT_VERSION = 2
+
+
+class GameDataException(Exception):
+    """Base exception class for the game data module.
+
+    Args:
+        msg (str): informative error message
+    """
+    def __init__(self, msg):
+        self.msg = msg
+
+
+def _int(row, field, minimum=0):
+    """Returns the integer value of a CSV field."""
+    try:
+        value = int(row[field])
+    except (TypeError, ValueError):
+        raise GameDataException(
+            "{} must be a whole number, not '{}'.".format(field, row[field]))
+    if value < minimum:
+        raise GameDataException(
+            "{} must be at least {}.".format(field, minimum))
+    return value
+
+
+def _required(row, field):
+    """Returns the stripped value of a CSV field that must be set."""
+    value = (row.get(field) or '').strip()
+    if not value:
+        raise GameDataException("{} is required.".format(field))
+    return value
+
+
+def compile_skill(row):
+    """Validates a row of `Skills.csv`.
+
+    Returns:
+        (tuple) of the skill key and its `world.skills` data dict.
+    """
+    from world.archetypes import PRIMARY_TRAITS
+    key = _required(row, 'key').lower()
+    trait = _required(row, 'trait').upper()
+    if trait not in PRIMARY_TRAITS:
+        raise GameDataException("Invalid trait {}.".format(trait))
+    initial = row.get('initial')
+    return key, {
+        'name': _required(row, 'name').title(),
+        'trait': trait,
+        'desc': (row.get('desc') or '').strip(),
+        'initial': _int(row, 'initial') if initial else None,
+    }
+
+
+def compile_weapon(row):
+    """Validates a row of `Weapons.csv`.
+
+    Returns:
+        (tuple) of the prototype key and the weapon's prototype dict.
+    """
+    from world.rulebook import compile_dice, DiceRollError
+    from world.skills import SKILLS
+    _required(row, 'name')
+    try:
+        damage = str(compile_dice(_required(row, 'damage')))
+    except DiceRollError as e:
+        raise GameDataException("damage: {}".format(e.msg))
+    typeclass = _required(row, 'typeclass')
+    bonus = _int(row, 'bonus')
+    if bonus >= len(string.ascii_lowercase):
+        raise GameDataException("bonus must be less than 26.")
+    for field in ('use_skill', 'fix_skill'):
+        if _required(row, field) not in SKILLS:
+            raise GameDataException(
+                "Invalid {} {}.".format(field, row[field]))
+    data = {
+        'typeclass': typeclass,
+        'desc': (row.get('desc') or '').strip(),
+        'weight': _int(row, 'weight'),
+        'value': _int(row, 'value'),
+        'damage': damage,
+        'wear': _int(row, 'wear'),
+        'durability': _int(row, 'durability'),
+        'bonus': bonus,
+        'use_skill': row['use_skill'].strip(),
+        'fix_skill': row['fix_skill'].strip(),
+    }
+    row = dict(row)
+    modify_weapon(row)
+    data['key'] = row['name']
+    data['aliases'] = row['aliases']
+    return row['key'], data
+
+
+def registry_token(name):
+    """Returns a token of the registries the rows of source `name` are
+    validated against; it changes whenever a primary trait is added or
+    removed, or for weapons, a skill.
+
+    Skills are only validated against the primary traits, so that
+    `world.skills` can build its registry from `GAME_DATA`.
+    """
+    from world.archetypes import PRIMARY_TRAITS
+    registries = (PRIMARY_TRAITS,)
+    if name == 'weapons':
+        from world.skills import SKILLS
+        registries += (SKILLS.keys,)
+    return hashlib.sha1(repr(registries).encode('utf-8')).hexdigest()
+
+
+SOURCES = {
+    'skills': (os.path.join('scripts', 'Skills.csv'), compile_skill),
+    'weapons': (os.path.join('scripts', 'Weapons.csv'), compile_weapon),
+}
+
+
+class GameData(object):
+    """Compiles CSV data sources and holds their loaded rows.
+
+    Args:
+        sources (dict): maps each source name to a tuple of its CSV path,
+            relative to `base_dir`, and its row compiler
+        base_dir (str): directory source paths are relative to
+        cache_dir (str): directory compiled artifacts are written to
+        token (callable): called with a source name, returns the current
+            registry token of the source; artifacts stored with a
+            different token are rebuilt
+
+    Attributes:
+        artifacts (dict): loaded artifact of each compiled source
+    """
+    def __init__(self, sources=SOURCES, base_dir=GAME_DIR,
+                 cache_dir=CACHE_DIR, token=registry_token):
+        self.sources = sources
+        self.base_dir = base_dir
+        self.cache_dir = cache_dir
+        self.token = token
+        self.artifacts = {}
+
+    def __getitem__(self, name):
+        """Returns the valid rows of source `name`, keyed by row key."""
+        if name not in self.artifacts:
+            self.compile(name)
+        return self.artifacts[name]['rows']
+
+    def errors(self, name):
+        """Returns `(line, message)` tuples for the invalid rows of `name`."""
+        if name not in self.artifacts:
+            self.compile(name)
+        return self.artifacts[name]['errors']
+
+    def load(self):
+        """Compiles or loads every source, logging invalid rows.
+
+        Returns:
+            (dict): number of valid rows of each source
+        """
+        counts = {}
+        for name in self.sources:
+            artifact = self.compile(name)
+            for line, msg in artifact['errors']:
+                logger.log_err("{} line {}: {}".format(
+                    self.sources[name][0], line, msg))
+            counts[name] = len(artifact['rows'])
+        return counts
+
+    def compile(self, name, force=False):
+        """Returns the artifact of `name`, rebuilding it if out of date.
+
+        Args:
+            name (str): source name
+            force (bool): rebuild even if the artifact is up to date
+
+        Returns:
+            (dict): artifact with the source's `rows` and `errors`
+        """
+        try:
+            path, compiler = self.sources[name]
+        except KeyError:
+            raise GameDataException("Invalid data source {}.".format(name))
+        path = os.path.join(self.base_dir, path)
+        stat = os.stat(path)
+        token = self.token(name)
+
+        artifact = None if force else self._read(name, token)
+        if artifact is not None and artifact['size'] == stat.st_size:
+            if artifact['mtime'] == stat.st_mtime:
+                self.artifacts[name] = artifact
+                return artifact
+            if artifact['sha1'] == _sha1(path):
+                # touched but unchanged; record the new mtime
+                artifact['mtime'] = stat.st_mtime
+                self._write(name, artifact)
+                self.artifacts[name] = artifact
+                return artifact
+
+        rows, errors = {}, []
+
+        def compile_row(row):
+            key, data = compiler(row)
+            if key in rows:
+                raise GameDataException("Duplicate key {}.".format(key))
+            return key, data
+
+        upsert(rows, iter_rows(path, compile_row, errors))
+
+        artifact = {
+            'version': FORMAT_VERSION,
+            'registry': token,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha1': _sha1(path),
+            'rows': rows,
+            'errors': errors,
+        }
+        self._write(name, artifact)
+        self.artifacts[name] = artifact
+        return artifact
+
+    def _artifact_path(self, name):
+        """Returns the file path of the artifact of `name`."""
+        return os.path.join(self.cache_dir, '{}.pickle'.format(name))
+
+    def _read(self, name, token):
+        """Returns the stored artifact of `name`, or None if unusable."""
+        try:
+            with open(self._artifact_path(name), 'rb') as f:
+                artifact = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if (artifact.get('version') != FORMAT_VERSION
+                or artifact.get('registry') != token):
+            return None
+        return artifact
+
+    def _write(self, name, artifact):
+        """Atomically stores the artifact of `name`."""
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        path = self._artifact_path(name)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(artifact, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(path + '.tmp', path)
+
+
+def iter_rows(path, compiler, errors=None):
+    """Lazily reads and compiles the rows of a CSV file.
+
+    Only one row is held in memory at a time, so the rows can be streamed
+    into a catalog with `upsert()` or into the spawner whatever the size
+    of the file.
+
+    Args:
+        path (str): CSV file path
+        compiler (callable): row compiler, such as `compile_weapon`
+        errors Optional(list): list to append a `(line, message)` tuple
+            to for each invalid row; invalid rows are logged if omitted
+
+    Yields:
+        (tuple) of the key and data of each valid row.
+    """
+    with open(path, 'rb') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            if not any(row.values()):
+                continue
+            try:
+                compiled = compiler(row)
+            except GameDataException as e:
+                if errors is None:
+                    logger.log_err("{} line {}: {}".format(
+                        path, reader.line_num, e.msg))
+                else:
+                    errors.append((reader.line_num, e.msg))
+                continue
+            yield compiled
+
+
+def iter_prototypes(path=None, errors=None):
+    """Lazily reads weapon prototypes from a CSV file.
+
+    Args:
+        path Optional(str): CSV file path; defaults to `Weapons.csv`
+        errors Optional(list): see `iter_rows()`
+
+    Yields:
+        (tuple) of the key and prototype dict of each valid weapon.
+    """
+    if path is None:
+        path = os.path.join(GAME_DIR, SOURCES['weapons'][0])
+    return iter_rows(path, compile_weapon, errors)
+
+
+def upsert(catalog, rows):
+    """Adds or replaces rows in a catalog.
+
+    Args:
+        catalog (dict): catalog to update, keyed by row key
+        rows (iterable): `(key, data)` tuples, such as from `iter_rows()`
+
+    Returns:
+        (dict): number of rows 'added', 'updated' and left 'unchanged'
+    """
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+    for key, data in rows:
+        existing = catalog.get(key)
+        if existing is None:
+            counts['added'] += 1
+        elif existing == data:
+            counts['unchanged'] += 1
+            continue
+        else:
+            counts['updated'] += 1
+        catalog[key] = data
+    return counts
+
+
+def load_prototypes(catalog, paths=None):
+    """Loads weapon prototypes into a prototype catalog.
+
+    The weapons of `Weapons.csv` are taken from `GAME_DATA`; those of
+    each extra catalog file are streamed in with `iter_prototypes()`, so
+    memory use does not grow with the size of the files. Invalid rows of
+    extra catalogs are logged.
+
+    Args:
+        catalog (dict): catalog to update, keyed by prototype key
+        paths Optional(list[str]): extra weapon CSV files, relative to
+            the game directory; defaults to `settings.WEAPON_CATALOGS`
+
+    Returns:
+        (dict): number of prototypes 'added', 'updated' and left
+            'unchanged'
+    """
+    if paths is None:
+        paths = getattr(settings, 'WEAPON_CATALOGS', ())
+    counts = upsert(catalog, GAME_DATA['weapons'].iteritems())
+    for path in paths:
+        for name, count in upsert(catalog, iter_prototypes(
+                os.path.join(GAME_DIR, path))).iteritems():
+            counts[name] += count
+    return counts
+
+
+def _sha1(path):
+    """Returns the hex SHA-1 hash of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+GAME_DATA = GameData()
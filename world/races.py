@@ -5,48 +5,100 @@ This module contains data and functions relating to Races and Focuses. Its
 public module functions are to be used primarily during the character
 creation process.
 
+Races are defined as data in `RACE_DATA` and built once at import into
+the `RACES` registry of shared, read-only `Race` objects.
+
 Classes:
 
-    `Race`: base class for all races
-    `Human`: human race class
+    `Race`: read-only race definition
 
 Module Functions:
 
     - `load_race(str)`:
 
-        loads an instance of the named Race class
-
-    - `load_focus(str)`:
-
-        loads an instance of the named Focus class
+        returns the named Race from `RACES`
 
     - `apply_race(char, race)`:
 
         have a character "become" a member of the specified race.
 """
 
+from collections import OrderedDict
+
 from evennia.utils import fill
+from utils.utils import RENDER_CACHE, SCREEN_WIDTH
+from world.archetypes import PRIMARY_TRAITS
 
 class RaceException(Exception):
     """Base exception class for races module."""
     def __init__(self, msg):
         self.msg = msg
 
-ALL_RACES = ('Human',)
+# equipment slots and the limbs holding them, shared by all medium and
+# small races
+DEFAULT_SLOTS = ('wield1', 'wield2', 'armor')
+DEFAULT_LIMBS = (
+    ('r_arm', ('wield1',)),
+    ('l_arm', ('wield2',)),
+    ('body', ('armor',)),
+)
+
+# race data, in the order races are listed during chargen
+RACE_DATA = OrderedDict([
+    ('human', {
+        'name': "Human",
+        'plural': "Humans",
+        'size': "medium",
+        'desc': "|gHumans|n are the most widespread of all the races. "
+                "The human traits of curiosity, resourcefulness and "
+                "unyielding courage have helped them to adapt, survive "
+                "and prosper in every world they have explored.",
+    }),
+    ('elf', {
+        'name': "Elf",
+        'plural': "Elves",
+        'size': "medium",
+        'desc': "|gElves|n are graceful, slender demi-humans with delicate "
+                "features and pointy ears. Elves are known to use magic "
+                "spells, but prefer to spend their time feasting and "
+                "frolicking in wooded glades. They rarely visit cities of "
+                "men. Elves are fascinated by magic and never grow weary "
+                "of collecting spells or magic items. Elves love "
+                "beautifully crafted items and choose to live an agrarian "
+                "life in accord with nature. ",
+        'foci': ('agility', 'spirit', 'alertness'),
+    }),
+    ('dwarf', {
+        'name': "Dwarf",
+        'plural': "Dwarves",
+        'size': "small",
+        'desc': "|gDwarves|n are short, stocky demi-humans with long, "
+                "respectable beards and heavy stout bodies. Their skin "
+                "is earthen toned and their hair black, gray or dark "
+                "brown. Stubborn but practical; dwarves love grand "
+                "feasts and strong ale. They can be dangerous opponents, "
+                "able to fight with any weapon, melee or ranged. They "
+                "admire craftsmanship and are fond of gold and stonework. "
+                "Dwarves are dependable fighters and sturdy against "
+                "magical influences. ",
+        'foci': ('brawn', 'resilience', 'alertness'),
+        'bonuses': {'STR': 1},
+    }),
+])
+
 
 def load_race(race):
-    """Returns an instance of the named race class.
+    """Returns the named race.
 
     Args:
         race (str): case-insensitive name of race to load
 
     Returns:
-        (Race): instance of the appropriate subclass of `Race`
+        (Race): the shared, read-only instance of the race
     """
-    race = race.capitalize()
-    if race in ALL_RACES:
-        return globals()[race]()
-    else:
+    try:
+        return RACES[race.lower()]
+    except KeyError:
         raise RaceException("Invalid race specified.")
 
 def apply_race(char, race):
@@ -56,8 +108,8 @@ def apply_race(char, race):
         char (Character): the character object becoming a member of race
         race (str, Race): the name of the race to apply, or the
     """
-    # if objects are passed in, reload Race and Focus objects
-    # by name to ensure we have un-modified versions of them
+    # if objects are passed in, reload the Race by name to ensure
+    # we have the registered version of it
     if isinstance(race, Race):
         race = race.name
 
@@ -65,140 +117,124 @@ def apply_race(char, race):
 
     # set race and related attributes on the character
     char.db.race = race.name
-    char.db.slots = race.slots
+    char.db.slots = dict.fromkeys(race.slots)
     char.db.limbs = race.limbs
 
     # apply race-based bonuses
-    for trait, bonus in race.bonuses.iteritems():
-        char.traits[trait].mod += bonus
+    with char.traits.batch():
+        for trait, bonus in race.bonuses:
+            char.traits[trait].mod += bonus
 
 
 def _format_bonuses(bonuses):
-    """Formats a dict of bonuses to base traits as a string."""
-    traits = bonuses.items()
-    if len(bonuses) > 2:
-        output = ", ".join(
-                    "{{w{:+1}{{n to {{C{}{{n".format(t[1], t[0])
-                    for t in traits[:-1])
-        output += ", and {{w{:+1}{{n to {{C{}{{n".format(traits[-1][1], traits[-1][0])
-    else:
-        output = " and ".join(
-                    "{{w{:+1}{{n to {{C{}{{n".format(traits[1], traits[2])
-                    for t in traits)
-    return output
+    """Formats `(trait, bonus)` pairs as a string."""
+    traits = ["|w{:+1}|n to |C{}|n".format(bonus, trait)
+              for trait, bonus in bonuses]
+    if len(traits) > 2:
+        return ", ".join(traits[:-1]) + ", and " + traits[-1]
+    return " and ".join(traits)
 
 
 class Race(object):
-    """Base class for race attributes"""
-    def __init__(self):
-        self.name = ""
-        self.plural = "" # Not set on character.
-        self.size = ""
-        self._desc = ""
-        self.slots = {
-            'wield1': None,
-            'wield2': None,
-            'armor': None,
-        }
-        self.limbs = (
-            ('r_arm', ('wield1',)),
-            ('l_arm', ('wield2',)),
-            ('body', ('armor',)),
-        )
-        self.foci = []
-        self.bonuses = {}
+    """Read-only race definition.
+
+    Races are built once from `RACE_DATA` into `RACES` and shared by all
+    callers of `load_race`.
+
+    Args:
+        name (str): race name
+        plural (str): plural race name
+        size (str): body type
+        desc (str): narrative description
+        foci (tuple[str]): focuses available to the race
+        bonuses (dict): maps primary traits to bonuses
+        slots (tuple[str]): equipment slots
+        limbs (tuple[tuple[str, tuple]]): limbs and the slots they hold;
+            see `world.equip`
+
+    Attributes:
+        slot_order (tuple[str]): slots in the order their limbs are
+            listed, for `EquipHandler`
+    """
+    __slots__ = ('name', 'plural', 'size', '_desc', 'foci', 'bonuses',
+                 'slots', 'limbs', 'slot_order')
+
+    def __init__(self, name, plural, size, desc, foci=(), bonuses=None,
+                 slots=DEFAULT_SLOTS, limbs=DEFAULT_LIMBS):
+        bonuses = tuple(sorted((bonuses or {}).iteritems()))
+        for trait, bonus in bonuses:
+            if trait not in PRIMARY_TRAITS:
+                raise RaceException(
+                    "Invalid bonus trait {} for {}.".format(trait, name))
+        slot_order = sum((tuple(s) for l, s in limbs), ())
+        if set(slot_order) != set(slots):
+            raise RaceException(
+                "Invalid limb configuration for {}.".format(name))
+        setattr_ = super(Race, self).__setattr__
+        setattr_('name', name)
+        setattr_('plural', plural)
+        setattr_('size', size)
+        setattr_('_desc', desc)
+        setattr_('foci', tuple(foci))
+        setattr_('bonuses', bonuses)
+        setattr_('slots', tuple(slots))
+        setattr_('limbs', tuple((l, tuple(s)) for l, s in limbs))
+        setattr_('slot_order', slot_order)
+
+    def __setattr__(self, key, value):
+        raise RaceException("Races are read-only.")
 
     @property
     def desc(self):
-        """Returns a formatted description of the Race.
+        """Returns a formatted description of the Race."""
+        return self.get_desc()
 
-        Note:
-            The setter for this property only modifies the content
-            of the first paragraph of what is returned.
+    def get_desc(self, width=SCREEN_WIDTH):
+        """Returns the formatted description for a screen width.
+
+        The description is rendered once per width and cached in
+        `RENDER_CACHE` until any of the race's display data changes.
         """
+        source = (self.name, self.plural, self.size, self._desc,
+                  self.foci, self.bonuses)
+        return RENDER_CACHE.render(('race', self.name), width, source,
+                                   self._render_desc)
+
+    def _render_desc(self, width):
+        """Renders the formatted description of the Race."""
         desc = "|g{}|n\n".format(self.name)
-        desc += fill(self._desc)
+        desc += fill(self._desc, width)
         desc += '\n\n'
         desc += fill("{} have a ".format(self.plural) +
-                     "|y{}|n body type.".format(self.size))
+                     "|y{}|n body type.".format(self.size), width)
         if self.foci:
             desc += fill(
-                "They are known for their {}.".format(
+                " They are known for their {}.".format(
                     self._format_focus_list(self.foci)
-                )
+                ), width
             )
         if len(self.bonuses) > 0:
             desc += '\n\n'
             desc += fill("{} gain {} of {}".format(
                         self.plural,
                         'bonuses' if len(self.bonuses) > 1 else 'a bonus',
-                        _format_bonuses(self.bonuses))
-                    )
+                        _format_bonuses(self.bonuses)),
+                    width)
         desc += '\n\n'
         return desc
 
-    @desc.setter
-    def desc(self, value):
-        self._desc = value
-
     def _format_focus_list(self, items):
         """Returns a comma separated list of items with "or" before the last."""
+        items = ["|b{}|n".format(i) for i in items]
         if len(items) > 2:
-            output = ", ".join(["|b{}|n".format(i.name) for i in items[:-1]])
-            output += ", and {{b{}{{n".format(items[-1].name)
+            output = ", ".join(items[:-1])
+            output += ", and {}".format(items[-1])
         else:
-            output = " and ".join(["|b{}|n".format(i.name) for i in items])
+            output = " and ".join(items)
         return output
 
-class Human(Race):
-    """Class representing human attributes."""
-    def __init__(self):
-        super(Human, self).__init__()
-        self.name = "Human"
-        self.plural = "Humans"
-        self.size = "medium"
-        self.desc = ("|gHumans|n are the most widespread of all the races. "
-                     "The human traits of curiosity, resourcefulness and "
-                     "unyielding courage have helped them to adapt, survive "
-                     "and prosper in every world they have explored.")
-        self.foci = []
-        self.bonuses = {}  #
-
-
-class Elf(Race):
-    """Class representing elf attributes."""
-    def __init__(self):
-        super(Elf, self).__init__()
-        self.name = "Elf"
-        self.plural = "Elves"
-        self.size = "medium"
-        self.desc = ("|gElves|n are graceful, slender demi-humans with delicate "
-                     "features and pointy ears. Elves are known to use magic "
-                     "spells, but prefer to spend their time feasting and "
-                     "frolicking in wooded glades. They rarely visit cities of "
-                     "men. Elves are fascinated by magic and never grow weary "
-                     "of collecting spells or magic items. Elves love "
-                     "beautifully crafted items and choose to live an agrarian "
-                     "life in accord with nature. ")
-        self.foci = ['agility', 'spirit', 'alertness']
-        self.bonuses = {}
-
-
-class Dwarf(Race):
-    """Class representing dwarf attributes."""
-    def __init__(self):
-        super(Dwarf, self).__init__()
-        self.name = "Dwarf"
-        self.plural = "Dwarves"
-        self.size = "small"
-        self.desc = ("|gDwarves|n are short, stocky demi-humans with long, "
-                     "respectable beards and heavy stout bodies. Their skin "
-                     "is earthen toned and their hair black, gray or dark "
-                     "brown. Stubborn but practical; dwarves love grand "
-                     "feasts and strong ale. They can be dangerous opponents, "
-                     "able to fight with any weapon, melee or ranged. They "
-                     "admire craftsmanship and are fond of gold and stonework. "
-                     "Dwarves are dependable fighters and sturdy against "
-                     "magical influences. ")
-        self.foci = ['brawn', 'resilience', 'alertness']
-        self.bonuses = {'WILL': 1}
+
+# all races by lowercase name
+RACES = OrderedDict((key, Race(**data)) for key, data in RACE_DATA.iteritems())
+
+ALL_RACES = tuple(race.name for race in RACES.itervalues())
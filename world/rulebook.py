@@ -8,12 +8,85 @@ enforcing various game rules. See individual docstrings for more info.
 Roll / Check Functions
 
     - `d6roll(value)`
+    - `wild_roll(value, fast=False)`
     - `skill_check(ch, skill, target=5)`
     - `skill_result(ch, skill)`
+    - `skill_totals(ch)`
+
+Wild Die
+
+    `wild_roll` rolls one of the dice of a D6 value as the wild die: a 6
+    on the wild die is added and rolled again for as long as it keeps
+    coming up 6, and a 1 on its first roll is a complication. It returns
+    the total and whether a complication occurred; the 1 still counts
+    towards the total, and it is up to the caller what the complication
+    means. With `fast=True` the result is instead drawn from the exact,
+    precomputed `WildDistribution` of the value, which is cheaper for
+    checks nobody watches, such as NPC against NPC.
+
+Dice Expressions
+
+    - `compile_dice(expr)`
+
+    Parses a dice expression such as '4D+2', '2D+1 x2' or 'wild 3D'
+    into a cached `DiceExpression`, which rolls it when called and
+    exposes its exact distribution. Plain integers are D6 values, as
+    taken by `d6roll`.
+
+    ```python
+    >>> damage = compile_dice('2D+1 x2')
+    >>> damage()
+    18
+    >>> damage.odds(20)
+    0.2777777777777778
+    ```
+
+Group Roll Functions
+
+    These roll for a whole group at once, such as a squad or every mob
+    in a room, drawing all dice in a single NumPy operation. Results
+    have the same distribution as rolling each one individually.
+
+    - `d6roll_many(values)`
+    - `skill_check_many(chars, skill, targets=5)`
+    - `opposed_matrix(actors, actor_skill, observers, observer_skill)`
+
+Probability Functions
+
+    Exact probabilities of `d6roll` results, computed once per D6 value
+    and cached.
+
+    - `odds(value, target)`
+    - `d6distribution(value)`
+    - `wild_distribution(value)`
+
+Roll Streams
+
+    All roll functions take an optional `stream` argument. By default
+    `d6roll` and the skill functions draw die faces from the shared
+    `FACE_POOL` of pre-generated faces, and the other functions use
+    NumPy's global random number generator. Given a seeded `RollStream`,
+    e.g. one per combat or encounter, their results can be reproduced
+    exactly by replaying the stream from its seed or a saved state.
+
+    ```python
+    >>> stream = RollStream(seed=1234)
+    >>> state = stream.getstate()
+    >>> first = [d6roll(13, stream=stream) for _ in range(3)]
+    >>> RollStream.from_state(state).dice(4) + 1 == first[0]
+    True
+    ```
 
 """
 
-from evennia.contrib import dice
+import random
+import re
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.utils import d6str
 
 class DiceRollError(Exception):
     """Default error class in die rolls/skill checks.
@@ -24,52 +97,612 @@ class DiceRollError(Exception):
     def __init__(self, msg):
         self.msg = msg
 
-def d6roll(value):
+class RollStream(object):
+    """A seeded, serializable stream of random numbers for die rolls.
+
+    Backed by a NumPy Mersenne Twister generator, so die faces can be
+    drawn in bulk. Faces may also be generated ahead of time with
+    `pregenerate()`; they are used before any new ones are drawn.
+
+    Args:
+        seed (int, optional): seed for the stream; a random seed is
+            chosen if omitted.
+
+    Attributes:
+        seed (int): the seed the stream was created with.
+    """
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randint(0, 2 ** 32 - 1)
+        self.seed = seed
+        self.rng = np.random.RandomState(seed)
+        self.buffer = np.zeros(0, dtype=np.uint8)
+
+    def pregenerate(self, n):
+        """Generates `n` D6 faces ahead of time."""
+        self.buffer = np.append(
+            self.buffer, self.rng.randint(1, 7, size=n).astype(np.uint8))
+
+    def faces(self, n, sides=6):
+        """Returns an array of `n` die faces.
+
+        Args:
+            n (int): number of dice to roll.
+            sides (int): number of sides of the dice.
+        """
+        if sides != 6 or not len(self.buffer):
+            return self.rng.randint(1, sides + 1, size=n)
+        taken, self.buffer = self.buffer[:n], self.buffer[n:]
+        if len(taken) < n:
+            extra = self.rng.randint(1, 7, size=n - len(taken))
+            taken = np.append(taken, extra)
+        return taken.astype(int)
+
+    def dice(self, n, sides=6, mod=0):
+        """Returns the total of `n` dice plus `mod`."""
+        return int(self.faces(n, sides).sum()) + mod
+
+    def random(self, size=None):
+        """Returns random floats in [0, 1), like `random.random()`."""
+        return self.rng.random_sample(size)
+
+    def getstate(self):
+        """Returns the state of the stream as plain, storable data."""
+        name, keys, pos, has_gauss, gauss = self.rng.get_state()
+        return {'seed': self.seed,
+                'rng': (name, keys.tolist(), pos, has_gauss, gauss),
+                'buffer': self.buffer.tolist()}
+
+    def setstate(self, state):
+        """Restores a state returned by `getstate()`."""
+        name, keys, pos, has_gauss, gauss = state['rng']
+        self.seed = state['seed']
+        self.rng.set_state((name, np.array(keys, dtype=np.uint32),
+                            pos, has_gauss, gauss))
+        self.buffer = np.array(state['buffer'], dtype=np.uint8)
+
+    @classmethod
+    def from_state(cls, state):
+        """Returns a new stream restored from `getstate()` data."""
+        stream = cls(state['seed'])
+        stream.setstate(state)
+        return stream
+
+
+class FacePool(object):
+    """A pool of pre-generated D6 faces.
+
+    Faces are generated in bulk with NumPy and kept in a compact
+    `array('B')`; rolls take faces from the pool, which is refilled with
+    a new chunk whenever it runs low.
+
+    Args:
+        size (int): number of faces generated per refill.
+
+    Attributes:
+        hits (int): number of faces taken from the pool.
+        refills (int): number of times the pool was refilled.
+    """
+    def __init__(self, size=4096):
+        self.size = size
+        self.faces = array('B')
+        self.pos = 0
+        self.hits = 0
+        self.refills = 0
+
+    def __len__(self):
+        """Returns the number of faces left in the pool."""
+        return len(self.faces) - self.pos
+
+    def refill(self):
+        """Adds a chunk of `size` new faces to the pool."""
+        chunk = np.random.randint(1, 7, size=self.size).astype(np.uint8)
+        self.faces = self.faces[self.pos:] + array('B', chunk.tobytes())
+        self.pos = 0
+        self.refills += 1
+
+    def roll(self, n):
+        """Returns the total of `n` D6 faces from the pool."""
+        while len(self.faces) - self.pos < n:
+            self.refill()
+        start = self.pos
+        self.pos += n
+        self.hits += n
+        return sum(self.faces[start:self.pos])
+
+    def reset_counters(self):
+        """Resets the `hits` and `refills` counters."""
+        self.hits = self.refills = 0
+
+
+FACE_POOL = FacePool()
+
+
+class D6Distribution(object):
+    """Exact probability distribution of the `d6roll` of a D6 value.
+
+    The distribution of #D6+# is computed once by convolving the faces
+    of a single die with themselves.
+
+    Args:
+        value (int): D6 value the distribution is for.
+        multiplier (int): factor the roll result is multiplied by.
+
+    Attributes:
+        value (int): the D6 value.
+        multiplier (int): factor the roll result is multiplied by.
+        min (int): the lowest possible roll result.
+        max (int): the highest possible roll result.
+        pmf (ndarray): probability of each result, indexed by result.
+        cdf (ndarray): probability of rolling each result or less.
+        sf (ndarray): probability of rolling each result or more.
+    """
+    def __init__(self, value, multiplier=1):
+        self.value = value
+        self.multiplier = multiplier
+        d, p = divmod(value, 3) if value >= 3 else (0, 0)
+        # number of ways to roll each total on `d` dice, as exact ints
+        counts = [1]
+        for _ in xrange(d):
+            rolled = [0] * (len(counts) + 6)
+            for total, ways in enumerate(counts):
+                for face in xrange(1, 7):
+                    rolled[total + face] += ways
+            counts = rolled
+        pmf = np.zeros(6 * d + p + 1)
+        pmf[p:] = np.array(counts, dtype=float) / 6 ** d
+        self._tables(pmf)
+
+    def _tables(self, pmf):
+        """Sets the distribution tables from the unmultiplied `pmf`."""
+        self.pmf = _multiply(pmf, self.multiplier)
+        self.min = int(np.flatnonzero(self.pmf)[0])
+        self.max = len(self.pmf) - 1
+        self.cdf = np.cumsum(self.pmf)
+        self.cdf[-1] = 1.0
+        self.sf = np.cumsum(self.pmf[::-1])[::-1]
+
+    def odds(self, target):
+        """Returns the probability that a roll meets or beats `target`."""
+        if target <= self.min:
+            return 1.0
+        if target > self.max:
+            return 0.0
+        return float(self.sf[target])
+
+    def ppf(self, q):
+        """Inverse CDF; maps probabilities in [0, 1) to roll results.
+
+        Args:
+            q (float or ndarray): probabilities, e.g. uniform random
+                numbers.
+
+        Returns:
+            (int or ndarray): smallest results whose CDF exceeds `q`.
+        """
+        return np.searchsorted(self.cdf, q, side='right')
+
+    def sample(self, size=None, stream=None):
+        """Draws roll results from the distribution.
+
+        Args:
+            size (int, optional): number of results to draw; a single
+                int result is returned if omitted.
+            stream (RollStream, optional): stream to draw from.
+        """
+        if stream is not None:
+            return self.ppf(stream.random(size))
+        return self.ppf(np.random.random_sample(size))
+
+
+class WildDistribution(D6Distribution):
+    """Exact probability distribution of the `wild_roll` of a D6 value.
+
+    Wild die explosions are only followed up to `EXPLOSIONS` sixes in a
+    row; longer runs have a probability below 6 ** -20.
+
+    Args:
+        value (int): D6 value the distribution is for.
+        multiplier (int): factor the roll result is multiplied by.
+
+    Attributes:
+        (all attributes of `D6Distribution`, plus:)
+        complication (float): probability of a complication.
+        pmf_complication (ndarray): probability of each result together
+            with a complication; `pmf - pmf_complication` is the
+            probability of the result without one.
+    """
+    EXPLOSIONS = 20
+
+    def __init__(self, value, multiplier=1):
+        self.value = value
+        self.multiplier = multiplier
+        if value < 3:
+            self.complication = 0.0
+            self.pmf_complication = np.zeros(1)
+            self._tables(np.ones(1))
+            self._joint = self.cdf
+            return
+        d, p = divmod(value, 3)
+        normal = np.append(np.zeros(p), d6distribution((d - 1) * 3).pmf)
+        # wild die results without a complication
+        wild = np.zeros(6 * self.EXPLOSIONS + 6)
+        wild[2:6] = 1.0 / 6
+        for n in xrange(1, self.EXPLOSIONS + 1):
+            wild[6 * n + 1:6 * n + 6] = 6.0 ** -(n + 1)
+        clean = np.convolve(normal, wild)
+        # a 1 on the wild die's first roll is a complication
+        complicated = np.zeros(len(clean))
+        complicated[1:len(normal) + 1] = normal / 6
+        self._tables(clean + complicated)
+        self.pmf_complication = _multiply(complicated, multiplier)
+        self.complication = float(self.pmf_complication.sum())
+        # cdf over all (complication, result) outcomes, complications first
+        self._joint = np.cumsum(np.append(
+            self.pmf_complication, self.pmf - self.pmf_complication))
+        self._joint[-1] = 1.0
+
+    def sample_wild(self, size=None, stream=None):
+        """Draws roll results and complication flags.
+
+        Args:
+            size (int, optional): number of results to draw; single
+                values are returned if omitted.
+            stream (RollStream, optional): stream to draw from.
+
+        Returns:
+            (tuple) of the results and complication flags.
+        """
+        q = (stream.random(size) if stream is not None
+             else np.random.random_sample(size))
+        outcome = np.searchsorted(self._joint, q, side='right')
+        complication = outcome < len(self.pmf)
+        return outcome % len(self.pmf), complication
+
+
+def _multiply(pmf, multiplier):
+    """Spreads a pmf indexed by result over multiplied results."""
+    if multiplier == 1:
+        return pmf
+    spread = np.zeros((len(pmf) - 1) * multiplier + 1)
+    spread[::multiplier] = pmf
+    return spread
+
+
+_DISTRIBUTIONS = {}
+
+def d6distribution(value, multiplier=1):
+    """
+    Returns the cached `D6Distribution` for a D6 value.
+
+    Args:
+        value (int): D6 value.
+        multiplier (int): factor the roll result is multiplied by.
+    """
+    try:
+        return _DISTRIBUTIONS[value, multiplier]
+    except KeyError:
+        dist = _DISTRIBUTIONS[value, multiplier] = \
+            D6Distribution(value, multiplier)
+        return dist
+
+def wild_distribution(value, multiplier=1):
+    """
+    Returns the cached `WildDistribution` for a D6 value.
+
+    Args:
+        value (int): D6 value.
+        multiplier (int): factor the roll result is multiplied by.
+    """
+    try:
+        return _DISTRIBUTIONS['wild', value, multiplier]
+    except KeyError:
+        dist = _DISTRIBUTIONS['wild', value, multiplier] = \
+            WildDistribution(value, multiplier)
+        return dist
+
+def odds(value, target):
+    """
+    Returns the exact probability that `d6roll(value)` meets `target`.
+
+    Args:
+        value (int): D6 value to roll.
+        target (int): the target number for the roll to succeed.
+
+    Returns:
+        (float) between 0 and 1.
+    """
+    return d6distribution(value).odds(target)
+
+_DICE_EXPR = re.compile(
+    r'^\s*(?P<wild>wild\s+)?'
+    r'(?:(?P<dice>\d+)\s*d\s*(?:\+\s*(?P<pips>\d+))?|(?P<value>\d+))'
+    r'\s*(?:x\s*(?P<mult>\d+))?\s*$', re.IGNORECASE)
+
+
+class DiceExpression(object):
+    """A parsed dice expression. See `compile_dice`.
+
+    Calling the expression rolls it and returns the result.
+
+    Attributes:
+        dice (int): number of D6 rolled.
+        pips (int): number added to the dice, from 0 to 2.
+        multiplier (int): factor the result is multiplied by.
+        wild (bool): whether one of the dice is a wild die.
+        value (int): D6 value of the dice and pips, e.g. 14 for 4D+2.
+    """
+    __slots__ = ('dice', 'pips', 'multiplier', 'wild', 'value')
+
+    def __init__(self, value, multiplier=1, wild=False):
+        self.value = value
+        # as with `d6roll`, values below 3 always roll 0
+        self.dice, self.pips = divmod(value, 3) if value >= 3 else (0, 0)
+        self.multiplier = multiplier
+        self.wild = wild
+
+    def __call__(self, stream=None):
+        """Rolls the expression.
+
+        Args:
+            stream (RollStream, optional): stream to roll with.
+        """
+        if self.wild:
+            return self.roll_wild(stream)[0]
+        if stream is not None:
+            total = stream.dice(self.dice, 6, self.pips)
+        else:
+            total = FACE_POOL.roll(self.dice) + self.pips
+        return total * self.multiplier
+
+    def roll_wild(self, stream=None, fast=False):
+        """Rolls the expression with a wild die. See `wild_roll`.
+
+        Returns:
+            (tuple) of the result and whether there was a complication.
+        """
+        total, complication = wild_roll(self.value, stream, fast)
+        return total * self.multiplier, complication
+
+    def __str__(self):
+        expr = d6str(self.value) or str(self.value)
+        if self.wild:
+            expr = 'wild ' + expr
+        if self.multiplier != 1:
+            expr += ' x{}'.format(self.multiplier)
+        return expr
+
+    def __repr__(self):
+        return "compile_dice({!r})".format(str(self))
+
+    @property
+    def distribution(self):
+        """The exact `D6Distribution` of the expression's results."""
+        if self.wild:
+            return wild_distribution(self.value, self.multiplier)
+        return d6distribution(self.value, self.multiplier)
+
+    def odds(self, target):
+        """Returns the probability that a roll meets or beats `target`."""
+        return self.distribution.odds(target)
+
+
+# limits of dice expressions, so that no input can make a roll costly
+MAX_DICE = 100
+MAX_MULTIPLIER = 100
+
+# compiled expressions by their raw expression and by (value, multiplier,
+# wild), least recently used first; holds at most COMPILED_CACHE_SIZE entries
+COMPILED_CACHE_SIZE = 256
+_COMPILED = OrderedDict()
+
+def _parse_dice(expr):
+    """
+    Parses a dice expression into its (value, multiplier, wild) form.
+
+    Args:
+        expr (str or int): the dice expression or D6 value.
+
+    Returns:
+        (tuple) the D6 value, multiplier and whether a wild die is rolled.
+
+    Raises:
+        DiceRollError: if the expression is invalid or exceeds the limits.
+    """
+    if isinstance(expr, (int, long)) and not isinstance(expr, bool):
+        if expr < 0:
+            raise DiceRollError("Invalid dice expression: {}".format(expr))
+        key = (expr, 1, False)
+    elif isinstance(expr, basestring):
+        match = _DICE_EXPR.match(expr)
+        if not match:
+            raise DiceRollError("Invalid dice expression: {}".format(expr))
+        dice, pips, value, mult = match.group('dice', 'pips', 'value', 'mult')
+        if value is None:
+            if int(pips or 0) > 2:
+                raise DiceRollError(
+                    "Pips must be 0 to 2 in dice expression: {}".format(expr))
+            value = int(dice) * 3 + int(pips or 0)
+        mult = 1 if mult is None else int(mult)
+        if mult < 1:
+            raise DiceRollError(
+                "Invalid multiplier in dice expression: {}".format(expr))
+        key = (int(value), mult, bool(match.group('wild')))
+    else:
+        raise DiceRollError("Invalid dice expression: {!r}".format(expr))
+
+    value, mult, wild = key
+    if value // 3 > MAX_DICE:
+        raise DiceRollError(
+            "Dice expressions can roll at most {}D.".format(MAX_DICE))
+    if mult > MAX_MULTIPLIER:
+        raise DiceRollError(
+            "Dice expressions can multiply by at most x{}.".format(
+                MAX_MULTIPLIER))
+    return key
+
+def _cache_compiled(key, compiled):
+    """Stores `compiled` under `key` as the most recently used entry."""
+    if key not in _COMPILED and len(_COMPILED) >= COMPILED_CACHE_SIZE:
+        _COMPILED.popitem(last=False)
+    _COMPILED[key] = (type(key), compiled)
+
+def compile_dice(expr):
+    """
+    Parses a dice expression into a cached `DiceExpression`.
+
+    Expressions are a number of dice with optional pips, such as '3D' or
+    '4D+2', or a plain D6 value such as 14. They may be followed by a
+    multiplier, as in '2D+1 x2', and preceded by 'wild' to mark that one
+    of the dice is a wild die. Expressions are cached as given, so repeat
+    lookups skip parsing; equivalent expressions such as '14' and '4D+2'
+    share one `DiceExpression`, and the least recently used are dropped
+    once the cache holds `COMPILED_CACHE_SIZE` entries.
+
+    Args:
+        expr (str or int): the dice expression or D6 value.
+
+    Returns:
+        (DiceExpression) the compiled expression.
+
+    Raises:
+        DiceRollError: if the expression is invalid, or rolls more than
+            `MAX_DICE` dice or multiplies by more than `MAX_MULTIPLIER`.
+    """
+    try:
+        cls, compiled = _COMPILED.pop(expr)
+    except (KeyError, TypeError):
+        cls = None
+    # equal keys of another type, such as 1 and True, must not share entries
+    if cls is not type(expr):
+        key = _parse_dice(expr)
+        try:
+            compiled = _COMPILED.pop(key)[1]
+        except KeyError:
+            compiled = DiceExpression(*key)
+        _cache_compiled(key, compiled)
+    _cache_compiled(expr, compiled)
+    return compiled
+
+def d6roll(value, stream=None):
     """
     Rolls the D6 rating for value and returns the results.
 
     Args:
         value (int):  D6 value to roll.
+        stream (RollStream, optional): stream to roll with.
 
     Returns:
         (int) of the result of the #D6+# roll.
     """
     if value < 3:
         return 0
-    d = value / 3
+    d = value // 3
     p = value % 3
-    if p == 0:
-        return dice.roll_dice(d, 6)
+    if stream is not None:
+        return stream.dice(d, 6, p)
+    return FACE_POOL.roll(d) + p
+
+def wild_roll(value, stream=None, fast=False):
+    """
+    Rolls the D6 rating for value with one of the dice as a wild die.
+
+    Args:
+        value (int):  D6 value to roll.
+        stream (RollStream, optional): stream to roll with.
+        fast (bool): draw the result from the precomputed distribution
+            instead of rolling each die.
+
+    Returns:
+        (tuple) of the (int) result of the roll and a (bool) indicating
+        whether the wild die caused a complication.
+    """
+    if value < 3:
+        return 0, False
+    if fast:
+        total, complication = \
+            wild_distribution(value).sample_wild(stream=stream)
+        return int(total), bool(complication)
+
+    if stream is not None:
+        roll = stream.dice
     else:
-        return dice.roll_dice(d, 6, ('+', p))
+        roll = FACE_POOL.roll
+    d, p = divmod(value, 3)
+    face = roll(1)
+    complication = face == 1
+    total = roll(d - 1) + p + face
+    while face == 6:
+        face = roll(1)
+        total += face
+    return total, complication
 
-def skill_value(ch, skill):
+def skill_totals(ch):
     """
+    Returns a table of the final D6 values of all of a character's skills.
+
+    The table is computed once and kept in `ch.ndb`; it is recomputed
+    only after a trait or skill of the character changes, as tracked by
+    the `version` of its trait handlers.
 
     Args:
-        ch (Character): Character object to read trait from.
-        skill (Trait): skill to calculate value for.
+        ch (Character): Character object to read skills and traits from.
+
+    Returns:
+        (dict) mapping each skill key to the skill's value plus the value
+        of its governing trait, or 0 if the trait is missing.
     """
+    traits, skills = ch.traits, ch.skills
+    version = (id(traits), traits.version, id(skills), skills.version)
+    cached = ch.ndb.skill_totals
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    totals = {}
+    for key in skills.all:
+        totals[key] = _skill_value(traits, skills.get(key))
+    ch.ndb.skill_totals = (version, totals)
+    return totals
+
+def _skill_value(traits, skill):
+    """Computes a skill's value plus the value of its governing trait."""
     try:
-        value = ch.traits[skill.trait].actual + skill.actual
+        value = traits[skill.trait].actual + skill.actual
         return value
     except KeyError:
         return 0
     except AttributeError:
         return 0
 
+def skill_value(ch, skill):
+    """
 
-def skill_result(ch, skill):
+    Args:
+        ch (Character): Character object to read trait from.
+        skill (Trait): skill to calculate value for.
+
+    Note:
+        Values of the character's own skills are read from its
+        `skill_totals` table.
+    """
+    handler = getattr(skill, '_handler', None)
+    if handler is not None and handler is getattr(ch, 'skills', None):
+        return skill_totals(ch).get(skill._key, 0)
+    return _skill_value(ch.traits, skill)
+
+
+def skill_result(ch, skill, stream=None):
     """
     Returns a die roll result for a specific skill.
 
     Args:
          ch (Character): Chracter object
          skill (Trait):  skill to check.
+         stream (RollStream, optional): stream to roll with.
     """
-    return d6roll(skill_value(ch, skill))
+    return d6roll(skill_value(ch, skill), stream)
 
-def skill_check(ch, skill, target=5):
+def skill_check(ch, skill, target=5, stream=None):
     """A basic Open Adventure Skill check.
 
     This is used for skill checks, trait checks, save rolls, etc.
@@ -78,8 +711,80 @@ def skill_check(ch, skill, target=5):
         ch (Character): the character object to use stats from.
         skill (Trait): the value of the skill to check
         target (int): the target number for the check to succeed
+        stream (RollStream, optional): stream to roll with.
 
     Returns:
         (bool): indicates whether the check passed or failed
     """
-    return skill_result(ch, skill) >= target
+    return skill_result(ch, skill, stream) >= target
+
+def d6roll_many(values, stream=None):
+    """
+    Rolls the D6 rating for each of a sequence of values.
+
+    Args:
+        values (sequence of int): D6 values to roll.
+        stream (RollStream, optional): stream to roll with.
+
+    Returns:
+        (ndarray) of the results of the #D6+# roll for each value; 0 for
+        values below 3, as with `d6roll`.
+    """
+    values = np.asarray(values, dtype=int)
+    if values.size == 0:
+        return np.zeros(0, dtype=int)
+    values = np.where(values < 3, 0, values)
+    d, p = values // 3, values % 3
+    shape = (values.size, d.max())
+    if stream is not None:
+        faces = stream.faces(shape[0] * shape[1]).reshape(shape)
+    else:
+        faces = np.random.randint(1, 7, size=shape)
+    # keep only the first `d` dice of each row
+    faces *= np.arange(d.max()) < d[:, np.newaxis]
+    results = faces.sum(axis=1) + p
+    results[values == 0] = 0
+    return results
+
+def skill_check_many(chars, skill, targets=5, stream=None):
+    """Skill checks for a group of characters rolled at once.
+
+    Args:
+        chars (sequence of Character): the characters to check.
+        skill (str): key of the skill to check on each character.
+        targets (int or sequence of int): target number for the check
+            to succeed, either for all characters or for each one.
+        stream (RollStream, optional): stream to roll with.
+
+    Returns:
+        (ndarray) of bools indicating which characters passed.
+    """
+    values = [skill_value(ch, ch.skills.get(skill)) for ch in chars]
+    return d6roll_many(values, stream) >= np.asarray(targets)
+
+def opposed_matrix(actors, actor_skill, observers, observer_skill,
+                   stream=None):
+    """Opposed skill checks between every actor and every observer.
+
+    Each participant's skill value is looked up and rolled only once,
+    and all rolls are drawn together, so e.g. one character sneaking
+    past a crowded room costs a single batched roll.
+
+    Args:
+        actors (sequence of Character): characters acting, e.g. sneaking.
+        actor_skill (str): key of the skill the actors check.
+        observers (sequence of Character): characters opposing them.
+        observer_skill (str): key of the skill the observers check.
+        stream (RollStream, optional): stream to roll with.
+
+    Returns:
+        (ndarray) of bools with one row per actor and one column per
+        observer, True where the actor beat the observer. Ties go to the
+        observer.
+    """
+    values = [skill_value(ch, ch.skills.get(actor_skill)) for ch in actors]
+    values += [skill_value(ch, ch.skills.get(observer_skill))
+               for ch in observers]
+    rolls = d6roll_many(values, stream)
+    split = len(actors)
+    return rolls[:split, np.newaxis] > rolls[np.newaxis, split:]
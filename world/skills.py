@@ -18,6 +18,9 @@ creation process.
 Classes:
 
     `Skill`: convenience object for skill display data
+    `SkillRegistry`: indexed lookups of skill data by key, governing
+        trait, display name and key prefix; `SKILLS` is the registry of
+        all skills
 
 Module Functions:
 
@@ -44,326 +47,122 @@ Module Functions:
         'plus' and 'minus' extra keys used during chargen.
 """
 from math import ceil
+from world.gamedata import GAME_DATA
+from world.traits import build_schema
 
 class SkillException(Exception):
     def __init__(self, msg):
         self.msg = msg
 
 
-# Produces from /scripts file prasing of my csv
-# global skill data is minimal, and can just be stored in a dict for now
-_SKILL_DATA = {
-    "dodge": {
-        'name': "Dodge",
-        "trait": "AGL",
-        "desc": "Adds to the difficulty to hit you in personal combat.",
-        "initial": 0
-    },
-
-    "energy_pistol": {
-        'name': "Energy Pistol",
-        "trait": "AGL",
-        "desc": "Use of laser or plasma pistols.",
-        "initial": 0
-    },
-
-    "energy_rifle": {
-        'name': "Energy Rifle",
-        "trait": "AGL",
-        "desc": "Use of laser or plasma rifles and assualt rifles.",
-        "initial": 0
-    },
-
-    "pistol": {
-        'name': "Pistol",
-        "trait": "AGL",
-        "desc": "Use of conventional pistols.",
-        "initial": 0
-    },
-
-    "rifle": {
-        'name': "Rifle",
-        "trait": "AGL",
-        "desc": "Use of conventional rifles and assault rifles.",
-        "initial": 0
-    },
-
-    "shotgun": {
-        'name': "Shotgun",
-        "trait": "AGL",
-        "desc": "Use of shotguns.",
-        "initial": 0
-    },
-
-    "throwing": {
-        'name': "Throwing",
-        "trait": "AGL",
-        "desc": "Accuracy when using grenades and other thrown weapons.",
-        "initial": 0
-    },
-
-    "astrography": {
-        'name': "Astrography",
-        "trait": "KNW",
-        "desc": "Effectiveness at plotting jumps.",
-        "initial": None
-    },
-
-    "bureaucracy": {
-        'name': "Bureaucracy",
-        "trait": "KNW",
-        "desc": "Effects docking fees and fines.",
-        "initial": 0
-    },
-
-    "business": {
-        'name': "Business",
-        "trait": "KNW",
-        "desc": "Effects prices when trading goods.",
-        "initial": None
-    },
-
-    "cultures": {
-        'name': "Cultures",
-        "trait": "KNW",
-        "desc": "Examining cultural artifacts for value.",
-        "initial": None
-    },
-
-    "intimidation": {
-        'name': "Intimidation",
-        "trait": "KNW",
-        "desc": "Reduce opponents effectiveness in combat or sometimes make them flee.",
-        "initial": 0
-    },
-
-    "languages": {
-        'name': "Languages",
-        "trait": "KNW",
-        "desc": "Decyphering ancient texts and artifacts.",
-        "initial": None
-    },
-
-    "scholar": {
-        'name': "Scholar",
-        "trait": "KNW",
-        "desc": "Analyzing sciendific samples for credits.",
-        "initial": None
-    },
-
-    "streetwise": {
-        'name': "Streetwise",
-        "trait": "KNW",
-        "desc": "Uncover rumors and find the black market.",
-        "initial": 0
-    },
-
-    "survival": {
-        'name': "Survival",
-        "trait": "KNW",
-        "desc": "Reduce or avoid damage in harsh conditions on marginal worlds.",
-        "initial": 0
-    },
-
-    "gunnery": {
-        'name': "Gunnery",
-        "trait": "MCH",
-        "desc": "Use of ship mounted direct fire weapons.",
-        "initial": 0
-    },
-
-    "missile_launchers": {
-        'name': "Missile Launchers",
-        "trait": "MCH",
-        "desc": "Use of ship mounted missile launchers.",
-        "initial": None
-    },
-
-    "navigation": {
-        'name': "Navigation",
-        "trait": "MCH",
-        "desc": "Effects fuel use and accuracy in plotting courses.",
-        "initial": None
-    },
-
-    "powered_armor": {
-        'name': "Powered Armor",
-        "trait": "MCH",
-        "desc": "Use of powered armor and exoskeletons.",
-        "initial": None
-    },
-
-    "sensors": {
-        'name': "Sensors",
-        "trait": "MCH",
-        "desc": "Accuracy and effectiveness of ships sensors and cloaks.",
-        "initial": None
-    },
-
-    "shields": {
-        'name': "Shields",
-        "trait": "MCH",
-        "desc": "Use of ships shields to resist damage.",
-        "initial": None
-    },
-
-    "starship_pilot": {
-        'name': "Starship Pilot",
-        "trait": "MCH",
-        "desc": "Flying starships to avoid damage and out menuver other starships.",
-        "initial": None
-    },
-
-    "bargain": {
-        'name': "Bargain",
-        "trait": "PER",
-        "desc": "Effects prices when buying and selling in stores.",
-        "initial": 0
-    },
-
-    "persuasion": {
-        'name': "Persuasion",
-        "trait": "PER",
-        "desc": "Chance of getting others to perform actions.",
-        "initial": 0
-    },
-
-    "search": {
-        'name': "Search",
-        "trait": "PER",
-        "desc": "Success at noticing details or finding hidden items.",
-        "initial": 0
-    },
-
-    "stealth": {
-        'name': "Stealth",
-        "trait": "PER",
-        "desc": "Chance to avoid detection or notice.",
-        "initial": 0
-    },
-
-    "armor": {
-        'name': "Armor",
-        "trait": "STR",
-        "desc": "Use of conventional armors.",
-        "initial": 0
-    },
-
-    "blunt_weapons": {
-        'name': "Blunt Weapons",
-        "trait": "STR",
-        "desc": "Use of blunt weapons of all kinds.",
-        "initial": 0
-    },
-
-    "hand_to_hand": {
-        'name': "Hand To Hand",
-        "trait": "STR",
-        "desc": "Use of unarmed combat.",
-        "initial": 0
-    },
-
-    "heavy_weapons": {
-        'name': "Heavy Weapons",
-        "trait": "STR",
-        "desc": "Use of personal missile launchers and crewed weapons.",
-        "initial": None
-    },
-
-    "knives": {
-        'name': "Knives",
-        "trait": "STR",
-        "desc": "Use of knives and short blades.",
-        "initial": 0
-    },
-
-    "swords": {
-        'name': "Swords",
-        "trait": "STR",
-        "desc": "Use of swords and energized swords.",
-        "initial": 0
-    },
-
-    "armorer": {
-        'name': "Armorer",
-        "trait": "TCH",
-        "desc": "Repairing or salvaging conventional armor.",
-        "initial": None
-    },
-
-    "computers": {
-        'name': "Computers",
-        "trait": "TCH",
-        "desc": "Operating and hacking computers.",
-        "initial": 0
-    },
-
-    "demolitions": {
-        'name': "Demolitions",
-        "trait": "TCH",
-        "desc": "Usng or disarming explosives.",
-        "initial": None
-    },
-
-    "gunnary_tech": {
-        'name': "Gunnary Tech",
-        "trait": "TCH",
-        "desc": "Repairing or salvaging ship mounted weapons.",
-        "initial": None
-    },
-
-    "gunsmith": {
-        'name': "Gunsmith",
-        "trait": "TCH",
-        "desc": "Repairing or salvaging firearms.",
-        "initial": None
-    },
-
-    "medicine": {
-        'name': "Medicine",
-        "trait": "TCH",
-        "desc": "Healing others and yourself.",
-        "initial": 0
-    },
-
-    "power_armor_tech": {
-        'name': "Power Armor Tech",
-        "trait": "TCH",
-        "desc": "Repairing or salvaging power armor.",
-        "initial": None
-    },
-
-    "robotics": {
-        'name': "Robotics",
-        "trait": "TCH",
-        "desc": "Repairing or salvaing robotics and cybernetics. ",
-        "initial": None
-    },
-
-    "security": {
-        'name': "Security",
-        "trait": "TCH",
-        "desc": "Breaching electronic security systems and locks.",
-        "initial": 0
-    },
-
-    "starship_engineering": {
-        'name': "Starship Engineering",
-        "trait": "TCH",
-        "desc": "Repairing or salvaging starships.",
-        "initial": None
-    },
-}
+# global skill data, compiled from scripts/Skills.csv; see world.gamedata
+_SKILL_DATA = GAME_DATA['skills']
+
+class SkillRegistry(object):
+    """Indexed, read-only lookup tables for skill data.
+
+    Built once at import from `_SKILL_DATA`; see `SKILLS`.
+
+    Args:
+        data (dict): skill data dicts keyed by skill key
+
+    Attributes:
+        keys (tuple): all skill keys, sorted
+        by_trait (dict): maps each governing trait to a sorted tuple of
+            the keys of the skills it governs
+        by_name (dict): maps each lowercase display name to its skill key
+    """
+    def __init__(self, data):
+        self.data = data
+        self.keys = tuple(sorted(data))
+        self.by_trait = {}
+        self.by_name = {}
+        # prefix trie; each node is a (children, keys under node) pair
+        self.trie = ({}, [])
+        for key in self.keys:
+            self.by_trait.setdefault(data[key]['trait'], []).append(key)
+            self.by_name[data[key]['name'].lower()] = key
+            node = self.trie
+            node[1].append(key)
+            for char in key:
+                node = node[0].setdefault(char, ({}, []))
+                node[1].append(key)
+        self.by_trait = {trait: tuple(keys)
+                         for trait, keys in self.by_trait.iteritems()}
+
+    def __len__(self):
+        """Returns the number of skills."""
+        return len(self.keys)
+
+    def __contains__(self, key):
+        """Returns whether `key` is a skill key."""
+        return key in self.data
+
+    def __getitem__(self, key):
+        """Returns the data dict of skill `key`."""
+        try:
+            return self.data[key]
+        except KeyError:
+            raise SkillException("Invalid skill {}.".format(key))
+
+    def lookup(self, name):
+        """Finds a skill by key or display name.
+
+        Args:
+            name (str): case insensitive skill key or display name
+
+        Returns:
+            (str): the skill key, or None if there is no such skill
+        """
+        name = name.strip().lower()
+        if name in self.data:
+            return name
+        return self.by_name.get(name)
+
+    def trait_skills(self, trait):
+        """Returns the keys of the skills governed by `trait`."""
+        return self.by_trait.get(trait.upper(), ())
+
+    def prefix(self, text):
+        """Returns the keys of all skills starting with `text`.
+
+        Args:
+            text (str): case insensitive abbreviation of a skill key or
+                display name; spaces match underscores in keys
+
+        Returns:
+            (tuple): matching skill keys, sorted
+        """
+        node = self.trie
+        for char in text.strip().lower().replace(' ', '_'):
+            node = node[0].get(char)
+            if node is None:
+                return ()
+        return tuple(node[1])
+
+
+SKILLS = SkillRegistry(_SKILL_DATA)
 
 # skill groupings used in skills command
-ALL_SKILLS = tuple(sorted([name for name in _SKILL_DATA.keys()]))
+ALL_SKILLS = SKILLS.keys
+
+STR_SKILLS = SKILLS.trait_skills('STR')
+AGL_SKILLS = SKILLS.trait_skills('AGL')
+KNW_SKILLS = SKILLS.trait_skills('KNW')
+MCH_SKILLS = SKILLS.trait_skills('MCH')
+PER_SKILLS = SKILLS.trait_skills('PER')
+TCH_SKILLS = SKILLS.trait_skills('TCH')
+
+# static skill trait metadata, shared by all characters
+SKILL_DEFINITIONS = {
+    s: {'type': 'static',
+        'name': _SKILL_DATA[s]['name'],
+        'extra': {'trait': _SKILL_DATA[s]['trait'], 'is_d6': True}}
+    for s in ALL_SKILLS
+}
 
-STR_SKILLS = [s for s in ALL_SKILLS if _SKILL_DATA[s]["trait"] == 'STR']
-AGL_SKILLS = [s for s in ALL_SKILLS if _SKILL_DATA[s]["trait"] == 'AGL']
-KNW_SKILLS = [s for s in ALL_SKILLS if _SKILL_DATA[s]["trait"] == 'KNW']
-MCH_SKILLS = [s for s in ALL_SKILLS if _SKILL_DATA[s]["trait"] == 'MCH']
-PER_SKILLS = [s for s in ALL_SKILLS if _SKILL_DATA[s]["trait"] == 'PER']
-TCH_SKILLS = [s for s in ALL_SKILLS if _SKILL_DATA[s]["trait"] == 'TCH']
+# metadata schema for character `skills` handlers
+SKILL_SCHEMA = build_schema(SKILL_DEFINITIONS)
 
 
 def apply_skills(char, skills):
@@ -373,34 +172,29 @@ def apply_skills(char, skills):
         char (Character): the character being initialized
         skills: dict of skills {'skillname': invalue, ... }
     """
-    char.skills.clear()
+    new_skills = {}
     for skill, value in skills.iteritems():
-        if skill.lower() not in _SKILL_DATA.keys():
+        key = SKILLS.lookup(skill)
+        if key is None:
             raise SkillException("Invalid skill %s." % skill.lower())
-        char.skills.add(
-            key=skill,
-            type='static',
-            base=value,
-            mod=0,
-            name=_SKILL_DATA[skill]["name"],
-            extra={'trait': _SKILL_DATA[skill]['trait'], 'is_d6': True}
-        )
+        new_skills[key] = dict(SKILL_DEFINITIONS[key], base=value, mod=0)
+    char.skills.replace_all(new_skills)
 
 
 def load_skill(skill):
     """Retrieves an instance of a `Skill` class.
 
     Args:
-        skill (str): case insensitive skill name
+        skill (str): case insensitive skill key or display name
 
     Returns:
         (Skill): instance of the named Skill
     """
-    skill = skill.lower()
-    if skill in ALL_SKILLS:
-        return Skill(**_SKILL_DATA[skill])
-    else:
+    key = SKILLS.lookup(skill)
+    if key is None:
         raise SkillException('Invalid skill name.')
+    data = SKILLS[key]
+    return Skill(data['name'], data['desc'], data['trait'])
 
 
 def validate_skills(char):
@@ -26,6 +26,9 @@ class ArchetypeTestCase(EvenniaTest):
         for k, v in archetypes.ARCHETYPE_DATA.iteritems():
             a = archetypes.Archetype(v)
             self.assertTrue(a.ldesc)
+            # rendered descriptions are cached per width
+            self.assertIs(a.ldesc, archetypes.load_archetype(k).ldesc)
+            self.assertTrue(a.get_ldesc(40))
 
     def test_desc(self):
         for k, v in archetypes.ARCHETYPE_DATA.iteritems():
@@ -94,5 +97,24 @@ class PublicFunctionsTestCase(EvenniaTest):
         for k, v in self.at_data.iteritems():
             a = archetypes.load_archetype(k)
             self.assertIsInstance(a, archetypes.Archetype)
+            # display calls share one read-only instance
+            self.assertIs(a, archetypes.load_archetype(k.title()))
+            self.assertRaises(archetypes.ArchetypeException,
+                              setattr, a, 'name', 'Wizard')
+        self.assertRaises(archetypes.ArchetypeException,
+                          archetypes.load_archetype, 'wizard')
+
+    def test_archetype_traits_copy(self):
+        a = archetypes.load_archetype('soldier')
+        traits = a.traits
+        self.assertEqual(traits, a.traits)
+        self.assertEqual(traits['AGL']['base'], self.at_data['soldier']['AGL'])
+        # each call returns an independent copy
+        traits['AGL']['base'] = 1
+        traits['AGL']['extra']['foo'] = 'bar'
+        self.assertEqual(a.traits['AGL']['base'],
+                         self.at_data['soldier']['AGL'])
+        self.assertNotIn('foo', a.traits['AGL']['extra'])
+        self.assertNotIn('foo', archetypes.TRAIT_DEFINITIONS['AGL']['extra'])
 
 
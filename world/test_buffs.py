@@ -0,0 +1,71 @@
+"""
+Unit tests for the timed buffs module.
+"""
+from time import time
+
+from evennia.utils.test_resources import EvenniaTest
+
+from typeclasses.characters import Character
+from world import archetypes
+from world.buffs import BuffScheduler, BuffException
+
+
+class BuffSchedulerTestCase(EvenniaTest):
+    """Test case for the `BuffScheduler` class."""
+    character_typeclass = Character
+
+    def setUp(self):
+        super(BuffSchedulerTestCase, self).setUp()
+        archetypes.apply_archetype(self.char1, 'soldier')
+        archetypes.apply_archetype(self.char2, 'soldier')
+        self.scheduler = BuffScheduler()
+
+    def test_add_expire(self):
+        """buffs apply immediately and are removed once due"""
+        self.scheduler.add(self.char1, 'AGL', 'stim', 3, 60)
+        self.scheduler.add(self.char1, 'STR', 'stim', 2, 120)
+        self.scheduler.add(self.char2, 'AGL', 'stim', 3, 60)
+        self.assertEqual(self.char1.traits.AGL.actual, 15)
+        self.assertEqual(len(self.scheduler), 3)
+
+        self.assertEqual(self.scheduler.tick(time()), 0)
+        self.assertEqual(self.scheduler.tick(time() + 61), 2)
+        self.assertEqual(self.char1.traits.AGL.actual, 12)
+        self.assertEqual(self.char2.traits.AGL.actual, 12)
+        self.assertEqual(self.char1.traits.STR.actual, 14)
+        self.assertEqual(self.scheduler.tick(time() + 121), 1)
+        self.assertEqual(self.char1.traits.STR.actual, 12)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_refresh(self):
+        """re-adding a buff replaces its value and duration"""
+        self.scheduler.add(self.char1, 'AGL', 'stim', 3, 10)
+        self.scheduler.add(self.char1, 'AGL', 'stim', 6, 60)
+        self.assertEqual(self.char1.traits.AGL.actual, 18)
+        self.assertEqual(self.scheduler.tick(time() + 11), 0)
+        self.assertEqual(self.char1.traits.AGL.actual, 18)
+        self.assertEqual(self.scheduler.tick(time() + 61), 1)
+        self.assertEqual(self.char1.traits.AGL.actual, 12)
+
+    def test_remove(self):
+        """buffs can be removed before they expire"""
+        self.scheduler.add(self.char1, 'AGL', 'stim', 3, 60)
+        self.assertTrue(self.scheduler.remove(self.char1, 'AGL', 'stim'))
+        self.assertEqual(self.char1.traits.AGL.actual, 12)
+        self.assertFalse(self.scheduler.remove(self.char1, 'AGL', 'stim'))
+        self.assertEqual(self.scheduler.tick(time() + 61), 0)
+
+    def test_invalid_trait(self):
+        """buffing a missing trait raises an error"""
+        with self.assertRaises(BuffException):
+            self.scheduler.add(self.char1, 'XYZ', 'stim', 3, 60)
+
+    def test_save_load(self):
+        """active buffs survive saving and loading the heap"""
+        self.scheduler.add(self.char1, 'AGL', 'stim', 3, 60)
+        self.scheduler.save()
+        scheduler = BuffScheduler()
+        scheduler.load()
+        self.assertEqual(len(scheduler), 1)
+        self.assertEqual(scheduler.tick(time() + 61), 1)
+        self.assertEqual(self.char1.traits.AGL.actual, 12)
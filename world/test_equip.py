@@ -14,7 +14,7 @@ class EquipHandlerTestCase(EvenniaTest):
         super(EquipHandlerTestCase, self).setUp()
         self.staff = spawn(COLLASIBLE_STAFF).pop()
         self.knife = spawn(SURIVAL_KNIFE).pop()
-        races.apply_race(self.char1, races.Human())
+        races.apply_race(self.char1, 'human')
 
     def test_init(self):
         eh = self.char1.equip
@@ -0,0 +1,195 @@
+"""
+Game data test module.
+"""
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+from mock import patch
+from world.gamedata import (GAME_DATA, GameData, GameDataException,
+                            compile_skill, compile_weapon, iter_prototypes,
+                            iter_rows, load_prototypes, registry_token,
+                            upsert)
+
+SKILLS_CSV = (
+    "name,trait,desc,initial,key\n"
+    "dodge,AGL,Avoid attacks.,0,dodge\n"
+    "knives,STR,Use of knives.,,knives\n"
+    "juggling,XYZ,Not a real skill.,0,juggling\n"
+    "armor,STR,Use of armor.,one,armor\n")
+
+
+class CompileRowTestCase(TestCase):
+    """Test case for the row compilers."""
+    def test_compile_skill(self):
+        key, data = compile_skill({'name': 'energy pistol', 'trait': 'agl',
+                                   'desc': 'Pew. ', 'initial': '',
+                                   'key': 'Energy_Pistol'})
+        self.assertEqual(key, 'energy_pistol')
+        self.assertEqual(data, {'name': 'Energy Pistol', 'trait': 'AGL',
+                                'desc': 'Pew.', 'initial': None})
+        self.assertRaises(GameDataException, compile_skill,
+                          {'name': 'x', 'trait': 'AGL', 'key': ''})
+
+    def test_compile_weapon(self):
+        row = {'name': 'shotgun', 'model': 'sg', 'aliases': '',
+               'typeclass': 'typeclasses.weapons.TwoHandedRanged',
+               'desc': 'shotgun', 'weight': '1', 'value': '8',
+               'damage': '16', 'wear': '0', 'durability': '5', 'bonus': '1',
+               'use_skill': 'shotgun', 'fix_skill': 'gunsmith',
+               'key': 'shotgun'}
+        key, data = compile_weapon(row)
+        self.assertEqual(key, 'SG16B_SHOTGUN')
+        self.assertEqual(data['key'], 'SG16b Shotgun')
+        self.assertEqual(data['aliases'], ['sg16b'])
+        self.assertEqual(data['damage'], '5D+1')
+        # the row itself is not modified
+        self.assertEqual(row['name'], 'shotgun')
+
+        row['use_skill'] = 'juggling'
+        self.assertRaises(GameDataException, compile_weapon, row)
+        row['use_skill'], row['damage'] = 'shotgun', '5D'
+        self.assertEqual(compile_weapon(row)[1]['damage'], '5D')
+        row['damage'] = '5D+3'
+        self.assertRaises(GameDataException, compile_weapon, row)
+
+
+class GameDataTestCase(TestCase):
+    """Test case for compiling and caching data sources."""
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.csv = os.path.join(self.dir, 'Skills.csv')
+        with open(self.csv, 'w') as f:
+            f.write(SKILLS_CSV)
+        self.cache = os.path.join(self.dir, 'cache')
+        self.token = 'a'
+        self.data = self._game_data()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _game_data(self):
+        return GameData(sources={'skills': ('Skills.csv', compile_skill)},
+                        base_dir=self.dir, cache_dir=self.cache,
+                        token=lambda name: self.token)
+
+    def test_compile(self):
+        self.assertEqual(self.data.load(), {'skills': 2})
+        self.assertEqual(sorted(self.data['skills']), ['dodge', 'knives'])
+        self.assertEqual(self.data['skills']['dodge']['initial'], 0)
+        self.assertEqual([line for line, msg in self.data.errors('skills')],
+                         [4, 5])
+        self.assertTrue(
+            os.path.exists(os.path.join(self.cache, 'skills.pickle')))
+        self.assertRaises(GameDataException, self.data.compile, 'weapons')
+
+    @patch('world.gamedata.logger')
+    def test_load_logs_errors(self, mock_logger):
+        self.data.load()
+        self.assertEqual(mock_logger.log_err.call_count, 2)
+        self.assertIn('Skills.csv line 4',
+                      mock_logger.log_err.call_args_list[0][0][0])
+
+    def test_cached(self):
+        first = self.data.compile('skills')
+        # an unchanged source is loaded from its artifact
+        data = self._game_data()
+        self.assertEqual(data.compile('skills'), first)
+
+        # a touched but unchanged source reuses the artifact's rows
+        os.utime(self.csv, (0, 0))
+        artifact = self._game_data().compile('skills')
+        self.assertEqual(artifact['mtime'], 0)
+        self.assertEqual(artifact['rows'], first['rows'])
+
+        # a changed source is recompiled
+        with open(self.csv, 'a') as f:
+            f.write("search,PER,Find things.,0,search\n")
+        os.utime(self.csv, (0, 0))
+        data = self._game_data()
+        self.assertIn('search', data['skills'])
+
+    def test_registry_changed(self):
+        first = self.data.compile('skills')
+        self.assertEqual(self._game_data().compile('skills'), first)
+        # artifacts validated against other registries are recompiled
+        self.token = 'b'
+        artifact = self._game_data().compile('skills')
+        self.assertEqual(artifact['registry'], 'b')
+        self.assertEqual(artifact['rows'], first['rows'])
+        self.assertNotEqual(artifact, first)
+
+
+class GameModulesTestCase(TestCase):
+    """Test case for the game modules built from `GAME_DATA`."""
+    def test_skills(self):
+        from world.skills import SKILLS
+        self.assertEqual(SKILLS.keys, tuple(sorted(GAME_DATA['skills'])))
+        self.assertEqual(SKILLS['dodge']['trait'], 'AGL')
+
+    def test_weapon_prototypes(self):
+        from world.content import prototypes_weapons
+        self.assertEqual(prototypes_weapons.SG16_SHOTGUN,
+                         GAME_DATA['weapons']['SG16_SHOTGUN'])
+        self.assertEqual(prototypes_weapons.SG16_SHOTGUN['damage'], '5D+1')
+
+    def test_registry_token(self):
+        # skills do not depend on the skill registry they build
+        self.assertNotEqual(registry_token('skills'),
+                            registry_token('weapons'))
+
+
+class StreamingImportTestCase(TestCase):
+    """Test case for streaming rows into a catalog."""
+    def setUp(self):
+        handle, self.csv = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as f:
+            f.write(SKILLS_CSV)
+
+    def tearDown(self):
+        os.remove(self.csv)
+
+    def test_iter_rows(self):
+        errors = []
+        rows = iter_rows(self.csv, compile_skill, errors)
+        self.assertEqual(next(rows)[0], 'dodge')
+        # rows are read lazily
+        self.assertEqual(errors, [])
+        self.assertEqual([key for key, data in rows], ['knives'])
+        self.assertEqual([line for line, msg in errors], [4, 5])
+
+    def test_iter_prototypes(self):
+        prototypes = dict(iter_prototypes())
+        self.assertIn('SG16_SHOTGUN', prototypes)
+        self.assertEqual(prototypes['SG16_SHOTGUN']['aliases'], ['sg16'])
+
+    def test_upsert(self):
+        catalog = {'knives': {'name': 'Knives'}}
+        self.assertEqual(upsert(catalog, iter_rows(self.csv, compile_skill,
+                                                   [])),
+                         {'added': 1, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(catalog['knives']['trait'], 'STR')
+        self.assertEqual(upsert(catalog, iter_rows(self.csv, compile_skill,
+                                                   [])),
+                         {'added': 0, 'updated': 0, 'unchanged': 2})
+
+    def test_load_prototypes(self):
+        with open(self.csv, 'w') as f:
+            f.write(
+                "name,model,aliases,typeclass,desc,weight,value,damage,"
+                "wear,durability,bonus,use_skill,fix_skill,key\n"
+                "shotgun,sg,,typeclasses.weapons.TwoHandedRanged,Louder.,"
+                "2,9,17,0,5,0,shotgun,gunsmith,shotgun\n"
+                "blaster,b,,typeclasses.weapons.RangedWeapon,Broken.,"
+                "1,7,11,0,5,0,juggling,gunsmith,pistol\n")
+        catalog = {}
+        counts = load_prototypes(catalog, [self.csv])
+        self.assertEqual(counts['added'], len(GAME_DATA['weapons']) + 1)
+        self.assertEqual(catalog['SG17_SHOTGUN']['damage'], '5D+2')
+        self.assertEqual(catalog['SG16_SHOTGUN'],
+                         GAME_DATA['weapons']['SG16_SHOTGUN'])
+        self.assertNotIn('B11_BLASTER', catalog)
+        # loading again leaves the catalog unchanged
+        counts = load_prototypes(catalog, [self.csv])
+        self.assertEqual(counts['unchanged'], len(catalog))
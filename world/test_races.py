@@ -13,17 +13,28 @@ class LoadRaceTestCase(TestCase):
 
     def test_load_race(self):
         self.assertIsInstance(races.load_race("human"), races.Race)
-        self.assertRaises(races.RaceException, races.load_race, "dwarf")
+        self.assertIs(races.load_race("DWARF"), races.RACES['dwarf'])
+        self.assertRaises(races.RaceException, races.load_race, "gnome")
+        self.assertEqual(races.ALL_RACES, ('Human', 'Elf', 'Dwarf'))
 
 class ApplyRaceTestCase(EvenniaTest):
     character_typeclass = Character
 
     def test_apply_race(self):
-        races.apply_race(self.char1, races.Human())
+        races.apply_race(self.char1, races.load_race('human'))
         self.assertEqual(self.char1.db.race, "Human")
         self.assertIn('wield1', self.char1.db.slots.keys())
         self.assertIn('r_arm', [l[0] for l in self.char1.db.limbs])
 
+    def test_apply_race_bonuses(self):
+        apply_archetype(self.char1, 'soldier')
+        strength = self.char1.traits.STR.actual
+        races.apply_race(self.char1, 'dwarf')
+        self.assertEqual(self.char1.db.race, "Dwarf")
+        self.assertEqual(self.char1.traits.STR.actual, strength + 1)
+        self.assertEqual(self.char1.equip.slots,
+                         races.RACES['dwarf'].slot_order)
+
 class RaceTestCase(TestCase):
     """Test case for Race classes."""
     def test_load_human(self):
@@ -31,3 +42,20 @@ class RaceTestCase(TestCase):
         h = races.load_race('human')
         self.assertEqual(h.name, 'Human')
 
+    def test_desc_cache(self):
+        """test that descriptions are re-rendered when race data changes"""
+        h = races.load_race('human')
+        desc = h.desc
+        self.assertIs(desc, races.load_race('human').desc)
+        self.assertIn('medium', desc)
+        large = races.Race(**dict(races.RACE_DATA['human'], size='large'))
+        self.assertIn('large', large.desc)
+        self.assertNotEqual(h.get_desc(40), h.get_desc(78))
+        self.assertIn('alertness', races.load_race('elf').desc)
+
+    def test_read_only(self):
+        h = races.load_race('human')
+        self.assertRaises(races.RaceException, setattr, h, 'size', 'large')
+        self.assertEqual(h.slot_order, ('wield1', 'wield2', 'armor'))
+        self.assertRaises(races.RaceException, races.Race, 'Ogre', 'Ogres',
+                          'large', '', bonuses={'WILL': 1})
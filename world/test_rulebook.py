@@ -4,10 +4,13 @@ Unit tests for world.archetypes module.
 
 from unittest import skip
 
+import numpy as np
+
 from evennia.utils.test_resources import EvenniaTest
 
 from utils.utils import d6str
 from world import rulebook, skills, archetypes
+from world.content import prototypes_weapons
 from typeclasses.characters import Character
 
 class RulebookTestCase(EvenniaTest):
@@ -20,14 +23,14 @@ class RulebookTestCase(EvenniaTest):
             self.char1.traits[trait].base = 8
         skill_list = {
             'dodge': 1,
-            'rifles': 0,
-            'powered armor': 10,
-            'piloting': 5,
+            'rifle': 0,
+            'powered_armor': 10,
+            'starship_pilot': 5,
         }
         skills.apply_skills(self.char1, skill_list)
 
     def test_skill_value(self):
-        skill = self.char1.skills.piloting
+        skill = self.char1.skills.starship_pilot
         self.assertEqual(13, rulebook.skill_value(self.char1, skill))
 
         self.char1.traits.MCH.mod = -3
@@ -36,6 +39,24 @@ class RulebookTestCase(EvenniaTest):
         self.char1.traits.MCH.reset_mod()
         self.assertEqual(13, rulebook.skill_value(self.char1, skill))
 
+    def test_skill_totals(self):
+        totals = rulebook.skill_totals(self.char1)
+        self.assertEqual(13, totals['starship_pilot'])
+        self.assertEqual(18, totals['powered_armor'])
+        self.assertIs(totals, rulebook.skill_totals(self.char1))
+
+        # trait changes invalidate the table
+        self.char1.traits.MCH.mod = -3
+        totals = rulebook.skill_totals(self.char1)
+        self.assertEqual(10, totals['starship_pilot'])
+
+        # skill changes invalidate the table
+        self.char1.skills.starship_pilot.base = 2
+        totals = rulebook.skill_totals(self.char1)
+        self.assertEqual(7, totals['starship_pilot'])
+        self.assertEqual(7, rulebook.skill_value(
+            self.char1, self.char1.skills.starship_pilot))
+
     def test_d6roll(self):
         for value in range(3, 16):
             for i in range(1000):
@@ -48,7 +69,7 @@ class RulebookTestCase(EvenniaTest):
         rollmin = 100
         rollmax = 0
         for _ in range(1000):
-            skill = self.char1.skills.piloting
+            skill = self.char1.skills.starship_pilot
             actual = rulebook.skill_result(self.char1,
                                            skill)
             # total value of 13 for this = 4D+1
@@ -61,7 +82,7 @@ class RulebookTestCase(EvenniaTest):
         self.assertNotEqual(rollmin, rollmax)
 
         # it should return zero on a bad trait name
-        skill = self.char1.skills.piloting
+        skill = self.char1.skills.starship_pilot
         skill.trait = 'PRE'
         actual = rulebook.skill_result(self.char1, skill)
         self.assertEqual(actual, 0)
@@ -69,7 +90,268 @@ class RulebookTestCase(EvenniaTest):
     def test_skill_check(self):
         for _ in range(1000):
             # TODO refactor range based on getting actual value.
-            # piloting 4D+1 for this
-            skill = self.char1.skills.piloting
+            # starship pilot 4D+1 for this
+            skill = self.char1.skills.starship_pilot
             self.assertTrue(rulebook.skill_check(self.char1, skill, 4))
-            self.assertFalse(rulebook.skill_check(self.char1, skill, 26))
\ No newline at end of file
+            self.assertFalse(rulebook.skill_check(self.char1, skill, 26))
+
+    def test_d6roll_many(self):
+        values = range(0, 16) * 200
+        rolls = rulebook.d6roll_many(values)
+        self.assertEqual(len(rolls), len(values))
+        for value, roll in zip(values, rolls):
+            if value < 3:
+                self.assertEqual(roll, 0)
+                continue
+            min = value / 3 + value % 3
+            max = value / 3 * 6 + value % 3
+            self.assertTrue(min <= roll <= max, msg="{} is out or range for {}".format(roll, d6str(value)))
+        self.assertEqual(len(rulebook.d6roll_many([])), 0)
+
+    def test_d6roll_many_distribution(self):
+        # mean of 4D+1 is 15; its standard error over 20000 rolls is ~0.02
+        rolls = rulebook.d6roll_many([13] * 20000)
+        self.assertAlmostEqual(rolls.mean(), 15, delta=0.2)
+        self.assertEqual(rolls.min(), 5)
+        self.assertEqual(rolls.max(), 25)
+
+    def test_skill_check_many(self):
+        archetypes.apply_archetype(self.char2, 'soldier')
+        chars = [self.char1, self.char2]
+        for _ in range(100):
+            # char2 has no starship pilot skill and always fails
+            self.assertEqual(
+                list(rulebook.skill_check_many(chars, 'starship_pilot', 4)),
+                [True, False])
+            self.assertEqual(
+                list(rulebook.skill_check_many(chars, 'starship_pilot',
+                                               [26, 0])),
+                [False, True])
+
+    def test_odds(self):
+        # 1D: each face is equally likely
+        self.assertAlmostEqual(rulebook.odds(3, 4), 0.5)
+        self.assertEqual(rulebook.odds(3, 1), 1.0)
+        self.assertEqual(rulebook.odds(3, 7), 0.0)
+        # 2D+1 needs 12+ (11 on the dice): 3 of 36 ways
+        self.assertAlmostEqual(rulebook.odds(7, 12), 3.0 / 36)
+        # values below 3 always roll 0
+        self.assertEqual(rulebook.odds(2, 0), 1.0)
+        self.assertEqual(rulebook.odds(2, 1), 0.0)
+        self.assertIs(rulebook.d6distribution(13),
+                      rulebook.d6distribution(13))
+
+    def test_distribution(self):
+        dist = rulebook.d6distribution(13)
+        self.assertEqual((dist.min, dist.max), (5, 25))
+        self.assertAlmostEqual(dist.pmf.sum(), 1.0)
+        self.assertAlmostEqual(sum(r * p for r, p in enumerate(dist.pmf)), 15)
+        self.assertEqual(dist.ppf(0.0), 5)
+        self.assertEqual(dist.ppf(0.999999999), 25)
+        self.assertEqual(list(dist.ppf([0.0, 0.5])), [5, 15])
+        rolls = dist.sample(20000)
+        self.assertAlmostEqual(rolls.mean(), 15, delta=0.2)
+        self.assertTrue(5 <= dist.sample() <= 25)
+
+    def test_roll_stream(self):
+        stream = rulebook.RollStream(seed=42)
+        state = stream.getstate()
+        rolls = [rulebook.d6roll(13, stream=stream) for _ in range(20)]
+        many = list(rulebook.d6roll_many([7, 13, 2], stream=stream))
+        sample = rulebook.d6distribution(13).sample(5, stream=stream)
+
+        # the same seed or a restored state replays the same rolls
+        for replay in (rulebook.RollStream(seed=42),
+                       rulebook.RollStream.from_state(state)):
+            self.assertEqual(
+                [rulebook.d6roll(13, stream=replay) for _ in range(20)],
+                rolls)
+            self.assertEqual(
+                list(rulebook.d6roll_many([7, 13, 2], stream=replay)), many)
+            self.assertEqual(
+                list(rulebook.d6distribution(13).sample(5, stream=replay)),
+                list(sample))
+        self.assertTrue(all(5 <= r <= 25 for r in rolls))
+
+    def test_roll_stream_pregenerate(self):
+        stream = rulebook.RollStream(seed=7)
+        stream.pregenerate(10)
+        faces = list(stream.buffer)
+        state = stream.getstate()
+        self.assertEqual(list(stream.faces(4)), faces[:4])
+        self.assertEqual(len(stream.buffer), 6)
+        # pregenerated faces are used up first, then new ones are drawn
+        self.assertEqual(len(stream.faces(8)), 8)
+        replay = rulebook.RollStream.from_state(state)
+        self.assertEqual(list(replay.faces(4)), faces[:4])
+        self.assertTrue(1 <= stream.dice(3, 3, 3) - 3 <= 9)
+
+    def test_face_pool(self):
+        pool = rulebook.FacePool(size=100)
+        self.assertEqual(len(pool), 0)
+        total = pool.roll(4)
+        self.assertTrue(4 <= total <= 24)
+        self.assertEqual((pool.hits, pool.refills, len(pool)), (4, 1, 96))
+        for _ in range(24):
+            pool.roll(4)
+        self.assertEqual((pool.hits, pool.refills, len(pool)), (100, 1, 0))
+        # rolls larger than the chunk size refill as often as needed
+        self.assertTrue(250 <= pool.roll(250) <= 1500)
+        self.assertEqual(pool.refills, 4)
+        self.assertTrue(all(1 <= f <= 6 for f in pool.faces))
+        pool.reset_counters()
+        self.assertEqual((pool.hits, pool.refills), (0, 0))
+
+    def test_d6roll_face_pool(self):
+        hits = rulebook.FACE_POOL.hits
+        rulebook.d6roll(13)
+        rulebook.skill_result(self.char1, self.char1.skills.starship_pilot)
+        self.assertEqual(rulebook.FACE_POOL.hits, hits + 8)
+
+    def test_compile_dice(self):
+        expr = rulebook.compile_dice('2D+1 x2')
+        self.assertIs(rulebook.compile_dice('2D+1 x2'), expr)
+        self.assertEqual((expr.dice, expr.pips, expr.multiplier, expr.wild),
+                         (2, 1, 2, False))
+        self.assertEqual(expr.value, 7)
+        self.assertEqual(str(expr), '2D+1 x2')
+        for _ in range(100):
+            roll = expr()
+            self.assertTrue(6 <= roll <= 26 and roll % 2 == 0)
+        # x2 doubles each 2D+1 result
+        self.assertAlmostEqual(expr.odds(20), 10.0 / 36)
+
+        wild = rulebook.compile_dice(' WILD 3d ')
+        self.assertTrue(wild.wild)
+        self.assertEqual(str(wild), 'wild 3D')
+        # plain numbers are D6 values
+        self.assertEqual(rulebook.compile_dice(14).value, 14)
+        self.assertEqual(str(rulebook.compile_dice('14')), '4D+2')
+        self.assertEqual(rulebook.compile_dice(2)(), 0)
+        stream = rulebook.RollStream(seed=3)
+        self.assertEqual(rulebook.compile_dice('4D+2')(stream),
+                         rulebook.d6roll(14, rulebook.RollStream(seed=3)))
+
+        # equivalent expressions share one compiled expression
+        self.assertIs(rulebook.compile_dice(' 4d+2 '),
+                      rulebook.compile_dice(14))
+        self.assertIs(rulebook.compile_dice('2d+1x2'), expr)
+
+        for bad in ('3D+3', '2D x0', 'D+1', 'three dice', -1, 4.0, None,
+                    '101D', '1D x101', 304, 10 ** 30):
+            with self.assertRaises(rulebook.DiceRollError):
+                rulebook.compile_dice(bad)
+
+    def test_weapon_damage(self):
+        for name, proto in vars(prototypes_weapons).items():
+            if isinstance(proto, dict) and 'damage' in proto:
+                self.assertIsInstance(proto['damage'], str, msg=name)
+                rulebook.compile_dice(proto['damage'])
+
+    def test_compile_dice_cache(self):
+        size = rulebook.COMPILED_CACHE_SIZE
+        first = rulebook.compile_dice('wild 1D')
+        for value in range(size):
+            rulebook.compile_dice(value)
+        self.assertEqual(len(rulebook._COMPILED), size)
+        # the least recently used expression was dropped
+        self.assertIsNot(rulebook.compile_dice('wild 1D'), first)
+
+    def test_compile_dice_raw_key(self):
+        expr = rulebook.compile_dice('3D+1 x2')
+        # repeat lookups of the same expression skip parsing
+        parse = rulebook._parse_dice
+        rulebook._parse_dice = None
+        try:
+            self.assertIs(rulebook.compile_dice('3D+1 x2'), expr)
+        finally:
+            rulebook._parse_dice = parse
+        # keys equal to a cached int are still validated
+        rulebook.compile_dice(1)
+        rulebook.compile_dice(4)
+        for bad in (True, 4.0):
+            with self.assertRaises(rulebook.DiceRollError):
+                rulebook.compile_dice(bad)
+
+    def _chi_square(self, rolls, pmf):
+        """Asserts that `rolls` fit `pmf` with a chi-square test."""
+        counts = np.bincount(rolls, minlength=len(pmf))[:len(pmf)]
+        expected = pmf * len(rolls)
+        # pool the results into bins expected at least 5 times
+        stat, bins, obs, exp = 0.0, 0, 0, 0.0
+        for o, e in zip(counts, expected):
+            obs, exp = obs + o, exp + e
+            if exp >= 5:
+                stat += (obs - exp) ** 2 / exp
+                bins += 1
+                obs, exp = 0, 0.0
+        dof = bins - 1
+        # critical value at p = 0.001 (Wilson-Hilferty approximation)
+        h = 2.0 / (9 * dof)
+        crit = dof * (1 - h + 3.09 * h ** 0.5) ** 3
+        self.assertLess(stat, crit)
+
+    def test_wild_distribution(self):
+        dist = rulebook.wild_distribution(13)
+        self.assertAlmostEqual(dist.pmf.sum(), 1.0)
+        self.assertAlmostEqual(dist.complication, 1.0 / 6)
+        # 3D+1 plus an exploding die, which averages 3.5 * 6 / 5
+        self.assertAlmostEqual(
+            sum(r * p for r, p in enumerate(dist.pmf)), 3 * 3.5 + 1 + 4.2)
+        self.assertEqual(dist.min, 5)
+        self.assertIs(rulebook.wild_distribution(13), dist)
+        self.assertEqual(rulebook.wild_roll(2), (0, False))
+
+    def test_wild_roll(self):
+        dist = rulebook.wild_distribution(7)
+        stream = rulebook.RollStream(seed=11)
+        rolls = [rulebook.wild_roll(7, stream) for _ in range(20000)]
+        totals = np.array([t for t, _ in rolls])
+        complications = np.array([c for _, c in rolls])
+        self._chi_square(totals, dist.pmf)
+        self._chi_square(totals[complications],
+                         dist.pmf_complication / dist.complication)
+        self.assertAlmostEqual(complications.mean(), 1.0 / 6, delta=0.015)
+        self.assertGreater(totals.max(), 19)
+
+    def test_wild_roll_fast(self):
+        dist = rulebook.wild_distribution(7)
+        stream = rulebook.RollStream(seed=12)
+        totals, complications = dist.sample_wild(20000, stream=stream)
+        self._chi_square(totals, dist.pmf)
+        self._chi_square(totals[complications],
+                         dist.pmf_complication / dist.complication)
+        self.assertAlmostEqual(complications.mean(), 1.0 / 6, delta=0.015)
+        total, complication = rulebook.wild_roll(7, fast=True)
+        self.assertTrue(total >= 3)
+        self.assertIn(complication, (True, False))
+
+    def test_compile_dice_wild(self):
+        expr = rulebook.compile_dice('wild 2D+1 x2')
+        self.assertIsInstance(expr.distribution, rulebook.WildDistribution)
+        total, complication = expr.roll_wild(rulebook.RollStream(seed=5))
+        self.assertEqual(total % 2, 0)
+        self.assertEqual(total, expr(rulebook.RollStream(seed=5)))
+
+    def test_opposed_matrix(self):
+        archetypes.apply_archetype(self.char2, 'soldier')
+        skills.apply_skills(self.char2, {'dodge': 1})
+        actors = [self.char1, self.char2]
+        observers = [self.char2, self.char1, self.char2]
+        matrix = rulebook.opposed_matrix(actors, 'starship_pilot',
+                                         observers, 'dodge')
+        self.assertEqual(matrix.shape, (2, 3))
+        # char2 has no starship pilot skill; its 0 roll never beats anyone
+        self.assertFalse(matrix[1].any())
+
+        # the same stream gives the same results as separate rolls
+        matrix = rulebook.opposed_matrix(actors, 'starship_pilot', observers,
+                                         'dodge', rulebook.RollStream(9))
+        pilot = self.char1.skills.starship_pilot
+        values = [rulebook.skill_value(self.char1, pilot),
+                  0] + [rulebook.skill_value(ch, ch.skills.dodge)
+                        for ch in observers]
+        rolls = rulebook.d6roll_many(values, rulebook.RollStream(9))
+        for i in range(2):
+            for j in range(3):
+                self.assertEqual(matrix[i, j], rolls[i] > rolls[2 + j])
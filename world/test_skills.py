@@ -6,7 +6,8 @@ from unittest import skip
 from django.test import TestCase
 from evennia.utils.test_resources import EvenniaTest
 from typeclasses.characters import Character
-from world.skills import load_skill, ALL_SKILLS, apply_skills, SkillException
+from world.skills import (load_skill, ALL_SKILLS, apply_skills,
+                          SkillException, SKILLS)
 from world.archetypes import PRIMARY_TRAITS
 
 
@@ -15,8 +16,40 @@ class LoadSkillTestCase(TestCase):
     def test_load_skill(self):
         for name in ALL_SKILLS:
             s = load_skill(name)
-            self.assertEqual(s.name.lower(), name)
+            self.assertEqual(s.name.lower().replace(' ', '_'), name)
             self.assertIn(s.trait, PRIMARY_TRAITS)
+        self.assertEqual(load_skill('Energy Pistol').name, 'Energy Pistol')
+        self.assertRaises(SkillException, load_skill, 'notaskill')
+
+
+class SkillRegistryTestCase(TestCase):
+    """Test case for the `SKILLS` registry."""
+    def test_lookup(self):
+        self.assertEqual(len(SKILLS), len(ALL_SKILLS))
+        self.assertIn('dodge', SKILLS)
+        self.assertEqual(SKILLS['dodge']['trait'], 'AGL')
+        self.assertEqual(SKILLS.lookup('DODGE'), 'dodge')
+        self.assertEqual(SKILLS.lookup('Powered Armor'), 'powered_armor')
+        self.assertIsNone(SKILLS.lookup('notaskill'))
+        self.assertRaises(SkillException, SKILLS.__getitem__, 'notaskill')
+
+    def test_trait_skills(self):
+        for trait in PRIMARY_TRAITS:
+            keys = SKILLS.trait_skills(trait)
+            self.assertTrue(keys)
+            for key in keys:
+                self.assertEqual(SKILLS[key]['trait'], trait)
+        self.assertEqual(sum(len(SKILLS.trait_skills(t))
+                             for t in PRIMARY_TRAITS), len(SKILLS))
+        self.assertEqual(SKILLS.trait_skills('XYZ'), ())
+
+    def test_prefix(self):
+        self.assertEqual(SKILLS.prefix('ener'),
+                         ('energy_pistol', 'energy_rifle'))
+        self.assertEqual(SKILLS.prefix('Energy R'), ('energy_rifle',))
+        self.assertEqual(SKILLS.prefix('dodge'), ('dodge',))
+        self.assertEqual(SKILLS.prefix('dodgex'), ())
+        self.assertEqual(SKILLS.prefix(''), ALL_SKILLS)
 
 class ApplySkillsTestCase(EvenniaTest):
     character_typeclass = Character
@@ -24,13 +57,17 @@ class ApplySkillsTestCase(EvenniaTest):
     def test_apply_skills(self):
         skills = {
             'dodge': 1,
-            'rifles': 0,
-            'powered armor': 10,
-            'piloting': 0,
+            'rifle': 0,
+            'powered_armor': 10,
+            'starship_pilot': 0,
         }
         apply_skills(self.char1, skills)
         for k, v in skills.iteritems():
             self.assertEqual(v, self.char1.skills[k])
 
+        # display names are stored under their skill keys
+        apply_skills(self.char1, {'Energy Pistol': 2})
+        self.assertEqual(2, self.char1.skills['energy_pistol'])
+
         self.assertRaises(SkillException, apply_skills,
                           self.char1, {"notaskill": 1})
@@ -0,0 +1,77 @@
+"""
+Unit tests for the trait index.
+"""
+from evennia.utils.test_resources import EvenniaTest
+
+from typeclasses.characters import Character
+from world import archetypes
+from world.trait_index import TraitIndex, TraitIndexException
+from world.traits import TRAIT_LISTENERS
+
+
+class TraitIndexTestCase(EvenniaTest):
+    """Test case for the `TraitIndex` class."""
+    character_typeclass = Character
+
+    def setUp(self):
+        super(TraitIndexTestCase, self).setUp()
+        archetypes.apply_archetype(self.char1, 'soldier')
+        archetypes.apply_archetype(self.char2, 'scoundrel')
+        self.index = TraitIndex(columns=('STR', 'AGL', 'PER'))
+        TRAIT_LISTENERS.append(self.index.trait_changed)
+        self.index.rebuild()
+
+    def tearDown(self):
+        TRAIT_LISTENERS.remove(self.index.trait_changed)
+        super(TraitIndexTestCase, self).tearDown()
+
+    def test_select(self):
+        """test vectorized filter and sort queries"""
+        c1, c2 = self.char1.id, self.char2.id
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.select(STR__gte=12), [c1])
+        self.assertEqual(self.index.select(STR=12, AGL=12), [c1])
+        self.assertEqual(self.index.select(STR__lt=0), [])
+        self.assertEqual(self.index.select(order_by='PER'), [c1, c2])
+        self.assertEqual(
+            self.index.select(order_by='PER', reverse=True, limit=1), [c2])
+        self.assertEqual(self.index.objects(STR__gte=12), [self.char1])
+        with self.assertRaises(TraitIndexException):
+            self.index.select(WOUNDS=1)
+        with self.assertRaises(TraitIndexException):
+            self.index.select(STR__in=1)
+
+    def test_missing_trait(self):
+        """objects without a looked up trait never match"""
+        self.char2.traits.remove('PER')
+        self.assertEqual(self.index.select(PER__ne=0), [self.char1.id])
+        self.assertEqual(self.index.select(PER__lt=20), [self.char1.id])
+
+    def test_incremental(self):
+        """test trait writes are reflected in the next query"""
+        self.char2.traits.STR.base = 14
+        self.assertIn(self.char2.id, self.index.dirty)
+        self.assertEqual(self.index.select(STR__gte=13), [self.char2.id])
+        self.assertEqual(self.index.dirty, {})
+        with self.char1.traits.batch():
+            self.char1.traits.STR.mod += 4
+        self.assertEqual(self.index.select(order_by='STR', reverse=True),
+                         [self.char1.id, self.char2.id])
+
+    def test_remove(self):
+        """test removing rows and rebuilding the index"""
+        self.assertTrue(self.index.remove(self.char1))
+        self.assertFalse(self.index.remove(self.char1))
+        self.assertEqual(self.index.select(), [self.char2.id])
+        self.index.rebuild()
+        self.assertEqual(sorted(self.index.select()),
+                         sorted([self.char1.id, self.char2.id]))
+
+    def test_lazy_build(self):
+        """the index is built from the database on the first query"""
+        index = TraitIndex(columns=('STR',))
+        self.assertFalse(index.built)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(sorted(index.select()),
+                         sorted([self.char1.id, self.char2.id]))
+        self.assertTrue(index.built)
@@ -4,6 +4,7 @@ Unit test module for Trait classes.
 
 from unittest import skip
 from django.test import TestCase
+from mock import patch
 from evennia.utils.test_resources import EvenniaTest
 from .traits import *
 
@@ -394,6 +395,116 @@ class GaugeTraitTestCase(TestCase):
         self.check_trait(50, 0, 75, 75, 0, None)
         self.assertEqual(self.trait.percent(), '150.0%')
 
+    @patch('world.traits.time')
+    def test_regen(self, mock_time):
+        """`current` regenerates lazily at `rate` per second up to `max`"""
+        mock_time.return_value = 1000.0
+        self.trait.current = 2
+        self.trait.rate = 0.5
+        self.check_trait(10, 0, 2, 2, 0, 10)
+        mock_time.return_value = 1005.0
+        self.check_trait(10, 0, 4, 4, 0, 10)
+        # setting current restarts regeneration from the new value
+        self.trait.current -= 3
+        self.check_trait(10, 0, 1, 1, 0, 10)
+        mock_time.return_value = 1100.0
+        self.check_trait(10, 0, 10, 10, 0, 10)
+        # reading does not change the stored value
+        self.assertEqual(self.trait._data['current'], 1)
+
+    @patch('world.traits.time')
+    def test_regen_remainder(self, mock_time):
+        """partial units regenerated before `current` is set carry over"""
+        mock_time.return_value = 1000.0
+        self.trait.current = 2
+        self.trait.rate = 0.4
+        mock_time.return_value = 1004.0
+        # 1.6 regenerated; the 0.6 toward the next unit is kept
+        self.trait.current -= 2
+        self.check_trait(10, 0, 1, 1, 0, 10)
+        mock_time.return_value = 1005.0
+        self.check_trait(10, 0, 2, 2, 0, 10)
+        # a gauge held at its maximum does not bank regeneration
+        self.trait.current = 10
+        mock_time.return_value = 1100.0
+        self.trait.current -= 1
+        mock_time.return_value = 1102.0
+        self.check_trait(10, 0, 9, 9, 0, 10)
+
+    @patch('world.traits.time')
+    def test_regen_rate_change(self, mock_time):
+        """changing `rate` keeps what regenerated at the old rate"""
+        mock_time.return_value = 1000.0
+        self.trait.current = 0
+        self.trait.rate = 1
+        mock_time.return_value = 1004.0
+        self.trait.rate = 0
+        mock_time.return_value = 1010.0
+        self.check_trait(10, 0, 4, 4, 0, 10)
+
+
+class ModifierStackTestCase(TestCase):
+    """Test case for source-tracked trait modifiers."""
+    def setUp(self):
+        # direct instantiation for testing only; use TraitHandler in production
+        self.st = Trait({
+            'name': 'Strength',
+            'type': 'static',
+            'base': 8,
+        })
+        self.hp = Trait({
+            'name': 'HP',
+            'type': 'gauge',
+            'base': 10,
+        })
+
+    def tearDown(self):
+        self.st, self.hp = None, None
+
+    def test_add_remove(self):
+        """additive modifiers stack by source and are removable"""
+        self.st.mods.add('#1', 2)
+        self.st.mods.add('#2', 3)
+        self.assertEqual(self.st.actual, 13)
+        self.assertEqual(self.st.mod, 0)
+        self.assertEqual(len(self.st.mods), 2)
+        self.assertEqual(self.st.mods.remove('#1'), 2)
+        self.assertEqual(self.st.actual, 11)
+        self.assertNotIn('#1', self.st.mods)
+        self.assertIsNone(self.st.mods.remove('#1'))
+
+    def test_replace_same_source(self):
+        """re-adding from the same source replaces its modifier"""
+        self.st.mods.add('#1', 2)
+        self.st.mods.add('#1', 2)
+        self.assertEqual(self.st.actual, 10)
+        self.st.mods.remove('#1')
+        self.assertEqual(self.st.actual, 8)
+        self.assertNotIn('mods', self.st._data)
+
+    def test_mult(self):
+        """multiplicative modifiers scale the modified value"""
+        self.st.mod = 2
+        self.st.mods.add('#1', 2, kind='mult')
+        self.assertEqual(self.st.actual, 20)
+        self.st.mods.add('#2', 0.5, kind='mult')
+        self.assertEqual(self.st.actual, 10)
+        self.st.mods.clear()
+        self.assertEqual(self.st.actual, 10)
+        self.assertEqual(len(self.st.mods), 0)
+        with self.assertRaises(TraitException):
+            self.st.mods.add('#1', 2, kind='bogus')
+
+    def test_gauge_flow(self):
+        """modifiers flow into a gauge's `current` like `mod` does"""
+        self.hp.mods.add('#1', 3)
+        self.assertEqual(self.hp.max, 13)
+        self.assertEqual(self.hp.current, 13)
+        self.hp.current -= 5
+        self.hp.mods.remove('#1')
+        self.assertEqual(self.hp.max, 10)
+        self.assertEqual(self.hp.current, 8)
+
 
 class TraitFactoryTestCase(EvenniaTest):
     """Test case for the TraitHandler class."""
@@ -435,6 +546,23 @@ class TraitFactoryTestCase(EvenniaTest):
         self.traits.clear()
         self.assertEqual(len(self.traits), 0)
 
+    def test_trait_classes(self):
+        """test that the handler returns the subclass for each trait type"""
+        self.traits.add(
+            key='str', name='Strength', type='static')
+        self.traits.add(
+            key='bonus', name='Bonus', type='counter')
+        self.traits.add(
+            key='hp', name='HP', type='gauge')
+
+        self.assertIsInstance(self.traits.str, StaticTrait)
+        self.assertIsInstance(self.traits.bonus, CounterTrait)
+        self.assertIsInstance(self.traits.hp, GaugeTrait)
+        # traits have no instance dict; extra data still works
+        self.assertFalse(hasattr(self.traits.str, '__dict__'))
+        self.traits.str.preloaded = True
+        self.assertIn('preloaded', self.traits.str.extra)
+
     def test_alternate_access(self):
         """test `Trait` access by attribute and dict item syntax"""
         self.traits.add(
@@ -497,3 +625,207 @@ class TraitFactoryTestCase(EvenniaTest):
         self.assertEqual(hp.min, 0)
         self.assertEqual(hp.max, 0)
         self.assertEqual(hp.extra, [])
+
+    def test_batch_commit(self):
+        """changes made in a `batch()` block are saved when it exits"""
+        self.traits.add(
+            key='str', name='Strength', type='static', base=5)
+        with self.traits.batch():
+            self.traits.str.base += 2
+            self.traits.str.mod = 1
+            self.traits.add(key='hp', name='HP', type='gauge', base=10)
+            self.traits.hp.current -= 4
+
+        self.assertEqual(self.traits.str.actual, 8)
+        self.assertEqual(self.traits.hp.current, 6)
+        # a fresh handler reads the committed values from the database
+        traits = TraitHandler(self.char1)
+        self.assertEqual(traits.str.base, 7)
+        self.assertEqual(traits.str.mod, 1)
+        self.assertEqual(traits.hp.current, 6)
+
+    def test_batch_rollback(self):
+        """changes made in a `batch()` block are discarded if it raises"""
+        self.traits.add(
+            key='str', name='Strength', type='static', base=5)
+        with self.assertRaises(ValueError):
+            with self.traits.batch():
+                self.traits.str.base = 10
+                self.traits.add(key='bonus', name='Bonus', type='counter')
+                raise ValueError('abort')
+
+        self.assertEqual(self.traits.str.base, 5)
+        self.assertNotIn('bonus', self.traits.all)
+        traits = TraitHandler(self.char1)
+        self.assertEqual(traits.str.base, 5)
+
+    def test_batch_retrieved_traits(self):
+        """traits retrieved before a `batch()` block stay valid"""
+        self.traits.add(
+            key='str', name='Strength', type='static', base=5)
+        strength = self.traits.str
+        strength.mods.add('#7', 3)
+        with self.traits.batch():
+            strength.base += 2
+            self.assertEqual(self.traits.str.base, 7)
+        self.assertEqual(self.traits.remove_mods('#7'), 1)
+        self.assertEqual(strength.actual, 7)
+        # writes through the earlier trait keep the committed changes
+        strength.mod = 1
+        traits = TraitHandler(self.char1)
+        self.assertEqual(traits.str.actual, 8)
+        self.assertNotIn('#7', traits.str.mods)
+
+    def test_remove_mods(self):
+        """test removing a source's modifiers from all traits"""
+        self.traits.add(
+            key='str', name='Strength', type='static', base=5)
+        self.traits.add(
+            key='hp', name='HP', type='gauge', base=10)
+        self.traits.str.mods.add('#7', 1)
+        self.traits.hp.mods.add('#7', 2, kind='mult')
+        self.traits.hp.mods.add('#8', 1)
+
+        self.assertEqual(self.traits.remove_mods('#7'), 2)
+        self.assertEqual(self.traits.str.actual, 5)
+        self.assertEqual(self.traits.hp.max, 11)
+        self.assertEqual(self.traits.remove_mods('#7'), 0)
+
+    def test_derive(self):
+        """test derived traits are recomputed only after inputs change"""
+        self.traits.add(key='str', name='Strength', base=5)
+        self.traits.add(key='enc', name='Encumbrance', type='counter')
+        self.traits.add(key='mv', name='Movement', type='counter', base=5)
+        calls = []
+
+        def penalty(traits):
+            calls.append(1)
+            return -(traits.enc.actual // (2 * traits.str.actual))
+
+        self.traits.derive('mv', ('enc', 'str'), penalty)
+        self.assertEqual(self.traits.mv.mod, 0)
+        self.assertEqual(self.traits.mv.mod, 0)
+        self.assertEqual(len(calls), 1)
+
+        self.traits.enc.current += 30
+        self.assertEqual(self.traits.mv.mod, -3)
+        self.traits.str.base += 1
+        self.assertEqual(self.traits.mv.mod, -2)
+        self.traits.str.mods.add('#5', 2)
+        self.assertEqual(self.traits.mv.mod, -1)
+        self.assertEqual(len(calls), 4)
+        # the derived value is stored with the trait
+        self.assertEqual(self.traits.attr_dict['mv']['mod'], -1)
+
+    def test_derive_chain(self):
+        """test derived traits can be inputs of other derived traits"""
+        self.traits.add(key='a', name='A', base=1)
+        self.traits.add(key='b', name='B')
+        self.traits.add(key='c', name='C')
+        self.traits.derive('b', ('a',), lambda t: t.a.actual * 2)
+        self.traits.derive('c', ('b',), lambda t: t.b.actual + 1)
+        self.assertEqual(self.traits.c.mod, 3)
+        self.traits.a.base = 2
+        self.assertEqual(self.traits.c.mod, 5)
+        with self.assertRaises(TraitException):
+            self.traits.derive('a', ('c',), lambda t: t.c.actual)
+
+    def test_version(self):
+        """test the handler version changes with any trait"""
+        self.traits.add(key='str', name='Strength', base=5)
+        version = self.traits.version
+        self.traits.str.mod = 1
+        self.assertGreater(self.traits.version, version)
+
+    def test_add_many(self):
+        """test adding several traits at once"""
+        self.traits.add(key='str', name='Strength', base=5)
+        self.traits.add_many({
+            'hp': {'name': 'HP', 'type': 'gauge', 'base': 10},
+            'enc': {'name': 'Encumbrance', 'type': 'counter', 'max': 50},
+        })
+        self.assertEqual(set(self.traits.all), {'str', 'hp', 'enc'})
+        self.assertEqual(self.traits.hp.actual, 10)
+        self.assertEqual(self.traits.enc.max, 50)
+        # nothing is added if any trait is invalid or exists
+        with self.assertRaises(TraitException):
+            self.traits.add_many({'dex': {'name': 'Dex'},
+                                  'str': {'name': 'Strength'}})
+        with self.assertRaises(TraitException):
+            self.traits.add_many({'dex': {'name': 'Dex'},
+                                  'luck': {'name': 'Luck', 'type': 'bad'}})
+        self.assertEqual(len(self.traits), 3)
+
+    def test_replace_all(self):
+        """test replacing all traits at once"""
+        self.traits.add(key='str', name='Strength', base=5)
+        strength = self.traits.str
+        with self.assertRaises(TraitException):
+            self.traits.replace_all({'dex': {'name': 'Dex', 'bogus': 1}})
+        self.assertEqual(self.traits.all, ['str'])
+        self.traits.replace_all({'str': {'name': 'Strength', 'base': 8},
+                                 'dex': {'name': 'Dex', 'base': 3}})
+        self.assertEqual(set(self.traits.all), {'str', 'dex'})
+        self.assertEqual(self.traits.str.actual, 8)
+        self.traits.clear()
+        self.assertEqual(len(self.traits), 0)
+
+    def test_replace_all_retrieved_traits(self):
+        """traits retrieved before `replace_all()` read the new data"""
+        self.traits.add(key='str', name='Strength', base=5)
+        self.traits.add(key='dex', name='Dex', base=3)
+        strength, dex = self.traits.str, self.traits.dex
+        self.traits.replace_all({'str': {'name': 'Strength', 'base': 8},
+                                 'dex': {'name': 'Dex', 'type': 'gauge',
+                                         'base': 4}})
+        self.assertIs(self.traits.str, strength)
+        self.assertEqual(strength.actual, 8)
+        # writes through the earlier trait are saved
+        strength.mod = 1
+        traits = TraitHandler(self.char1)
+        self.assertEqual(traits.str.actual, 9)
+        # traits that changed type are retrieved anew
+        self.assertIsNot(self.traits.dex, dex)
+        self.assertEqual(self.traits.dex.max, 4)
+        self.traits.clear()
+        self.assertNotIn('str', self.traits.cache)
+
+    def test_schema(self):
+        """test trait metadata is read from a shared schema"""
+        schema = build_schema({
+            'str': {'name': 'Strength', 'extra': {'is_d6': True}},
+            'hp': {'name': 'HP', 'type': 'gauge'},
+        })
+        traits = TraitHandler(self.char1, db_attribute='schema_traits',
+                              schema=schema)
+        traits.add_many({
+            'str': {'name': 'Strength', 'base': 8, 'extra': {'is_d6': True}},
+            'hp': {'name': 'HP', 'type': 'gauge', 'base': 10},
+            'dex': {'name': 'Dexterity', 'base': 5},
+        })
+        # only per-object values are stored for schema traits
+        self.assertEqual(dict(traits.attr_dict['str']), {'base': 8, 'mod': 0})
+        self.assertEqual(dict(traits.attr_dict['hp']), {'base': 10, 'mod': 0})
+        self.assertEqual(traits.attr_dict['dex']['name'], 'Dexterity')
+        self.assertEqual(traits.str.name, 'Strength')
+        self.assertTrue(traits.str.is_d6)
+        self.assertEqual(traits.hp.max, 10)
+        traits.hp.current -= 3
+        self.assertEqual(traits.hp.actual, 7)
+        # changing extra data copies it instead of changing the schema
+        traits.str.note = 'strong'
+        self.assertEqual(sorted(traits.str.extra), ['is_d6', 'note'])
+        self.assertNotIn('note', schema['str']['extra'])
+
+    def test_compact(self):
+        """test removing stored metadata provided by a schema"""
+        self.traits.add(key='str', name='Strength', base=8,
+                        extra={'is_d6': True})
+        schema = build_schema(
+            {'str': {'name': 'Strength', 'extra': {'is_d6': True}}})
+        traits = TraitHandler(self.char1, schema=schema)
+        self.assertEqual(traits.compact(), 1)
+        self.assertEqual(traits.compact(), 0)
+        self.assertEqual(dict(traits.attr_dict['str']), {'base': 8, 'mod': 0})
+        self.assertEqual(traits.str.name, 'Strength')
+        self.assertTrue(traits.str.is_d6)
@@ -0,0 +1,96 @@
+"""
+Unit tests for the turn engine.
+"""
+from mock import Mock, patch
+
+from evennia.utils.test_resources import EvenniaTest
+
+from typeclasses.characters import Character
+from world import archetypes, turns
+
+
+class TurnEngineTestCase(EvenniaTest):
+    """Test case for the `TurnEngine` script."""
+    character_typeclass = Character
+
+    def setUp(self):
+        super(TurnEngineTestCase, self).setUp()
+        archetypes.apply_archetype(self.char1, 'soldier')
+        archetypes.apply_archetype(self.char2, 'soldier')
+        self.engine = turns.get_turn_engine()
+
+    def tearDown(self):
+        self.engine.stop()
+        super(TurnEngineTestCase, self).tearDown()
+
+    def test_get_turn_engine(self):
+        """the engine is created once and then reused"""
+        self.assertEqual(self.engine, turns.get_turn_engine())
+
+    def test_turn(self):
+        """only characters added to the engine are processed"""
+        self.char1.at_turn_start = Mock(return_value=True)
+        self.char2.at_turn_start = Mock(return_value=True)
+        turns.start_turns(self.char1)
+        self.engine.at_repeat()
+        self.engine.at_repeat()
+        self.assertEqual(self.char1.at_turn_start.call_count, 2)
+        self.assertEqual(self.char2.at_turn_start.call_count, 0)
+        self.assertGreaterEqual(self.engine.ndb.max_duration,
+                                self.engine.ndb.last_duration)
+
+    def test_turn_done(self):
+        """characters without turn work left are dropped"""
+        self.char1.at_turn_start = Mock(return_value=False)
+        turns.start_turns(self.char1)
+        self.engine.at_repeat()
+        self.engine.at_repeat()
+        self.assertEqual(self.char1.at_turn_start.call_count, 1)
+
+    def test_stop_turns(self):
+        """removed characters are no longer processed"""
+        self.char1.at_turn_start = Mock(return_value=True)
+        turns.start_turns(self.char1)
+        turns.stop_turns(self.char1)
+        self.engine.at_repeat()
+        self.assertEqual(self.char1.at_turn_start.call_count, 0)
+
+    def test_batched_writes(self):
+        """trait changes made during a turn are kept"""
+        def at_turn_start():
+            self.char1.traits.STR.mod += 1
+            self.char1.traits.AGL.mod += 1
+        self.char1.at_turn_start = at_turn_start
+        turns.start_turns(self.char1)
+        self.engine.at_repeat()
+        self.assertEqual(self.char1.traits.STR.actual, 13)
+        self.assertEqual(self.char1.traits.AGL.actual, 13)
+
+    def test_at_turn_start(self):
+        """characters take turns while they have per-turn work"""
+        self.assertFalse(self.char1.at_turn_start())
+        self.char1.traits.add('PP', 'Power Points', type='counter', base=3)
+        self.char1.traits.PP.current = 1
+        self.assertTrue(self.char1.at_turn_start())
+        self.assertEqual(self.char1.traits.PP.current, 3)
+
+    def test_puppet(self):
+        """puppeted characters are added to the engine"""
+        self.char1.at_turn_start = Mock(return_value=True)
+        self.char1.at_post_puppet()
+        self.engine.at_repeat()
+        self.assertEqual(self.char1.at_turn_start.call_count, 1)
+        self.char1.at_post_unpuppet(None)
+        self.engine.at_repeat()
+        self.assertEqual(self.char1.at_turn_start.call_count, 1)
+
+    @patch('world.turns.TICKER_HANDLER')
+    def test_remove_turn_tickers(self, ticker_handler):
+        """old turn tickers are removed once"""
+        count = turns.remove_turn_tickers()
+        self.assertEqual(ticker_handler.remove.call_count, count)
+        for char in (self.char1, self.char2):
+            ticker_handler.remove.assert_any_call(
+                char, turns.TURN_TICKER_INTERVAL)
+        self.assertEqual(turns.remove_turn_tickers(), 0)
+        self.assertEqual(ticker_handler.remove.call_count, count)
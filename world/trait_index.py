@@ -0,0 +1,242 @@
+"""
+Trait index module.
+
+The `TraitIndex` keeps a columnar table of selected trait values for
+every object with traits, so population-wide queries such as "all
+characters with STR of at least 12, strongest first" are answered with
+vectorized NumPy operations instead of loading every character and
+decoding its `traits` Attribute.
+
+The table holds one row per object and one column per indexed trait key,
+storing the trait's `actual` value, or NaN if the object does not have
+the trait. The index listens to every `TraitHandler` change (see
+`world.traits.TRAIT_LISTENERS`) and marks the changed object's row as
+dirty; dirty rows are refreshed from the object's traits at the start of
+the next query, so writes only cost a dict insertion.
+
+The index is kept in memory only. It is filled from the database by
+`rebuild()` on the first query, rather than at server start, so startup
+does not pay for it; the `@traitindex/rebuild` command rebuilds it at
+runtime.
+
+Module Functions:
+
+    - `select(order_by=None, reverse=False, limit=None, **lookups)`
+
+        Returns the ids of all indexed objects matching the lookups,
+        using the shared `TRAIT_INDEX`. See `TraitIndex.select`.
+
+Example:
+
+    ```python
+    >>> from world.trait_index import TRAIT_INDEX
+    >>> TRAIT_INDEX.select(STR__gte=12, order_by='STR', reverse=True)
+    [14, 3, 27]
+    >>> [c for c in TRAIT_INDEX.objects(STR__gte=12)
+    ...  if 'armor' in c.equip.empty_slots]
+    ```
+"""
+
+import operator
+
+import numpy as np
+from evennia.objects.models import ObjectDB
+
+from world.archetypes import PRIMARY_TRAITS, SECONDARY_TRAITS, OTHER_TRAITS
+from world.traits import TRAIT_LISTENERS
+
+INDEX_COLUMNS = PRIMARY_TRAITS + SECONDARY_TRAITS + OTHER_TRAITS
+
+LOOKUPS = {
+    'exact': operator.eq,
+    'ne': operator.ne,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+}
+
+
+class TraitIndexException(Exception):
+    """Base exception class for the trait index.
+
+    Args:
+        msg (str): informative error message
+    """
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class TraitIndex(object):
+    """Columnar, NumPy-backed table of trait values for many objects.
+
+    Args:
+        columns (tuple[str]): trait keys to index
+        db_attribute (str): `TraitHandler` storage attribute to index
+
+    Attributes:
+        ids (ndarray): object id of each row
+        values (ndarray): trait values, one column per key in `columns`
+        built (bool): whether the index was filled from the database
+    """
+    def __init__(self, columns=INDEX_COLUMNS, db_attribute='traits'):
+        self.columns = tuple(columns)
+        self.column_index = {key: i for i, key in enumerate(self.columns)}
+        self.db_attribute = db_attribute
+        self.built = False
+        self.clear()
+
+    def __len__(self):
+        """Returns the number of indexed objects."""
+        return self.size
+
+    def __contains__(self, obj):
+        """Returns whether `obj` is indexed."""
+        return obj.id in self.rows
+
+    def clear(self):
+        """Removes all rows from the index."""
+        self.size = 0
+        self.ids = np.zeros(16, dtype=np.int64)
+        self.values = np.full((16, len(self.columns)), np.nan)
+        self.rows = {}
+        self.dirty = {}
+
+    def rebuild(self):
+        """Indexes all objects with traits in the database.
+
+        Returns:
+            (int): number of indexed objects
+        """
+        self.clear()
+        for obj in ObjectDB.objects.filter(
+                db_attributes__db_key=self.db_attribute).distinct():
+            self.update(obj)
+        self.built = True
+        return self.size
+
+    def update(self, obj):
+        """Adds `obj` to the index or refreshes its row."""
+        dbid = obj.id
+        self.dirty.pop(dbid, None)
+        row = self.rows.get(dbid)
+        if row is None:
+            row = self._append(dbid)
+        handler = getattr(obj, self.db_attribute)
+        values = self.values[row]
+        for i, key in enumerate(self.columns):
+            trait = handler.get(key)
+            values[i] = np.nan if trait is None else trait.actual
+
+    def remove(self, obj):
+        """Removes `obj` from the index.
+
+        Returns:
+            (bool): True if `obj` was indexed
+        """
+        dbid = obj.id if hasattr(obj, 'id') else obj
+        self.dirty.pop(dbid, None)
+        row = self.rows.pop(dbid, None)
+        if row is None:
+            return False
+        last = self.size - 1
+        if row != last:
+            # move the last row into the gap
+            self.ids[row] = self.ids[last]
+            self.values[row] = self.values[last]
+            self.rows[int(self.ids[row])] = row
+        self.size = last
+        return True
+
+    def select(self, order_by=None, reverse=False, limit=None, **lookups):
+        """Returns the ids of all indexed objects matching `lookups`.
+
+        Lookups are given as keyword arguments in the form
+        `<trait key>__<lookup>=value`, where lookup is one of 'exact'
+        (the default if omitted), 'ne', 'gt', 'gte', 'lt' or 'lte'.
+        Objects without a looked up trait never match. The first query
+        rebuilds the index from the database.
+
+        Args:
+            order_by Optional(str): trait key to sort the results by
+            reverse (bool): sort in descending order
+            limit Optional(int): maximum number of ids to return
+
+        Returns:
+            (list[int]): ids of the matching objects
+        """
+        if not self.built:
+            self.rebuild()
+        self._flush()
+        values = self.values[:self.size]
+        mask = np.ones(self.size, dtype=bool)
+        for lookup, value in lookups.items():
+            key, _, op = lookup.partition('__')
+            try:
+                compare = LOOKUPS[op or 'exact']
+            except KeyError:
+                raise TraitIndexException(
+                    "Invalid lookup: {}".format(lookup))
+            column = values[:, self._column(key)]
+            # missing traits are NaN, which `ne` would otherwise match
+            mask &= compare(column, value) & ~np.isnan(column)
+
+        rows = np.flatnonzero(mask)
+        if order_by is not None:
+            column = values[rows, self._column(order_by)]
+            rows = rows[np.argsort(-column if reverse else column,
+                                   kind='mergesort')]
+        if limit is not None:
+            rows = rows[:limit]
+        return self.ids[rows].tolist()
+
+    def objects(self, order_by=None, reverse=False, limit=None, **lookups):
+        """Returns the objects matching `lookups`. See `select()`."""
+        get = ObjectDB.objects.get_id
+        return [get(dbid) for dbid in
+                self.select(order_by, reverse, limit, **lookups)]
+
+    def trait_changed(self, handler, key):
+        """`TRAIT_LISTENERS` callback; marks the changed object dirty."""
+        if (handler.db_attribute == self.db_attribute
+                and key in self.column_index):
+            self.dirty[handler.obj.id] = handler.obj
+
+    def _append(self, dbid):
+        """Adds an empty row for `dbid`, growing the table if full."""
+        row = self.size
+        if row == len(self.ids):
+            self.ids = np.resize(self.ids, 2 * row)
+            grown = np.full((2 * row, len(self.columns)), np.nan)
+            grown[:row] = self.values
+            self.values = grown
+        self.ids[row] = dbid
+        self.values[row] = np.nan
+        self.rows[dbid] = row
+        self.size = row + 1
+        return row
+
+    def _column(self, key):
+        """Returns the column number of trait `key`."""
+        try:
+            return self.column_index[key]
+        except KeyError:
+            raise TraitIndexException("Trait not indexed: {}".format(key))
+
+    def _flush(self):
+        """Refreshes the rows of all objects changed since the last query."""
+        while self.dirty:
+            _, obj = self.dirty.popitem()
+            self.update(obj)
+
+
+TRAIT_INDEX = TraitIndex()
+TRAIT_LISTENERS.append(TRAIT_INDEX.trait_changed)
+
+
+def select(order_by=None, reverse=False, limit=None, **lookups):
+    """Returns the ids of objects matching `lookups` in `TRAIT_INDEX`.
+
+    See `TraitIndex.select` for the arguments.
+    """
+    return TRAIT_INDEX.select(order_by, reverse, limit, **lookups)
@@ -38,6 +38,11 @@ Example:
 
     * Gauge - Modified counter type modeling a refillable "gauge".
 
+    Each type is implemented by its own `Trait` subclass (`StaticTrait`,
+    `CounterTrait` and `GaugeTrait`), which the `TraitHandler` picks from
+    the trait's 'type' key. Instantiating `Trait` with trait data returns
+    an instance of the matching subclass.
+
     All traits have a read-only `actual` property that will report the trait's
     actual value and should be used for most get operations as it includes any
     modified values or calculations needed .
@@ -172,9 +177,14 @@ Example:
             max Optional(int, float, None, 'base'): default 'base'
                 maximum allowable value for current; unbounded if None;
                 if 'base', returns the value of `base`+`mod`.
+            rate Optional(int, float): default 0
+                amount `current` regenerates per second, up to `max`.
+                Regeneration is calculated when `current` is read, so
+                it needs no ticker and causes no database writes.
 
         Properties:
             actual (int, float): returns the value of the `current` property
+            rate (int, float): regeneration per second
 
         Methods:
             fill_gauge(): adds the value of `base`+`mod` to `current`
@@ -230,18 +240,79 @@ Example:
             >>> str(strength)
             'Strength      3D+1'
             ```
+
+    Modifier Stacks
+
+        Besides its own `mod`, every trait has a `mods` property holding a
+        `ModifierStack` of modifiers keyed by their source, such as the
+        dbref of an equipped item. Sources can add either an additive or
+        a multiplicative modifier, and all modifiers from a source can be
+        removed at once, from one trait or from every trait on a handler.
+
+        Examples:
+            ```python
+            >>> defense = caller.traits.DEF
+            >>> defense.mods.add(armor.dbref, 3)
+            >>> defense.actual
+            13
+            >>> caller.traits.remove_mods(armor.dbref)
+            1
+            >>> defense.actual
+            10
+            ```
+
+    Derived Traits
+
+        A property of a trait can be declared as a function of other
+        traits on the same handler with `TraitHandler.derive()`. The
+        derived value is stored on the trait and only recomputed after
+        one of its input traits changes.
+
+        Examples:
+            ```python
+            >>> traits.derive('MV', ('ENC', 'STR'), lambda t:
+            ...               int(-(t.ENC.actual // (2 * t.STR.actual))))
+            >>> traits.ENC.current += 30
+            >>> traits.MV.mod
+            -2
+            ```
+
+    Shared Schemas
+
+        Metadata that is the same for every object, such as a trait's
+        name, type and extra data, can be kept in a schema built with
+        `build_schema()` and passed to the `TraitHandler`. Only each
+        object's own values and any metadata that differs from the
+        schema are then saved in its Attribute.
+
+        Examples:
+            ```python
+            >>> SCHEMA = build_schema({'STR': {'name': 'Strength'}})
+            >>> traits = TraitHandler(obj, schema=SCHEMA)
+            >>> traits.add('STR', 'Strength', base=8)
+            >>> traits.attr_dict['STR']
+            {'base': 8, 'mod': 0}
+            ```
 """
 
+from contextlib import contextmanager
 from django.utils.encoding import python_2_unicode_compatible
-from evennia.utils.dbserialize import _SaverDict
+from evennia.utils.dbserialize import _SaverDict, _SaverList
 from evennia.utils import logger, lazy_property
 from functools import total_ordering
+from time import time
 
 from utils.utils import d6str
 
 TRAIT_TYPES = ('static', 'counter', 'gauge')
 RANGE_TRAITS = ('counter', 'gauge')
 
+# callables notified of every trait change as `listener(handler, key)`
+TRAIT_LISTENERS = []
+
+# trait data keys that may be shared through a schema
+_SCHEMA_KEYS = ('name', 'type', 'extra', 'min', 'max', 'rate')
+
 
 class TraitException(Exception):
     """Base exception class raised by `Trait` objects.
@@ -252,19 +323,163 @@ class TraitException(Exception):
     def __init__(self, msg):
         self.msg = msg
 
+
+class _BatchDict(dict):
+    """In-memory trait data used while a `TraitHandler` batch is open."""
+    pass
+
+
+def _detach(data):
+    """Returns a plain python copy of (possibly persistent) nested data."""
+    if isinstance(data, (dict, _SaverDict)):
+        return {k: _detach(v) for k, v in data.items()}
+    if isinstance(data, (list, _SaverList)):
+        return [_detach(v) for v in data]
+    return data
+
+
+class _SchemaData(object):
+    """Trait data combining an object's own values with shared metadata.
+
+    Keys are read from the object's persisted `data` first, falling back
+    to the schema's `meta` dict; all writes go to `data`.
+    """
+    __slots__ = ('meta', 'data')
+
+    def __init__(self, meta, data):
+        self.meta = meta
+        self.data = data
+
+    def __getitem__(self, key):
+        data = self.data
+        return data[key] if key in data else self.meta[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data or key in self.meta
+
+    def get(self, key, default=None):
+        data = self.data
+        return data[key] if key in data else self.meta.get(key, default)
+
+    def override(self, key):
+        """Copies a metadata value into `data` and returns the copy."""
+        if key not in self.data:
+            self.data[key] = _detach(self.meta[key])
+        return self.data[key]
+
+
+def _intern(value):
+    """Interns strings in (nested) schema metadata."""
+    if isinstance(value, dict):
+        return {_intern(k): _intern(v) for k, v in value.items()}
+    if type(value) is str:
+        return intern(value)
+    return value
+
+
+def build_schema(definitions):
+    """Builds a schema of trait metadata shared by all objects.
+
+    A `TraitHandler` created with a schema only persists the per-object
+    values of its traits (`base`, `mod`, `current`, modifiers) and any
+    metadata that differs from the schema. The 'name', 'type', 'extra',
+    'min', 'max' and 'rate' keys of each trait are read from the schema
+    instead.
+
+    Args:
+        definitions (dict): maps trait keys to the keyword arguments
+            `TraitHandler.add()` takes; 'base' and 'mod' are ignored
+
+    Returns:
+        (dict): schema for the `schema` argument of `TraitHandler`
+
+    Note:
+        The schema is shared; its metadata must not be changed.
+    """
+    schema = {}
+    for key, kwargs in definitions.items():
+        meta = _trait_data(**kwargs)
+        del meta['base'], meta['mod']
+        meta.pop('last_update', None)
+        cls = _TRAIT_CLASSES[meta['type']]
+        meta.setdefault('min', cls._default_min)
+        meta.setdefault('max', cls._default_max)
+        schema[_intern(key)] = _intern(meta)
+    return schema
+
+
+def _trait_data(name, type='static', base=0, mod=0,
+                min=None, max=None, extra={}, rate=None):
+    """Returns validated data for a new trait. See `TraitHandler.add`."""
+    if type not in TRAIT_TYPES:
+        raise TraitException("Invalid trait type specified.")
+    trait = dict(name=name,
+                 type=type,
+                 base=base,
+                 mod=mod,
+                 extra=extra)
+    if min:
+        trait.update(dict(min=min))
+    if max:
+        trait.update(dict(max=max))
+    if rate:
+        if type != 'gauge':
+            raise TraitException(
+                "Only gauge traits have a regeneration rate.")
+        trait.update(dict(rate=rate, last_update=time()))
+    return trait
+
+
 class TraitHandler(object):
     """Factory class that instantiates Trait objects.
 
     Args:
         obj (Object): parent Object typeclass for this TraitHandler
         db_attribute (str): name of the DB attribute for trait data storage
+        schema Optional(dict): shared trait metadata from `build_schema()`;
+            metadata matching the schema is not persisted on `obj`
+
+    Attributes:
+        version (int): counter incremented whenever any trait changes;
+            can be used as a cache key for values computed from traits
+
+    Note:
+        Every change to a `Trait` saves the whole `db_attribute`. When
+        making many changes at once, wrap them in a `batch()` block so
+        that the attribute is only written once:
+
+            ```python
+            with char.traits.batch():
+                char.traits.STR.base += 1
+                char.traits.AGL.mod -= 1
+            ```
     """
-    def __init__(self, obj, db_attribute='traits'):
+    _settable = ('obj', 'db_attribute', 'attr_dict', 'cache', 'batching',
+                 'version', 'derived', 'dependents', 'stale', 'schema')
+
+    def __init__(self, obj, db_attribute='traits', schema=None):
         if not obj.attributes.has(db_attribute):
             obj.attributes.add(db_attribute, {})
 
+        self.obj = obj
+        self.db_attribute = db_attribute
         self.attr_dict = obj.attributes.get(db_attribute)
         self.cache = {}
+        self.batching = False
+        self.schema = schema or {}
+        self.version = 0
+        # derived trait rules: {key: (inputs, func, field)}
+        self.derived = {}
+        # {input key: set of derived keys that read it}
+        self.dependents = {}
+        # derived keys whose stored value is out of date
+        self.stale = set()
 
     def __len__(self):
         """Return number of Traits in 'attr_dict'."""
@@ -272,7 +487,7 @@ class TraitHandler(object):
 
     def __setattr__(self, key, value):
         """Returns error message if trait objects are assigned directly."""
-        if key in ('attr_dict', 'cache'):
+        if key in self._settable:
             super(TraitHandler, self).__setattr__(key, value)
         else:
             raise TraitException(
@@ -306,30 +521,61 @@ class TraitHandler(object):
         if trait not in self.cache:
             if trait not in self.attr_dict:
                 return None
-            data = self.attr_dict[trait]
-            self.cache[trait] = Trait(data)
+            data = self._view(trait)
+            self.cache[trait] = \
+                _TRAIT_CLASSES[data['type']](data, key=trait, handler=self)
+        if trait in self.stale:
+            self._refresh(trait)
         return self.cache[trait]
 
     def add(self, key, name, type='static',
-            base=0, mod=0, min=None, max=None, extra={}):
+            base=0, mod=0, min=None, max=None, extra={}, rate=None):
         """Create a new Trait and add it to the handler."""
         if key in self.attr_dict:
             raise TraitException("Trait '{}' already exists.".format(key))
 
-        if type in TRAIT_TYPES:
-            trait = dict(name=name,
-                         type=type,
-                         base=base,
-                         mod=mod,
-                         extra=extra)
-            if min:
-                trait.update(dict(min=min))
-            if max:
-                trait.update(dict(max=max))
-
-            self.attr_dict[key] = trait
-        else:
-            raise TraitException("Invalid trait type specified.")
+        trait = self._strip(
+            key, _trait_data(name, type, base, mod, min, max, extra, rate))
+        if self.batching:
+            trait = _BatchDict(_detach(trait))
+        self.attr_dict[key] = trait
+        self._changed(key)
+        if key in self.derived:
+            self.stale.add(key)
+
+    def add_many(self, traits):
+        """Create several new Traits, saving them all at once.
+
+        Args:
+            traits (dict): maps each new trait key to a dict of the
+                keyword arguments `add()` takes for it
+
+        Note:
+            All traits are validated before any is added; if one is
+            invalid or already exists, none are added.
+        """
+        for key in traits:
+            if key in self.attr_dict:
+                raise TraitException(
+                    "Trait '{}' already exists.".format(key))
+        data = _detach(self.attr_dict)
+        data.update(self._build(traits))
+        self._replace(data, traits)
+
+    def replace_all(self, traits):
+        """Replace all Traits on the handler, saving them at once.
+
+        Args:
+            traits (dict): maps each trait key to a dict of the keyword
+                arguments `add()` takes for it
+
+        Note:
+            All traits are validated before anything is replaced; if one
+            is invalid, the existing traits are kept.
+        """
+        data = self._build(traits)
+        changed = set(self.attr_dict.keys()) | set(data)
+        self._replace(data, changed)
 
     def remove(self, trait):
         """Remove a Trait from the handler's parent object."""
@@ -339,33 +585,263 @@ class TraitHandler(object):
         if trait in self.cache:
             del self.cache[trait]
         del self.attr_dict[trait]
+        self._changed(trait)
 
     def clear(self):
         """Remove all Traits from the handler's parent object."""
-        for trait in self.all:
-            self.remove(trait)
+        self.replace_all({})
 
     @property
     def all(self):
         """Return a list of all trait keys in this TraitHandler."""
         return self.attr_dict.keys()
 
+    def remove_mods(self, source):
+        """Removes all modifiers added by `source` from every trait.
+
+        Args:
+            source (str): identifier the modifiers were added with
+
+        Returns:
+            (int): number of traits that had modifiers removed
+        """
+        keys = [k for k, data in self.attr_dict.items()
+                if source in data.get('mods', ())
+                or source in data.get('mults', ())]
+        if keys:
+            with self.batch():
+                for key in keys:
+                    self.get(key).mods.remove(source)
+        return len(keys)
+
+    def derive(self, key, inputs, func, field='mod'):
+        """Declares a trait property computed from other traits.
+
+        The value is computed by `func` and stored in the `field`
+        property of trait `key`. It is only recomputed after one of the
+        `inputs` traits has changed, the next time trait `key` is
+        retrieved from the handler, so reading it is otherwise O(1).
+        Derived values may themselves be inputs of other derived traits.
+
+        Args:
+            key (str): key of the trait holding the derived value
+            inputs (tuple[str]): keys of the traits `func` reads
+            func (callable): called with the handler as its only
+                argument; returns the value of `field`
+            field (str): trait property to store the value in
+
+        Example:
+
+            ```python
+            >>> traits.derive('MV', ('ENC', 'STR'),
+            ...               lambda t: -(t.ENC.actual // (2 * t.STR.actual)))
+            ```
+
+        Note:
+            Derived rules are not saved; register them each time the
+            handler is created, e.g. in the `lazy_property` creating it.
+            Regeneration of gauge traits is not a change, so gauges with
+            a `rate` should not be used as inputs.
+        """
+        if key in inputs or self._downstream(inputs, key):
+            raise TraitException(
+                "Derived trait '{}' depends on itself.".format(key))
+        if key in self.derived:
+            for name in self.derived[key][0]:
+                self.dependents[name].discard(key)
+        self.derived[key] = (tuple(inputs), func, field)
+        for name in inputs:
+            self.dependents.setdefault(name, set()).add(key)
+        self.stale.add(key)
+
+    def compact(self):
+        """Removes stored metadata already provided by the schema.
+
+        Only needed for trait data stored before the handler had a
+        schema; saves at most once.
+
+        Returns:
+            (int): number of traits that were compacted
+        """
+        data = _detach(self.attr_dict)
+        changed = [k for k, v in data.items()
+                   if len(self._strip(k, v)) != len(self.attr_dict[k])]
+        if changed:
+            self._replace(data, changed)
+        return len(changed)
+
+    @contextmanager
+    def batch(self):
+        """Collects all trait changes in memory and saves them once.
+
+        Changes made inside the block are written to the database in a
+        single save when the block exits, and only if anything changed.
+        If the block raises, all of its changes are discarded and the
+        exception is re-raised.
+        Nested `batch()` blocks join the outermost one.
+
+        `Trait` objects retrieved from the handler before the block
+        stay valid inside and after it.
+        """
+        if self.batching:
+            yield self
+            return
+
+        persistent = self.attr_dict
+        self.attr_dict = {k: _BatchDict(_detach(v))
+                          for k, v in persistent.items()}
+        self._rebind()
+        self.batching = True
+        try:
+            yield self
+        except Exception:
+            self.attr_dict = persistent
+            # derived values refreshed inside the block were discarded
+            self.stale.update(self.derived)
+            raise
+        else:
+            data = {k: dict(v) for k, v in self.attr_dict.items()}
+            if data != _detach(persistent):
+                self.obj.attributes.add(self.db_attribute, data)
+                self.attr_dict = self.obj.attributes.get(self.db_attribute)
+            else:
+                self.attr_dict = persistent
+        finally:
+            self._rebind()
+            self.batching = False
+
+    def _view(self, key):
+        """Returns the data of trait `key` as read by its `Trait`."""
+        data = self.attr_dict[key]
+        if key in self.schema:
+            data = _SchemaData(self.schema[key], data)
+        return data
+
+    def _rebind(self):
+        """Points cached traits at the handler's current trait data.
+
+        Called after `batch()` or `replace_all()` swaps the trait data,
+        so that `Trait` objects retrieved earlier read and write the new
+        data; traits that were removed or changed type are dropped.
+        """
+        for key, trait in list(self.cache.items()):
+            if key not in self.attr_dict:
+                del self.cache[key]
+                continue
+            data = self._view(key)
+            if data['type'] != trait._type:
+                del self.cache[key]
+                continue
+            trait._data = data
+            trait._mods = ModifierStack(trait)
+
+    def _build(self, traits):
+        """Returns validated trait data for `add_many` and `replace_all`."""
+        data = {}
+        for key, kwargs in traits.items():
+            try:
+                data[key] = self._strip(key, _trait_data(**kwargs))
+            except TypeError:
+                raise TraitException(
+                    "Invalid configuration for trait '{}'.".format(key))
+        return data
+
+    def _strip(self, key, data):
+        """Removes metadata that matches the schema from trait data."""
+        meta = self.schema.get(key)
+        if meta is not None:
+            for name in _SCHEMA_KEYS:
+                if name in data and name in meta and data[name] == meta[name]:
+                    del data[name]
+        return data
+
+    def _replace(self, data, changed):
+        """Swaps in new trait data with one save and rebinds the cache."""
+        if self.batching:
+            self.attr_dict = {k: _BatchDict(_detach(v))
+                              for k, v in data.items()}
+        else:
+            self.obj.attributes.add(self.db_attribute, data)
+            self.attr_dict = self.obj.attributes.get(self.db_attribute)
+        self._rebind()
+        self.stale.update(k for k in self.derived if k in changed)
+        for key in changed:
+            self._changed(key)
+
+    def _changed(self, key):
+        """Called after trait `key` changes; invalidates derived traits."""
+        self.version += 1
+        for listener in TRAIT_LISTENERS:
+            listener(self, key)
+        pending = list(self.dependents.get(key, ()))
+        while pending:
+            derived = pending.pop()
+            if derived not in self.stale:
+                self.stale.add(derived)
+                pending.extend(self.dependents.get(derived, ()))
+
+    def _downstream(self, inputs, key):
+        """Returns those `inputs` that `key` feeds, directly or not."""
+        found, pending = set(), list(self.dependents.get(key, ()))
+        while pending:
+            derived = pending.pop()
+            if derived not in found:
+                found.add(derived)
+                pending.extend(self.dependents.get(derived, ()))
+        return found & set(inputs)
+
+    def _refresh(self, key):
+        """Recomputes the stored value of derived trait `key`."""
+        self.stale.discard(key)
+        inputs, func, field = self.derived[key]
+        if not all(name in self.attr_dict for name in inputs):
+            return
+        value = func(self)
+        trait = self.cache[key]
+        if getattr(trait, field) != value:
+            setattr(trait, field, value)
+
+
 @python_2_unicode_compatible
 @total_ordering
 class Trait(object):
     """Represents an object or Character trait.
 
+    Instantiating `Trait` directly returns an instance of the subclass
+    registered for the 'type' key of its data; see `StaticTrait`,
+    `CounterTrait` and `GaugeTrait`.
+
     Note:
         See module docstring for configuration details.
     """
-    def __init__(self, data):
+    __slots__ = ('_data', '_mods', '_key', '_handler')
+
+    _type = None
+    _keys = ('name', 'type', 'base', 'mod', 'mods', 'mults',
+             'current', 'rate', 'min', 'max', 'extra')
+    _default_min = None
+    _default_max = None
+    # names of slots and properties; populated for each subclass below
+    _attributes = frozenset()
+
+    def __new__(cls, data, key=None, handler=None):
+        if cls is Trait:
+            if not 'type' in data:
+                raise TraitException(
+                    "Required key not found in trait data: 'type'")
+            try:
+                cls = _TRAIT_CLASSES[data['type']]
+            except KeyError:
+                raise TraitException("Invalid trait type specified.")
+        return super(Trait, cls).__new__(cls)
+
+    def __init__(self, data, key=None, handler=None):
         if not 'name' in data:
             raise TraitException(
                 "Required key not found in trait data: 'name'")
         if not 'type' in data:
             raise TraitException(
                 "Required key not found in trait data: 'type'")
-        self._type = data['type']
         if not 'base' in data:
             data['base'] = 0
         if not 'mod' in data:
@@ -373,16 +849,18 @@ class Trait(object):
         if not 'extra' in data:
             data['extra'] = {}
         if 'min' not in data:
-            data['min'] = 0 if self._type == 'gauge' else None
+            data['min'] = self._default_min
         if 'max' not in data:
-            data['max'] = 'base' if self._type == 'gauge' else None
+            data['max'] = self._default_max
 
         self._data = data
-        self._keys = ('name', 'type', 'base', 'mod',
-                      'current', 'min', 'max', 'extra')
-        self._locked = True
+        self._mods = ModifierStack(self)
+        self._key = key
+        self._handler = handler
 
-        if not isinstance(data, _SaverDict):
+        if isinstance(data, _SchemaData):
+            data = data.data
+        if not isinstance(data, (_SaverDict, _BatchDict)):
             logger.log_warn(
                 'Non-persistent {} class loaded.'.format(
                     type(self).__name__
@@ -398,17 +876,12 @@ class Trait(object):
     def __str__(self):
         """User-friendly string representation of this `Trait`"""
         # TODO maybe change this 'd6' as type and add that type
-        if "is_d6" in self.extra and self.is_d6:
+        if self._data['extra'].get('is_d6'):
             return "{:12} {}".format(self.name, d6str(self.actual))
-        if self._type == 'gauge':
-            status = "{:4} / {:4}".format(self.actual, self.base)
-        else:
-            status = "{:11}".format(self.actual)
 
         return "{name:12} {status} ({mod:+3})".format(
             name=self.name,
-            status = status,
-            base=self._mod_base(),
+            status=self._status(),
             mod=self.mod)
 
     # Extra Properties magic
@@ -430,6 +903,9 @@ class Trait(object):
 
     def __getattr__(self, key):
         """Access extra parameters as attributes."""
+        if key == '_data':
+            # slot not yet assigned; avoid recursing into ourselves
+            raise AttributeError(key)
         if key in self._data['extra']:
             return self._data['extra'][key]
         else:
@@ -441,28 +917,21 @@ class Trait(object):
     def __setattr__(self, key, value):
         """Set extra parameters as attributes.
 
-        Arbitrary attributes set on a Trait object will be
-        stored in the 'extra' key of the `_data` attribute.
-
-        This behavior is enabled by setting the instance
-        variable `_locked` to True.
+        Slots and properties of the class are set normally. Any other
+        attribute set on a Trait object will be stored in the 'extra'
+        key of the `_data` attribute.
         """
-        propobj = getattr(self.__class__, key, None)
-        if isinstance(propobj, property):
-            if propobj.fset is None:
-                raise AttributeError("can't set attribute")
-            propobj.fset(self, value)
+        if key in self._attributes:
+            object.__setattr__(self, key, value)
         else:
-            if (self.__dict__.get('_locked', False) and
-                    key not in ('_keys',)):
-                self._data['extra'][key] = value
-            else:
-                super(Trait, self).__setattr__(key, value)
+            self._own_extra()[key] = value
+            self._changed()
 
     def __delattr__(self, key):
         """Delete extra parameters as attributes."""
         if key in self._data['extra']:
-            del self._data['extra'][key]
+            del self._own_extra()[key]
+            self._changed()
 
     # Numeric operations magic
 
@@ -474,7 +943,7 @@ class Trait(object):
             complete the rich comparison implementation, therefore only
             `__eq__` and `__lt__` are implemented.
         """
-        if type(other) == Trait:
+        if isinstance(other, Trait):
             return self.actual == other.actual
         elif type(other) in (float, int):
             return self.actual == other
@@ -561,13 +1030,8 @@ class Trait(object):
 
     @property
     def actual(self):
-        """The "actual" value of the trait."""
-        if self._type == 'gauge':
-            return self.current
-        elif self._type == 'counter':
-            return self._mod_current()
-        else:
-            return self._mod_base()
+        """The "actual" value of the trait: `base`+`mod`, with `mods`."""
+        return self._mod_base()
 
     @property
     def base(self):
@@ -581,93 +1045,62 @@ class Trait(object):
 
     @base.setter
     def base(self, amount):
-        if self._data.get('max', None) == 'base':
-            self._data['base'] = amount
         if type(amount) in (int, float):
-            self._data['base'] = self._enforce_bounds(amount)
+            self._data['base'] = amount
+            self._changed()
 
     @property
     def mod(self):
-        """The trait's modifier."""
+        """The trait's modifier.
+
+        Note:
+            This is the trait's own modifier; it does not include the
+            source-tracked modifiers in `mods`.
+        """
         return self._data['mod']
 
     @mod.setter
     def mod(self, amount):
         if type(amount) in (int, float):
-            delta = amount - self._data['mod']
             self._data['mod'] = amount
-            if self._type == 'gauge':
-                if delta >= 0:
-                    # apply increases to current
-                    self.current = self._enforce_bounds(self.current + delta)
-                else:
-                    # but not decreases, unless current goes out of range
-                    self.current = self._enforce_bounds(self.current)
+            self._changed()
+
+    @property
+    def mods(self):
+        """The `ModifierStack` of source-tracked modifiers on the trait."""
+        return self._mods
 
     @property
     def min(self):
         """The lower bound of the range."""
-        if self._type in RANGE_TRAITS:
-            return self._data['min']
-        else:
-            raise AttributeError(
-                "static 'Trait' object has no attribute 'min'.")
+        raise AttributeError(
+            "static 'Trait' object has no attribute 'min'.")
 
     @min.setter
     def min(self, amount):
-        if self._type in RANGE_TRAITS:
-            if amount is None: self._data['min'] = amount
-            elif type(amount) in (int, float):
-                self._data['min'] = amount if amount < self.base else self.base
-        else:
-            raise AttributeError(
-                "static 'Trait' object has no attribute 'min'.")
+        raise AttributeError(
+            "static 'Trait' object has no attribute 'min'.")
 
     @property
     def max(self):
-        """The maximum value of the `Trait`.
-
-        Note:
-            This property may be set to the string literal 'base'.
-            When set this way, the property returns the value of the
-            `mod`+`base` properties.
-        """
-        if self._type in RANGE_TRAITS:
-            if self._data['max'] == 'base':
-                return self._mod_base()
-            else:
-                return self._data['max']
-        else:
-            raise AttributeError(
-                "static 'Trait' object has no attribute 'max'.")
+        """The maximum value of the `Trait`."""
+        raise AttributeError(
+            "static 'Trait' object has no attribute 'max'.")
 
     @max.setter
     def max(self, value):
-        if self._type in RANGE_TRAITS:
-            if value == 'base' or value is None:
-                self._data['max'] = value
-            elif type(value) in (int, float):
-                self._data['max'] = value if value > self.base else self.base
-        else:
-            raise AttributeError(
-                "static 'Trait' object has no attribute 'max'.")
+        raise AttributeError(
+            "static 'Trait' object has no attribute 'max'.")
 
     @property
     def current(self):
         """The `current` value of the `Trait`."""
-        if self._type == 'gauge':
-            return self._data.get('current', self._mod_base())
-        else:
-            return self._data.get('current', self.base)
+        return self._data.get('current', self._data['base'])
 
     @current.setter
     def current(self, value):
-        if self._type in RANGE_TRAITS:
-            if type(value) in (int, float):
-                self._data['current'] = self._enforce_bounds(value)
-        else:
-            raise AttributeError(
-                "'current' property is read-only on static 'Trait'.")
+        raise AttributeError(
+            "'current' property is read-only on static 'Trait'.")
 
     @property
     def extra(self):
@@ -693,33 +1126,451 @@ class Trait(object):
 
     def percent(self):
         """Returns the value formatted as a percentage."""
-        if self._type in RANGE_TRAITS:
-            if self.max:
-                return "{:3.1f}%".format(self.current * 100.0 / self.max)
-            elif self._type == 'counter' and self.base != 0:
-                return "{:3.1f}%".format(self.current * 100.0 / self._mod_base())
-            elif self._type == 'gauge' and self._mod_base() != 0:
-                return "{:3.1f}%".format(self.current * 100.0 / self._mod_base())
-        # if we get to this point, it's either a static trait or
-        # a divide by zero situation
+        # static traits have no range to be a percentage of
         return "100.0%"
 
     # Private members
 
+    def _status(self):
+        """Returns the value column of the user-friendly string."""
+        return "{:11}".format(self.actual)
+
+    def _modded(self, value):
+        """Applies `mod` and the modifier stack to `value`."""
+        mods = self._mods
+        value += self._data['mod'] + mods.add_total
+        if mods.mult_total != 1:
+            value = type(value)(value * mods.mult_total)
+        return value
+
     def _mod_base(self):
-        return self._enforce_bounds(self.mod + self.base)
+        return self._enforce_bounds(self._modded(self._data['base']))
 
     def _mod_current(self):
-        return self._enforce_bounds(self.mod + self.current)
+        return self._enforce_bounds(self._modded(self.current))
+
+    def _own_extra(self):
+        """Returns the trait's own, writable extra data dict."""
+        if isinstance(self._data, _SchemaData):
+            # copy shared schema metadata before changing it
+            return self._data.override('extra')
+        return self._data['extra']
+
+    def _changed(self):
+        """Notifies the handler, if any, that the trait has changed."""
+        if self._handler is not None:
+            self._handler._changed(self._key)
+
+    def _mods_changed(self, before):
+        """Called by the modifier stack after it changes.
+
+        Args:
+            before (int, float): value of `_mod_base()` before the change
+        """
+        self._changed()
+
+    def _enforce_bounds(self, value):
+        """Ensures that incoming value falls within trait's range."""
+        return value
+
+
+class StaticTrait(Trait):
+    """A trait with a `base` value and a `mod` modifier.
+
+    Its actual value is `base`+`mod`; it has no range or `current` value.
+    """
+    __slots__ = ()
+
+    _type = 'static'
+
+    @property
+    def actual(self):
+        """The "actual" value of the trait: `base`+`mod`, with `mods`."""
+        data, mods = self._data, self._mods
+        value = data['base'] + data['mod'] + mods.add_total
+        if mods.mult_total != 1:
+            value = type(value)(value * mods.mult_total)
+        return value
+
+
+class CounterTrait(Trait):
+    """A trait with a `current` value that varies along a range.
+
+    Its actual value is `current`+`mod`, constrained to `min` and `max`.
+    """
+    __slots__ = ()
+
+    _type = 'counter'
+
+    @property
+    def actual(self):
+        """The "actual" value of the trait: `current`+`mod`, bounded."""
+        return self._mod_current()
+
+    @property
+    def base(self):
+        """The trait's base value.
+
+        Note:
+            The setter for this property will enforce any range bounds set
+            on this `Trait`.
+        """
+        return self._data['base']
+
+    @base.setter
+    def base(self, amount):
+        if self._data['max'] == 'base':
+            self._data['base'] = amount
+        if type(amount) in (int, float):
+            self._data['base'] = self._enforce_bounds(amount)
+        self._changed()
+
+    @property
+    def min(self):
+        """The lower bound of the range."""
+        return self._data['min']
+
+    @min.setter
+    def min(self, amount):
+        if amount is None: self._data['min'] = amount
+        elif type(amount) in (int, float):
+            self._data['min'] = amount if amount < self.base else self.base
+        self._changed()
+
+    @property
+    def max(self):
+        """The maximum value of the `Trait`.
+
+        Note:
+            This property may be set to the string literal 'base'.
+            When set this way, the property returns the value of the
+            `mod`+`base` properties.
+        """
+        if self._data['max'] == 'base':
+            return self._mod_base()
+        else:
+            return self._data['max']
+
+    @max.setter
+    def max(self, value):
+        if value == 'base' or value is None:
+            self._data['max'] = value
+        elif type(value) in (int, float):
+            self._data['max'] = value if value > self.base else self.base
+        self._changed()
+
+    @property
+    def current(self):
+        """The `current` value of the `Trait`."""
+        return self._data.get('current', self._data['base'])
+
+    @current.setter
+    def current(self, value):
+        if type(value) in (int, float):
+            self._data['current'] = self._enforce_bounds(value)
+            self._changed()
+
+    def percent(self):
+        """Returns the value formatted as a percentage."""
+        if self.max:
+            return "{:3.1f}%".format(self.current * 100.0 / self.max)
+        elif self.base != 0:
+            return "{:3.1f}%".format(self.current * 100.0 / self._mod_base())
+        # divide by zero situation
+        return "100.0%"
 
     def _enforce_bounds(self, value):
         """Ensures that incoming value falls within trait's range."""
-        if self._type in RANGE_TRAITS:
-            if self.min is not None and value <= self.min:
-                return self.min
-            if self._data['max'] == 'base' and value >= self.mod + self.base:
-                return self.mod + self.base
-            if self.max is not None and value >= self.max:
-                return self.max
+        data = self._data
+        lower = data['min']
+        if lower is not None and value <= lower:
+            return lower
+        upper = data['max']
+        if upper == 'base':
+            upper = self._modded(data['base'])
+        if upper is not None and value >= upper:
+            return upper
         return value
 
+
+class GaugeTrait(CounterTrait):
+    """A counter trait modeling a gauge that can be emptied and refilled.
+
+    Its actual value is `current`; `base`+`mod` is its "full" value, and
+    increases to `mod` flow through to `current`.
+    """
+    __slots__ = ()
+
+    _type = 'gauge'
+    _default_min = 0
+    _default_max = 'base'
+
+    @property
+    def actual(self):
+        """The "actual" value of the trait: `current`."""
+        return self.current
+
+    @property
+    def mod(self):
+        """The trait's modifier."""
+        return self._data['mod']
+
+    @mod.setter
+    def mod(self, amount):
+        if type(amount) in (int, float):
+            delta = amount - self._data['mod']
+            self._data['mod'] = amount
+            self._flow(delta)
+
+    @property
+    def current(self):
+        """The `current` value of the `Trait`.
+
+        Note:
+            If the gauge has a regeneration `rate`, the amount regenerated
+            since `current` was last set is added when it is read. Reading
+            never writes to the database.
+        """
+        if 'current' not in self._data:
+            return self._mod_base()
+        return self._regenerate(time())[0]
+
+    @current.setter
+    def current(self, value):
+        if type(value) in (int, float):
+            data = self._data
+            if data.get('rate'):
+                now = time()
+                # keep the time accrued toward the next whole unit
+                data['last_update'] = \
+                    self._regenerate(now)[1] if 'current' in data else now
+            data['current'] = self._enforce_bounds(value)
+            self._changed()
+
+    @property
+    def rate(self):
+        """Regeneration rate of `current`, in units per second."""
+        return self._data.get('rate', 0)
+
+    @rate.setter
+    def rate(self, value):
+        if type(value) in (int, float):
+            data = self._data
+            now = time()
+            # settle what was regenerated at the old rate first
+            if 'current' in data:
+                current, since = self._regenerate(now)
+            else:
+                current, since = self._mod_base(), now
+            accrued = (now - since) * (data.get('rate') or 0)
+            data['current'] = current
+            data['last_update'] = now - accrued / value if value else now
+            data['rate'] = value
+            self._changed()
+
+    def percent(self):
+        """Returns the value formatted as a percentage."""
+        if self.max:
+            return "{:3.1f}%".format(self.current * 100.0 / self.max)
+        elif self._mod_base() != 0:
+            return "{:3.1f}%".format(self.current * 100.0 / self._mod_base())
+        # divide by zero situation
+        return "100.0%"
+
+    def _status(self):
+        """Returns the value column of the user-friendly string."""
+        return "{:4} / {:4}".format(self.actual, self.base)
+
+    def _regenerate(self, now):
+        """Returns the regenerated `current` and the time it is as of.
+
+        Integer gauges only regenerate whole units; the time spent toward
+        the next unit is left out of the returned timestamp, so it carries
+        over when `current` is set. Nothing carries over while the gauge
+        is held at a bound.
+        """
+        data = self._data
+        current = data['current']
+        rate, since = data.get('rate'), data.get('last_update')
+        if not rate or since is None:
+            return current, now
+        regen, as_of = rate * (now - since), now
+        if type(current) is not float:
+            regen = int(regen)
+            as_of = since + regen / float(rate)
+        value = current + regen
+        bounded = self._enforce_bounds(value)
+        if bounded != value:
+            return bounded, now
+        return value, as_of
+
+    def _flow(self, delta):
+        """Applies a change of the gauge's full value to `current`."""
+        if delta >= 0:
+            # apply increases to current
+            self.current = self._enforce_bounds(self.current + delta)
+        else:
+            # but not decreases, unless current goes out of range
+            self.current = self._enforce_bounds(self.current)
+
+    def _mods_changed(self, before):
+        """Modifier stack changes flow through to `current` like `mod`."""
+        self._flow(self._mod_base() - before)
+        self._changed()
+
+
+class ModifierStack(object):
+    """Source-tracked modifiers stacked on top of a `Trait`.
+
+    Each source (e.g. an item's dbref) may hold one additive and one
+    multiplicative modifier on a trait. Additive modifiers are added to
+    the trait together with its `mod`; multiplicative ones are multiplied
+    together and scale the result. Running totals are kept so reading a
+    trait's value stays O(1).
+
+    Modifiers are stored in the trait data as `{source: value}` dicts
+    under the 'mods' and 'mults' keys, which are omitted while empty.
+
+    Args:
+        trait (Trait): the trait the modifiers apply to
+
+    Attributes:
+        add_total (int, float): sum of all additive modifiers
+        mult_total (int, float): product of all multiplicative modifiers
+
+    Examples:
+
+        ```python
+        >>> dodge = char.traits.DEF
+        >>> dodge.mods.add(armor.dbref, 3)
+        >>> dodge.mods.add('#12', 1.5, kind='mult')
+        >>> dodge.mods.remove(armor.dbref)
+        3
+        >>> char.traits.remove_mods('#12')      # from all traits
+        1
+        ```
+    """
+    __slots__ = ('_trait', 'add_total', 'mult_total')
+
+    KINDS = {'add': 'mods', 'mult': 'mults'}
+
+    def __init__(self, trait):
+        self._trait = trait
+        data = trait._data
+        self.add_total = sum(data['mods'].values()) if 'mods' in data else 0
+        self.mult_total = self._product()
+
+    def __len__(self):
+        """Returns the number of modifiers in the stack."""
+        data = self._trait._data
+        return sum(len(data[k]) for k in self.KINDS.values() if k in data)
+
+    def __contains__(self, source):
+        """Returns whether `source` has any modifier in the stack."""
+        data = self._trait._data
+        return any(source in data[k] for k in self.KINDS.values() if k in data)
+
+    def __iter__(self):
+        """Iterates over (source, value, kind) tuples."""
+        data = self._trait._data
+        for kind, key in self.KINDS.items():
+            for source, value in data.get(key, {}).items():
+                yield source, value, kind
+
+    def get(self, source, kind='add'):
+        """Returns the value of a source's modifier, or None."""
+        return self._trait._data.get(self._key(kind), {}).get(source)
+
+    def add(self, source, value, kind='add'):
+        """Adds a modifier from `source`, replacing any of the same kind.
+
+        Args:
+            source (str): identifier of what applies the modifier
+            value (int, float): amount to add, or factor to multiply by
+            kind (str): 'add' or 'mult'
+        """
+        key = self._key(kind)
+        if type(value) not in (int, float):
+            raise TraitException("Modifier value must be numeric.")
+        trait = self._trait
+        before = trait._mod_base()
+        data = trait._data
+        if key not in data:
+            data[key] = {source: value}
+        else:
+            previous = data[key].get(source)
+            data[key][source] = value
+            if kind == 'add' and previous is not None:
+                self.add_total -= previous
+        if kind == 'add':
+            self.add_total += value
+        else:
+            self.mult_total = self._product()
+        trait._mods_changed(before)
+
+    def remove(self, source, kind=None):
+        """Removes a source's modifiers from the stack.
+
+        Args:
+            source (str): identifier the modifiers were added with
+            kind Optional(str): only remove the modifier of this kind
+
+        Returns:
+            (int, float, None): the removed additive modifier value, or
+                the multiplier if only that was removed; None if the
+                source had no modifiers.
+        """
+        kinds = (kind,) if kind else ('mult', 'add')
+        trait = self._trait
+        data = trait._data
+        before = trait._mod_base()
+        removed = None
+        for kind in kinds:
+            key = self._key(kind)
+            if key not in data or source not in data[key]:
+                continue
+            if len(data[key]) == 1:
+                removed = data[key][source]
+                del data[key]
+            else:
+                removed = data[key].pop(source)
+            if kind == 'add':
+                self.add_total -= removed
+            else:
+                self.mult_total = self._product()
+        if removed is not None:
+            trait._mods_changed(before)
+        return removed
+
+    def clear(self):
+        """Removes all modifiers from the stack."""
+        trait = self._trait
+        before = trait._mod_base()
+        for key in self.KINDS.values():
+            if key in trait._data:
+                del trait._data[key]
+        self.add_total, self.mult_total = 0, 1
+        trait._mods_changed(before)
+
+    def _key(self, kind):
+        """Returns the trait data key for a kind of modifier."""
+        try:
+            return self.KINDS[kind]
+        except KeyError:
+            raise TraitException("Invalid modifier kind: {}".format(kind))
+
+    def _product(self):
+        """Recalculates the product of all multiplicative modifiers."""
+        product = 1
+        for factor in self._trait._data.get('mults', {}).values():
+            product *= factor
+        return product
+
+
+_TRAIT_CLASSES = {}
+for _cls in (StaticTrait, CounterTrait, GaugeTrait):
+    _cls._attributes = frozenset(
+        name for klass in _cls.__mro__
+        for name, attr in vars(klass).items() if hasattr(attr, '__set__'))
+    _TRAIT_CLASSES[_cls._type] = _cls
+del _cls
@@ -0,0 +1,92 @@
+"""
+Turns module.
+
+The game turn is run by a single global `TurnEngine` script (see
+`typeclasses.scripts`) rather than a ticker per character. Systems that
+give a character work to do at the start of each turn, such as combat,
+add the character to the engine; characters are also added whenever
+they are puppeted. The character's `at_turn_start` hook then runs every
+turn until it reports no more turn work.
+
+Module Functions:
+
+    - `get_turn_engine()`
+
+        Returns the global `TurnEngine` script, creating it if needed.
+
+    - `start_turns(char)`
+
+        Adds a character to the turn engine.
+
+    - `stop_turns(char)`
+
+        Removes a character from the turn engine.
+
+    - `remove_turn_tickers()`
+
+        One-time migration removing the per-character turn tickers that
+        older characters were subscribed to in chargen.
+"""
+
+from evennia import create_script, TICKER_HANDLER
+from evennia.objects.models import ObjectDB
+from evennia.server.models import ServerConfig
+from evennia.utils import logger
+from evennia.utils.search import search_script
+
+TURN_ENGINE_KEY = "turn_engine"
+
+# interval of the tickers chargen used to subscribe characters to
+TURN_TICKER_INTERVAL = 6
+TURN_TICKERS_REMOVED_KEY = "turn_tickers_removed"
+
+
+def get_turn_engine():
+    """Returns the global `TurnEngine` script, creating it if needed."""
+    found = search_script(TURN_ENGINE_KEY)
+    if found:
+        return found[0]
+    return create_script("typeclasses.scripts.TurnEngine",
+                         key=TURN_ENGINE_KEY)
+
+
+def start_turns(char):
+    """Runs `char`'s `at_turn_start` hook at the start of each turn.
+
+    Args:
+        char (Character): character with pending turn work
+    """
+    get_turn_engine().add(char)
+
+
+def stop_turns(char):
+    """Stops running `char`'s `at_turn_start` hook each turn.
+
+    Args:
+        char (Character): character to remove from the turn engine
+    """
+    get_turn_engine().discard(char)
+
+
+def remove_turn_tickers():
+    """Unsubscribes characters from their old 6 second turn tickers.
+
+    Characters created before gauges regenerated on their own were
+    subscribed to a `TICKER_HANDLER` ticker calling `at_turn_start`
+    every 6 seconds. Runs once; the migration is recorded in
+    `ServerConfig` and later calls do nothing.
+
+    Returns:
+        (int): number of characters unsubscribed
+    """
+    if ServerConfig.objects.conf(TURN_TICKERS_REMOVED_KEY):
+        return 0
+    count = 0
+    for obj in ObjectDB.objects.filter(
+            db_attributes__db_key='traits').distinct():
+        TICKER_HANDLER.remove(obj, TURN_TICKER_INTERVAL)
+        count += 1
+    ServerConfig.objects.conf(TURN_TICKERS_REMOVED_KEY, value=True)
+    logger.log_info(
+        "Removed turn tickers of {} characters.".format(count))
+    return count
@@ -0,0 +1,37 @@
+"""
+Weapon names module.
+
+Naming rules for the weapons kept in `scripts/Weapons.csv`, shared by the
+`world.gamedata` row compiler and `scripts/csv_data.py`. This module does
+not import Evennia, so that scripts can use it outside of the server.
+
+Module Functions:
+
+    - `modify_weapon(row)`
+
+        Builds a weapon's display name, aliases and prototype key from
+        its CSV row.
+"""
+
+import string
+
+
+def modify_weapon(row):
+    """
+    Does some modification of weapon names and aliases to spice them up.
+
+    :param row: dict of weapon data
+    """
+    # turn aliases into a list.
+    aliases = [] if not row['aliases'] else row['aliases'].split(',')
+
+    # Put some jazz on the names.
+    if row['model']:
+        model  = "%s%s" % (row["model"].upper(), row["damage"])
+        if int(row['bonus']) > 0:
+            model = "%s%s" % (model, string.ascii_lowercase[int(row["bonus"])])
+        row['name'] = "%s %s" % (model, row['name'].title())
+        aliases.append(model.lower())
+
+    row['aliases'] = aliases
+    row['key'] = row['name'].replace(" ", "_").lower().upper()